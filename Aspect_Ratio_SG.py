@@ -0,0 +1,88 @@
+import bisect
+import functools
+import math
+import numpy as np
+
+# Common standard aspect ratios, sorted by value: (ratio_value, display_string)
+STANDARD_RATIOS = (
+    (1.0, '1:1'),
+    (1.25, '5:4'),
+    (1.33333, '4:3'),
+    (1.5, '3:2'),
+    (1.6, '16:10'),
+    (1.66667, '5:3'),
+    (1.77778, '16:9'),
+    (1.88889, '17:9'),
+    (2.0, '2:1'),
+    (2.33333, '21:9'),
+    (2.35, '2.35:1'),
+    (2.39, '2.39:1'),
+    (2.4, '12:5'),
+)
+STANDARD_RATIO_TOLERANCE = 0.05  # 5% tolerance
+
+_VALUES = tuple(value for value, _ in STANDARD_RATIOS)
+_LABELS = tuple(label for _, label in STANDARD_RATIOS)
+_VALUES_NP = np.array(_VALUES)
+_LABELS_NP = np.array(_LABELS + (None,), dtype=object)
+
+
+def closest_standard_ratio(decimal_ratio):
+    """Closest standard ratio label within tolerance, or None (ties go to the smaller ratio)"""
+    i = bisect.bisect_left(_VALUES, decimal_ratio)
+    best = None
+    best_diff = float('inf')
+    for j in (i - 1, i):
+        if 0 <= j < len(_VALUES):
+            diff = abs(_VALUES[j] - decimal_ratio)
+            if diff < best_diff:
+                best, best_diff = j, diff
+    if best is not None and best_diff <= STANDARD_RATIO_TOLERANCE:
+        return _LABELS[best]
+    return None
+
+
+@functools.lru_cache(maxsize=1024)
+def aspect_ratio(width, height):
+    """(width_ratio, height_ratio, decimal_ratio, closest_standard) for one size, memoized"""
+    divisor = math.gcd(width, height) or 1
+    width_ratio = float(width // divisor)
+    height_ratio = float(height // divisor)
+    decimal_ratio = width / height if height else 0.0
+    return width_ratio, height_ratio, decimal_ratio, closest_standard_ratio(decimal_ratio)
+
+
+@functools.lru_cache(maxsize=1024)
+def ratio_line(width, height):
+    """The "Ratio: ..." display line shared by all nodes"""
+    width_ratio, height_ratio, decimal_ratio, closest_standard = aspect_ratio(width, height)
+    simplified = f"{int(width_ratio)}:{int(height_ratio)}"
+    if closest_standard and closest_standard != simplified:
+        return f"Ratio: {simplified} or {decimal_ratio:.2f}:1 or ~{closest_standard}"
+    return f"Ratio: {simplified} or {decimal_ratio:.2f}:1"
+
+
+def classify_ratios(widths, heights):
+    """
+    Vectorized aspect_ratio() for arrays of sizes.
+    Returns (width_ratios, height_ratios, decimal_ratios, closest_standards) as numpy arrays,
+    closest_standards being an object array of labels or None.
+    """
+    widths = np.asarray(widths, dtype=np.int64)
+    heights = np.asarray(heights, dtype=np.int64)
+    divisors = np.gcd(widths, heights)
+    divisors[divisors == 0] = 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        decimals = np.where(heights > 0, widths / np.where(heights > 0, heights, 1), 0.0)
+
+    # Nearest table entry from the two neighbours of the insertion point
+    right = np.clip(np.searchsorted(_VALUES_NP, decimals, side="left"), 0, len(_VALUES) - 1)
+    left = np.clip(right - 1, 0, len(_VALUES) - 1)
+    left_diff = np.abs(_VALUES_NP[left] - decimals)
+    right_diff = np.abs(_VALUES_NP[right] - decimals)
+    nearest = np.where(left_diff <= right_diff, left, right)
+    nearest_diff = np.minimum(left_diff, right_diff)
+    nearest[nearest_diff > STANDARD_RATIO_TOLERANCE] = len(_VALUES)
+
+    return ((widths // divisors).astype(np.float64), (heights // divisors).astype(np.float64),
+            decimals, _LABELS_NP[nearest])
@@ -0,0 +1,153 @@
+import io
+import struct
+
+from PIL import Image, TiffImagePlugin
+
+from .Streaming_Encode_SG import write_png_chunk
+
+BATCH_OUTPUTS = [
+    "One file per frame",
+    "Single file (TIFF pages / animated WEBP, PNG)",
+]
+# Formats that can hold a whole batch: extension -> whether the container is an animation
+CONTAINER_FORMATS = {"tiff": False, "webp": True, "png": True}
+
+_WEBP_FRAME_CHUNKS = (b"ALPH", b"VP8 ", b"VP8L")
+
+
+def use_container(batch_output, file_extension, frame_count):
+    """Whether a batch is written as one container file instead of one file per frame"""
+    return batch_output == BATCH_OUTPUTS[1] and file_extension in CONTAINER_FORMATS and frame_count > 1
+
+
+def _iter_chunks(data, offset, big_endian):
+    """(fourcc, payload) of the chunks of an encoded PNG (big-endian, CRC) or RIFF (little-endian, padded) file"""
+    while offset + 8 <= len(data):
+        if big_endian:
+            length, = struct.unpack_from(">I", data, offset)
+            yield data[offset + 4:offset + 8], data[offset + 8:offset + 8 + length]
+            offset += 12 + length
+        else:
+            length, = struct.unpack_from("<I", data, offset + 4)
+            yield data[offset:offset + 4], data[offset + 8:offset + 8 + length]
+            offset += 8 + length + (length & 1)
+
+
+class MultiPageTiffWriter:
+    """Batch frames appended as pages of one TIFF, each page encoded and written as it arrives"""
+
+    def __init__(self, filepath, save_kwargs):
+        self.save_kwargs = save_kwargs
+        self._fp = open(filepath, "w+b")
+        self._tiff = TiffImagePlugin.AppendingTiffWriter(self._fp, new=True)
+
+    def prepare(self, img_array):
+        # Pillow encodes TIFF pages straight into the file, so all the work happens in append()
+        return Image.fromarray(img_array)
+
+    def append(self, img):
+        img.save(self._tiff, format="TIFF", **self.save_kwargs)
+        self._tiff.newFrame()
+
+    def close(self):
+        self._tiff.close()
+        size = self._fp.seek(0, io.SEEK_END)
+        self._fp.close()
+        return size
+
+
+class AnimatedWebpWriter:
+    """
+    Animated WEBP assembled from independently encoded frames: each frame's VP8/VP8L (and ALPH) chunks
+    are wrapped in an ANMF chunk and written immediately; the RIFF size is patched on close.
+    """
+
+    def __init__(self, filepath, save_kwargs, width, height, duration_ms, alpha=False, loop=0):
+        self.save_kwargs = save_kwargs
+        self.width, self.height = width, height
+        self.duration_ms = min(duration_ms, 0xFFFFFF)
+        self._fp = open(filepath, "wb")
+        vp8x_flags = 0x02 | (0x10 if alpha else 0)  # animation, alpha
+        self._fp.write(b"RIFF\x00\x00\x00\x00WEBP")
+        self._chunk(b"VP8X", struct.pack("<I", vp8x_flags) + self._u24(width - 1) + self._u24(height - 1))
+        self._chunk(b"ANIM", struct.pack("<IH", 0, loop))
+
+    @staticmethod
+    def _u24(value):
+        return struct.pack("<I", value)[:3]
+
+    def _chunk(self, fourcc, payload):
+        self._fp.write(fourcc + struct.pack("<I", len(payload)) + payload + (b"\x00" if len(payload) & 1 else b""))
+
+    def prepare(self, img_array):
+        """Encode one frame as a standalone WEBP; safe to run in worker threads"""
+        buffer = io.BytesIO()
+        Image.fromarray(img_array).save(buffer, format="WEBP", **self.save_kwargs)
+        return buffer.getvalue()
+
+    def append(self, data):
+        frame = b"".join(fourcc + struct.pack("<I", len(payload)) + payload + (b"\x00" if len(payload) & 1 else b"")
+                         for fourcc, payload in _iter_chunks(data, 12, big_endian=False)
+                         if fourcc in _WEBP_FRAME_CHUNKS)
+        # Offset 0,0, full canvas, no blending so alpha frames replace the previous one
+        header = (self._u24(0) + self._u24(0) + self._u24(self.width - 1) + self._u24(self.height - 1)
+                  + self._u24(self.duration_ms) + b"\x02")
+        self._chunk(b"ANMF", header + frame)
+
+    def close(self):
+        size = self._fp.tell()
+        self._fp.seek(4)
+        self._fp.write(struct.pack("<I", size - 8))
+        self._fp.close()
+        return size
+
+
+class ApngWriter:
+    """
+    Animated PNG assembled from independently encoded frames: the first frame's IDAT chunks are kept,
+    later frames' IDAT data is rewritten as fdAT chunks. Frames are full-canvas, nothing is buffered.
+    """
+
+    def __init__(self, filepath, save_kwargs, frame_count, duration_ms, pnginfo=None, loop=0):
+        self.save_kwargs = save_kwargs
+        self.frame_count = frame_count
+        self.duration_ms = duration_ms
+        self.loop = loop
+        self.pnginfo = pnginfo
+        self._fp = open(filepath, "wb")
+        self._sequence = 0
+        self._frames = 0
+
+    def prepare(self, img_array):
+        """Encode one frame as a standalone PNG; safe to run in worker threads"""
+        buffer = io.BytesIO()
+        Image.fromarray(img_array).save(buffer, format="PNG", **self.save_kwargs)
+        return buffer.getvalue()
+
+    def append(self, data):
+        chunks = list(_iter_chunks(data, 8, big_endian=True))
+        if self._frames == 0:
+            self._fp.write(b"\x89PNG\r\n\x1a\n")
+            write_png_chunk(self._fp, b"IHDR", chunks[0][1])
+            write_png_chunk(self._fp, b"acTL", struct.pack(">II", self.frame_count, self.loop))
+            for chunk in (self.pnginfo.chunks if self.pnginfo else ()):
+                write_png_chunk(self._fp, chunk[0], chunk[1])
+        width, height = struct.unpack_from(">II", chunks[0][1])
+        write_png_chunk(self._fp, b"fcTL", struct.pack(">IIIIIHHBB", self._sequence, width, height, 0, 0,
+                                                       self.duration_ms, 1000, 0, 0))
+        self._sequence += 1
+        for fourcc, payload in chunks:
+            if fourcc != b"IDAT":
+                continue
+            if self._frames == 0:
+                write_png_chunk(self._fp, b"IDAT", payload)
+            else:
+                write_png_chunk(self._fp, b"fdAT", struct.pack(">I", self._sequence) + payload)
+                self._sequence += 1
+        self._frames += 1
+
+    def close(self):
+        write_png_chunk(self._fp, b"IEND", b"")
+        size = self._fp.tell()
+        self._fp.close()
+        return size
@@ -0,0 +1,269 @@
+import csv
+import json
+import os
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import folder_paths
+from .Aspect_Ratio_SG import aspect_ratio
+from .Input_Index_SG import IMAGE_EXTENSIONS
+from .Load_Image_and_view_Properties_SG import LoadImageandviewPropertiesSG
+
+# Files handed to a worker per task, so scheduling overhead is paid per chunk rather than per file
+PROBE_CHUNK_SIZE = 32
+
+RECORD_FIELDS = ["path", "width", "height", "resolution_mp", "ratio", "standard_ratio", "file_size_mb",
+                 "bit_depth", "model", "seed", "steps", "cfg", "sampler", "scheduler", "error"]
+
+
+def iter_image_paths(folder, recursive=True, extensions=IMAGE_EXTENSIONS):
+    """Yield image file paths under a folder, one directory listing at a time"""
+    stack = [folder]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = sorted(os.scandir(directory), key=lambda e: e.name)
+        except OSError:
+            continue
+        subdirs = []
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            try:
+                if entry.is_file():
+                    if entry.name.lower().endswith(extensions):
+                        yield entry.path
+                elif recursive and entry.is_dir():
+                    subdirs.append(entry.path)
+            except OSError:
+                continue
+        stack.extend(reversed(subdirs))
+
+
+def probe_record(path):
+    """
+    Header-only properties of one file as a flat record (never decodes pixels).
+    Any failure becomes an error record, so one unusual file cannot stop a folder scan.
+    """
+    try:
+        props = LoadImageandviewPropertiesSG().probe_properties(path)
+        gen_params = props["gen_params"]
+        return {
+            "path": path,
+            "width": props["width"],
+            "height": props["height"],
+            "resolution_mp": round(props["resolution_mp"], 4),
+            "ratio": f"{int(props['width_ratio'])}:{int(props['height_ratio'])}",
+            "standard_ratio": aspect_ratio(props["width"], props["height"])[3] or "",
+            "file_size_mb": round(props["file_size_mb"], 4),
+            "bit_depth": props["bit_depth"],
+            # Histogram key: must be hashable whatever the metadata held
+            "model": str(props["model_name"]),
+            "seed": gen_params["seed"],
+            "steps": gen_params["steps"],
+            "cfg": gen_params["cfg"],
+            "sampler": gen_params["sampler"],
+            "scheduler": gen_params["scheduler"],
+        }
+    except Exception as e:
+        return {"path": path, "error": str(e)}
+
+
+def probe_records(paths):
+    return [probe_record(path) for path in paths]
+
+
+def _chunks(paths, size):
+    chunk = []
+    for path in paths:
+        chunk.append(path)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_folder_properties(folder, recursive=True, workers=0):
+    """
+    Generator of per-file property records for every image under a folder.
+    Headers are probed in a thread pool (the work is mostly header I/O, and forking the multi-threaded
+    ComfyUI server is unsafe), records come back in listing order, and only a bounded
+    number of chunks is in flight so memory stays flat regardless of folder size.
+    """
+    workers = workers if workers > 0 else (os.cpu_count() or 1)
+    chunks = _chunks(iter_image_paths(folder, recursive), PROBE_CHUNK_SIZE)
+    if workers == 1:
+        for chunk in chunks:
+            yield from probe_records(chunk)
+        return
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="SG-folder-probe") as executor:
+        pending = deque()
+        for chunk in chunks:
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+            pending.append(executor.submit(probe_records, chunk))
+        while pending:
+            yield from pending.popleft().result()
+
+
+class FolderSummary:
+    """Running aggregate of folder records: counts, histograms and throughput"""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_mb = 0.0
+        self.resolutions = Counter()
+        self.ratios = Counter()
+        self.models = Counter()
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def add(self, record):
+        self.count += 1
+        if record.get("error"):
+            self.errors += 1
+            return
+        self.total_mb += record["file_size_mb"]
+        self.resolutions[f"{record['width']}x{record['height']}"] += 1
+        self.ratios[record["ratio"]] += 1
+        self.models[record["model"]] += 1
+
+    def finish(self):
+        self.elapsed = time.perf_counter() - self.started
+
+    @property
+    def files_per_sec(self):
+        return self.count / self.elapsed if self.elapsed > 0 else 0.0
+
+    def as_dict(self, top=None):
+        return {
+            "files": self.count,
+            "errors": self.errors,
+            "total_mb": self.total_mb,
+            "elapsed_sec": self.elapsed,
+            "files_per_sec": self.files_per_sec,
+            "resolutions": dict(self.resolutions.most_common(top)),
+            "ratios": dict(self.ratios.most_common(top)),
+            "models": dict(self.models.most_common(top)),
+        }
+
+    def lines(self, top=5):
+        """Display lines: totals, throughput and the top entries of each histogram"""
+        def histogram(counter):
+            return " | ".join(f"{key} ({n})" for key, n in counter.most_common(top)) or "N/A"
+
+        return [
+            f"Files: {self.count} | Errors: {self.errors} | Total: {self.total_mb:.2f}MB",
+            f"Time: {self.elapsed:.2f}s | {self.files_per_sec:.1f} files/sec",
+            "",
+            f"Resolutions: {histogram(self.resolutions)}",
+            f"Ratios: {histogram(self.ratios)}",
+            f"Models: {histogram(self.models)}",
+        ]
+
+
+def analyze_folder(folder, recursive=True, workers=0, csv_path=None, jsonl_path=None):
+    """Stream every record of a folder into a FolderSummary, optionally dumping them to CSV and/or JSONL as they arrive"""
+    summary = FolderSummary()
+    csv_file = open(csv_path, "w", newline="", encoding="utf-8") if csv_path else None
+    jsonl_file = open(jsonl_path, "w", encoding="utf-8") if jsonl_path else None
+    try:
+        writer = csv.DictWriter(csv_file, fieldnames=RECORD_FIELDS) if csv_file else None
+        if writer:
+            writer.writeheader()
+        for record in iter_folder_properties(folder, recursive, workers):
+            summary.add(record)
+            if writer:
+                writer.writerow(record)
+            if jsonl_file:
+                jsonl_file.write(json.dumps(record) + "\n")
+        summary.finish()
+    finally:
+        if csv_file:
+            csv_file.close()
+        if jsonl_file:
+            jsonl_file.close()
+    return summary
+
+
+class BatchFolderAnalyzerSG:
+    """Analyze every image in a folder from headers only: resolution, ratio and model histograms plus CSV/JSONL dumps"""
+
+    CATEGORY = "image/analysis"
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "folder": ("STRING", {
+                    "default": "",
+                    "tooltip": "Folder to analyze (absolute, or relative to the output directory; empty = output directory)"
+                }),
+                "recursive": ("BOOLEAN", {"default": True}),
+                "dump": (["None", "CSV", "JSONL", "Both"], {
+                    "default": "None",
+                    "tooltip": "Write one row per file to the output directory under image_properties_sg/"
+                }),
+            },
+            "optional": {
+                "workers": ("INT", {
+                    "default": 0, "min": 0, "max": 64, "step": 1,
+                    "tooltip": "Header probe workers (0 = CPU count, 1 = serial)"
+                }),
+                "top": ("INT", {"default": 5, "min": 1, "max": 50, "step": 1,
+                                "tooltip": "Entries shown per histogram"}),
+            }
+        }
+
+    RETURN_TYPES = ("STRING", "INT", "FLOAT")
+    RETURN_NAMES = ("summary_json", "file_count", "files_per_sec")
+    FUNCTION = "analyze"
+    OUTPUT_NODE = True
+
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        # Folder contents can change between runs
+        return float("NaN")
+
+    def analyze(self, folder, recursive, dump, workers=0, top=5):
+        output_dir = folder_paths.get_output_directory()
+        folder = os.path.join(output_dir, folder) if folder else output_dir
+        if not os.path.isdir(folder):
+            raise FileNotFoundError(f"Folder not found: {folder}")
+
+        csv_path = jsonl_path = None
+        if dump != "None":
+            dump_dir = os.path.join(output_dir, "image_properties_sg")
+            os.makedirs(dump_dir, exist_ok=True)
+            stem = os.path.join(dump_dir, f"folder_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+            if dump in ("CSV", "Both"):
+                csv_path = stem + ".csv"
+            if dump in ("JSONL", "Both"):
+                jsonl_path = stem + ".jsonl"
+
+        summary = analyze_folder(folder, recursive, workers, csv_path, jsonl_path)
+
+        lines = summary.lines(top)
+        for path in (csv_path, jsonl_path):
+            if path:
+                lines.append(f"Saved: {os.path.relpath(path, output_dir)}")
+
+        return {
+            "ui": {"text": lines},
+            "result": (json.dumps(summary.as_dict(top)), summary.count, float(summary.files_per_sec))
+        }
+
+
+NODE_CLASS_MAPPINGS = {
+    "BatchFolderAnalyzerSG": BatchFolderAnalyzerSG
+}
+
+NODE_DISPLAY_NAME_MAPPINGS = {
+    "BatchFolderAnalyzerSG": "Batch Folder Analyzer-SG"
+}
+
+__all__ = ["NODE_CLASS_MAPPINGS", "NODE_DISPLAY_NAME_MAPPINGS"]
@@ -0,0 +1,64 @@
+import torch
+
+# Rows are converted in slices of roughly this many float32 bytes to keep the temporary small
+CONVERT_TILE_BYTES = 16 * 1024 * 1024
+
+
+def frame_to_uint8(frame, tile_bytes=CONVERT_TILE_BYTES):
+    """
+    Convert one [H, W, C] float frame in 0-1 range to a uint8 numpy array.
+    Values are clamped and rounded in torch on the frame's device, one row slice at a time,
+    so peak extra memory is one uint8 frame plus a single float slice.
+    """
+    height, width = frame.shape[0], frame.shape[1]
+    channels = frame.shape[2] if frame.dim() == 3 else 1
+    out = torch.empty(tuple(frame.shape), dtype=torch.uint8, device="cpu")
+    rows = strip_rows(width, channels, tile_bytes)
+    for start in range(0, height, rows):
+        tile = frame[start:start + rows].mul(255.0)
+        tile.nan_to_num_(0.0).round_().clamp_(0, 255)
+        out[start:start + rows].copy_(tile.to(torch.uint8))
+    return out.numpy()
+
+
+def strip_rows(width, channels, tile_bytes=CONVERT_TILE_BYTES):
+    """Rows per converted slice for a frame of this width"""
+    return max(1, tile_bytes // max(1, width * channels * 4))
+
+
+def iter_uint8_strips(frame, tile_bytes=CONVERT_TILE_BYTES):
+    """
+    Yield one [H, W, C] float frame as uint8 numpy row strips of strip_rows() rows (the last may be shorter),
+    so an encoder can consume the frame without it ever existing as a whole on the host.
+    """
+    height, width = frame.shape[0], frame.shape[1]
+    channels = frame.shape[2] if frame.dim() == 3 else 1
+    rows = strip_rows(width, channels, tile_bytes)
+    for start in range(0, height, rows):
+        tile = frame[start:start + rows].mul(255.0)
+        tile.nan_to_num_(0.0).round_().clamp_(0, 255)
+        yield tile.to(device="cpu", dtype=torch.uint8).numpy()
+
+
+def iter_uint8_frames(images, tile_bytes=CONVERT_TILE_BYTES):
+    """Yield each image of a [B, H, W, C] batch as a uint8 numpy array, one frame at a time"""
+    for i in range(images.shape[0]):
+        yield frame_to_uint8(images[i], tile_bytes)
+
+
+def downscale_frame(frame, max_edge):
+    """Resize one [H, W, C] frame so its longest edge is at most max_edge (0 = unchanged)"""
+    height, width = frame.shape[0], frame.shape[1]
+    if not max_edge or max(height, width) <= max_edge:
+        return frame
+    scale = max_edge / max(height, width)
+    size = (max(1, round(height * scale)), max(1, round(width * scale)))
+    resized = torch.nn.functional.interpolate(frame.movedim(-1, 0).unsqueeze(0), size=size,
+                                              mode="bilinear", antialias=True, align_corners=False)
+    return resized[0].movedim(0, -1)
+
+
+def iter_preview_frames(images, max_edge, tile_bytes=CONVERT_TILE_BYTES):
+    """Yield uint8 frames of a batch downscaled in torch first, so only preview-sized data reaches the host"""
+    for i in range(images.shape[0]):
+        yield frame_to_uint8(downscale_frame(images[i], max_edge), tile_bytes)
@@ -0,0 +1,197 @@
+import zlib
+import numpy as np
+from PIL import ImageOps
+
+# TIFF tags read by the strip reader
+_TAG_ORIENTATION = 274
+_TAG_BITS_PER_SAMPLE = 258
+_TAG_COMPRESSION = 259
+_TAG_STRIP_OFFSETS = 273
+_TAG_SAMPLES_PER_PIXEL = 277
+_TAG_ROWS_PER_STRIP = 278
+_TAG_STRIP_BYTE_COUNTS = 279
+_TAG_PLANAR_CONFIGURATION = 284
+_TAG_PREDICTOR = 317
+_TAG_TILE_WIDTH = 322
+_TAG_SAMPLE_FORMAT = 339
+
+# TIFF SampleFormat -> numpy kind
+_TIFF_SAMPLE_KINDS = {1: "u", 2: "i", 3: "f"}
+
+# No compression, Adobe deflate, old-style deflate
+_TIFF_COMPRESSIONS = (1, 8, 32946)
+
+
+def _rawmode(img):
+    """Pillow rawmode of the first tile (available right after open, before any decode)"""
+    if not img.tile:
+        return img.mode
+    args = img.tile[0][3]
+    rawmode = args if isinstance(args, str) else args[0] if args else None
+    # Some codecs carry other decoder args here (GIF: the LZW code size), not a rawmode
+    return rawmode if isinstance(rawmode, str) else img.mode
+
+
+def sample_bits(img):
+    """(bits per sample, is_float) of a freshly opened image, from its mode and rawmode"""
+    mode, rawmode = img.mode, _rawmode(img)
+    if mode == "1":
+        return 1, False
+    if mode == "F":
+        return (16 if "16" in rawmode else 64 if "64" in rawmode else 32), True
+    if mode.startswith("I;16") or ";16" in rawmode:
+        return 16, False
+    if mode == "I":
+        return (8 if rawmode in ("L", "P") else 32), False
+    return 8, False
+
+
+def depth_label(bits, is_float):
+    return f"{bits}-bit float" if is_float else f"{bits}-bit"
+
+
+def loaded_bits(img):
+    """
+    (bits per sample, is_float) that read_deep_pixels delivers for a freshly opened image. Deep single-channel
+    sources and strip-readable TIFFs keep their native depth; other deep color sources (16-bit PNG, LZW, tiled
+    or planar TIFF) go through PIL's 8-bit decode.
+    """
+    bits, is_float = sample_bits(img)
+    if bits <= 8 or img.mode in ("F", "I") or img.mode.startswith("I;16"):
+        return bits, is_float
+    if _tiff_strip_layout(img) is not None:
+        return bits, is_float
+    return 8, False
+
+
+def bit_depth(img):
+    """
+    Display label of the native bit depth, e.g. "8-bit", "16-bit" or "32-bit float", noting when the
+    loaded tensor holds less, e.g. "16-bit (loaded as 8-bit)"
+    """
+    native, loaded = sample_bits(img), loaded_bits(img)
+    label = depth_label(*native)
+    return label if loaded == native else f"{label} (loaded as {depth_label(*loaded)})"
+
+
+def _orient(pixels, orientation):
+    """Apply an EXIF orientation to an [H, W, C] array, like ImageOps.exif_transpose"""
+    if orientation == 2:
+        return pixels[:, ::-1]
+    if orientation == 3:
+        return pixels[::-1, ::-1]
+    if orientation == 4:
+        return pixels[::-1]
+    if orientation == 5:
+        return pixels.swapaxes(0, 1)
+    if orientation == 6:
+        return np.rot90(pixels, -1)
+    if orientation == 7:
+        return pixels[::-1, ::-1].swapaxes(0, 1)
+    if orientation == 8:
+        return np.rot90(pixels)
+    return pixels
+
+
+def _tiff_strip_layout(img):
+    """
+    (width, height, samples, bits, kind, compression, predictor) of a TIFF the strip reader handles, or None.
+    Only tags are read, so this is as cheap as the header probe.
+    """
+    if img.format != "TIFF" or not img.tile:
+        return None
+    tags = img.tag_v2
+    # Stored (unrotated) raster size; Pillow reports TIFF sizes already oriented
+    width, height = max(t[1][2] for t in img.tile), max(t[1][3] for t in img.tile)
+    samples = tags.get(_TAG_SAMPLES_PER_PIXEL, 1)
+    compression = tags.get(_TAG_COMPRESSION, 1)
+    predictor = tags.get(_TAG_PREDICTOR, 1)
+    bits = tags.get(_TAG_BITS_PER_SAMPLE, (8,))
+    bits = bits if isinstance(bits, tuple) else (bits,)
+    kinds = tags.get(_TAG_SAMPLE_FORMAT, (1,))
+    kinds = {_TIFF_SAMPLE_KINDS.get(k) for k in (kinds if isinstance(kinds, tuple) else (kinds,))}
+    if (_TAG_TILE_WIDTH in tags or tags.get(_TAG_PLANAR_CONFIGURATION, 1) != 1 or samples not in (1, 3, 4)
+            or len(set(bits)) != 1 or bits[0] not in (16, 32) or len(kinds) != 1 or None in kinds
+            or (kinds == {"f"} and bits[0] != 32) or compression not in _TIFF_COMPRESSIONS
+            or predictor not in ((1, 2) if kinds != {"f"} else (1,))
+            or tags.get(_TAG_STRIP_OFFSETS) is None or tags.get(_TAG_STRIP_BYTE_COUNTS) is None):
+        return None
+    return width, height, samples, bits[0], kinds.pop(), compression, predictor
+
+
+def _read_tiff_strips(path, img):
+    """
+    Read the strips of a chunky 16/32-bit TIFF (gray, RGB or RGBA) straight into an [H, W, C] array in the
+    stored orientation. Pillow only decodes 16-bit RGB(A) to 8 bits, and its handling of the EXIF
+    orientation of deep single-channel TIFFs depends on the codec. Uncompressed and deflate strips are
+    handled, with or without the horizontal predictor. Returns None for other layouts (tiles, planar data,
+    LZW/JPEG compression).
+    """
+    layout = _tiff_strip_layout(img)
+    if layout is None:
+        return None
+    width, height, samples, bits, kind, compression, predictor = layout
+    tags = img.tag_v2
+    offsets = tags.get(_TAG_STRIP_OFFSETS)
+    counts = tags.get(_TAG_STRIP_BYTE_COUNTS)
+    offsets = offsets if isinstance(offsets, tuple) else (offsets,)
+    counts = counts if isinstance(counts, tuple) else (counts,)
+    rows_per_strip = min(tags.get(_TAG_ROWS_PER_STRIP, height), height)
+    dtype = f"{kind}{bits // 8}"
+    stored = np.dtype(("<" if tags.prefix == b"II" else ">") + dtype)
+
+    pixels = np.empty((height, width, samples), dtype=dtype)
+    with open(path, "rb") as f:
+        for index, (offset, count) in enumerate(zip(offsets, counts)):
+            y0 = index * rows_per_strip
+            if y0 >= height:
+                break
+            rows = min(rows_per_strip, height - y0)
+            f.seek(offset)
+            data = f.read(count)
+            if compression != 1:
+                data = zlib.decompress(data)
+            strip = np.frombuffer(data, dtype=stored, count=rows * width * samples).reshape(rows, width, samples)
+            if predictor == 2:
+                # Horizontal differencing: each sample stores the delta to its left neighbour, wrapping around
+                np.cumsum(strip, axis=1, dtype=pixels.dtype, out=pixels[y0:y0 + rows])
+            else:
+                pixels[y0:y0 + rows] = strip
+    return pixels
+
+
+def read_deep_pixels(path, img):
+    """
+    Pixels of a source deeper than 8 bits per sample: I;16, I and F images, and 16-bit RGB(A) TIFF.
+    Returns (pixels [H, W, C], color slice, alpha index, scale), with scale bringing the native bit depth
+    to 0-1 (float data is kept as stored), or None for 8-bit sources, which PIL decodes as before.
+    img must be freshly opened; EXIF orientation is applied.
+    """
+    bits, is_float = sample_bits(img)
+    if bits <= 8:
+        return None
+    if is_float:
+        scale = 1.0
+    elif img.mode == "I" and bits == 32:
+        scale = 1.0 / (2 ** 31 - 1)
+    else:
+        scale = 1.0 / (2 ** bits - 1)
+
+    single_channel = img.mode == "F" or img.mode == "I" or img.mode.startswith("I;16")
+    if img.format == "TIFF":
+        # Orientation is read before any decode: Pillow drops the tag when it loads the pixels
+        orientation = int(img.tag_v2.get(_TAG_ORIENTATION, 1) or 1)
+        pixels = _read_tiff_strips(path, img)
+        if pixels is not None:
+            channels = pixels.shape[2]
+            color = slice(0, 1) if channels == 1 else slice(0, 3)
+            return _orient(pixels, orientation), color, (3 if channels == 4 else None), scale
+        if not single_channel:
+            return None
+        # Other codecs go through libtiff, which leaves the pixels oriented already
+        return np.asarray(img)[:, :, None], slice(0, 1), None, scale
+
+    if single_channel:
+        pixels = np.asarray(ImageOps.exif_transpose(img))
+        return pixels[:, :, None], slice(0, 1), None, scale
+    return None
@@ -0,0 +1,150 @@
+import os
+import numpy as np
+import torch
+from PIL import Image
+
+# Raw Pillow layouts that can be mapped straight from disk:
+# rawmode -> (numpy dtype, stored channels, RGB (or gray) channel slice, alpha index)
+_RAW_LAYOUTS = {
+    "L": ("u1", 1, slice(0, 1), None),
+    "RGB": ("u1", 3, slice(0, 3), None),
+    "RGBX": ("u1", 4, slice(0, 3), None),
+    "RGBA": ("u1", 4, slice(0, 3), 3),
+    "BGR": ("u1", 3, slice(2, None, -1), None),
+    "BGRX": ("u1", 4, slice(2, None, -1), None),
+    "BGRA": ("u1", 4, slice(2, None, -1), 3),
+    "I;16": ("<u2", 1, slice(0, 1), None),
+    "I;16L": ("<u2", 1, slice(0, 1), None),
+    "I;16B": (">u2", 1, slice(0, 1), None),
+    "RGB;16L": ("<u2", 3, slice(0, 3), None),
+    "RGB;16B": (">u2", 3, slice(0, 3), None),
+    "RGBA;16L": ("<u2", 4, slice(0, 3), 3),
+    "RGBA;16B": (">u2", 4, slice(0, 3), 3),
+    "I;32S": ("<i4", 1, slice(0, 1), None),
+    "I;32BS": (">i4", 1, slice(0, 1), None),
+    "F;32F": ("<f4", 1, slice(0, 1), None),
+    "F;32BF": (">f4", 1, slice(0, 1), None),
+}
+
+MMAP_EXTENSIONS = (".tif", ".tiff", ".bmp", ".ppm", ".pgm", ".pnm", ".npy")
+
+
+def _scale_for(dtype):
+    """Multiplier that brings stored values into the 0-1 range"""
+    if dtype.kind in "ui":
+        return 1.0 / float(np.iinfo(dtype).max)
+    return 1.0
+
+
+def _map_raw_tiles(path, img):
+    """Memory-map the pixel rows of an uncompressed Pillow image, or None if the layout isn't a plain raster"""
+    width, height = img.size
+    tiles = img.tile
+    if not tiles or any(t[0] != "raw" for t in tiles):
+        return None
+
+    first = tiles[0]
+    args = first[3] if isinstance(first[3], tuple) else (first[3], 0, 1)
+    rawmode = args[0]
+    stride = args[1] if len(args) > 1 else 0
+    orientation = args[2] if len(args) > 2 else 1
+    layout = _RAW_LAYOUTS.get(rawmode)
+    if layout is None:
+        return None
+
+    dtype, stored, color, alpha = layout
+    dtype = np.dtype(dtype)
+    row_bytes = width * stored * dtype.itemsize
+    stride = stride or row_bytes
+
+    # Strips must be full-width and laid out back to back in row order
+    offset = first[2]
+    for tile in tiles:
+        tile_args = tile[3] if isinstance(tile[3], tuple) else (tile[3],)
+        x0, y0, x1, _ = tile[1]
+        if tile_args[0] != rawmode or x0 != 0 or x1 != width or tile[2] != offset + y0 * stride:
+            return None
+    if offset + height * stride > os.path.getsize(path):
+        return None
+
+    rows = np.memmap(path, dtype=np.uint8, mode="r", offset=offset, shape=(height, stride))
+    pixels = rows[:, :row_bytes].view(dtype).reshape(height, width, stored)
+    if orientation < 0:
+        pixels = pixels[::-1]
+    return pixels, color, alpha
+
+
+def _map_npy(path):
+    """Memory-map a .npy array shaped [H, W], [H, W, C] or [1, H, W, C]"""
+    array = np.load(path, mmap_mode="r", allow_pickle=False)
+    if array.ndim == 4 and array.shape[0] == 1:
+        array = array[0]
+    if array.ndim == 2:
+        array = array[:, :, None]
+    if array.ndim != 3 or array.dtype.kind not in "uif":
+        return None
+    stored = array.shape[2]
+    if stored in (1, 3):
+        return array, slice(0, stored), None
+    if stored == 4:
+        return array, slice(0, 3), 3
+    return None
+
+
+def map_pixels(path):
+    """
+    Memory-map the pixel data of an uncompressed image or .npy file.
+    Returns (pixels [H, W, C] view, color slice, alpha index) or None when the file has to be decoded.
+    """
+    if not path.lower().endswith(MMAP_EXTENSIONS):
+        return None
+    if path.lower().endswith(".npy"):
+        return _map_npy(path)
+    with Image.open(path) as img:
+        try:
+            orientation = int(img.getexif().get(0x0112, 1) or 1)
+        except Exception:
+            orientation = 1
+        if orientation != 1 or getattr(img, "n_frames", 1) != 1:
+            return None
+        return _map_raw_tiles(path, img)
+
+
+def pixels_to_tensors(pixels, color, alpha, scale=None):
+    """
+    Build the [1, H, W, 3] image tensor and [H, W] mask from [H, W, C] pixels of any numeric dtype.
+    Each output is written by a single scaled ufunc pass, with no intermediate full-frame copies.
+    scale defaults to the dtype's full range; float pixels are kept as they are.
+    """
+    height, width = pixels.shape[0], pixels.shape[1]
+    if scale is None:
+        scale = _scale_for(pixels.dtype)
+
+    # Gray sources broadcast into all three channels, like convert('RGB')
+    image = np.empty((height, width, 3), dtype=np.float32)
+    np.multiply(pixels[:, :, color], scale, out=image, casting="unsafe")
+
+    mask = np.empty((height, width), dtype=np.float32)
+    if alpha is not None:
+        np.multiply(pixels[:, :, alpha], -scale, out=mask, casting="unsafe")
+        mask += 1.0
+    else:
+        mask.fill(0.0)
+    if pixels.dtype.kind == "i":
+        # Signed sources have no meaningful negative intensities
+        np.maximum(image, 0.0, out=image)
+        np.minimum(mask, 1.0, out=mask)
+
+    return torch.from_numpy(image).unsqueeze(0), torch.from_numpy(mask)
+
+
+def load_mmap_tensor(path):
+    """
+    Build the image tensor and mask straight from memory-mapped pixels (see pixels_to_tensors).
+    Returns None when the file isn't a plain uncompressed raster.
+    """
+    mapped = map_pixels(path)
+    if mapped is None:
+        return None
+    pixels, color, alpha = mapped
+    return pixels_to_tensors(pixels, color, alpha)
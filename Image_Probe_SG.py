@@ -0,0 +1,68 @@
+import os
+import numpy as np
+from PIL import Image
+
+from .Image_Depth_SG import bit_depth, depth_label
+
+# EXIF orientations that rotate the image by 90/270 degrees (width and height swap)
+_TRANSPOSED_ORIENTATIONS = (5, 6, 7, 8)
+
+
+class ImageProbe:
+    """
+    Header-only view of an image file: dimensions, mode, bit depth, orientation and text metadata,
+    no pixel decode
+    """
+
+    def __init__(self, path, width, height, mode, orientation, info, image_format, file_size, bit_depth="8-bit"):
+        self.path = path
+        self.width = width
+        self.height = height
+        self.mode = mode
+        self.orientation = orientation
+        self.info = info
+        self.format = image_format
+        self.file_size = file_size
+        self.bit_depth = bit_depth
+
+    @property
+    def bands(self):
+        return Image.getmodebands(self.mode) if self.mode else 0
+
+
+# Pillow mode reported for .npy arrays by channel count
+_NPY_MODES = {1: "L", 3: "RGB", 4: "RGBA"}
+
+
+def _probe_npy(path, file_size):
+    """Read only the .npy header: shape and dtype, the array data is memory-mapped, not loaded"""
+    array = np.load(path, mmap_mode="r", allow_pickle=False)
+    shape = array.shape[1:] if array.ndim == 4 and array.shape[0] == 1 else array.shape
+    height, width = shape[0], shape[1]
+    channels = shape[2] if len(shape) == 3 else 1
+    label = depth_label(array.dtype.itemsize * 8, array.dtype.kind == "f")
+    return ImageProbe(path, width, height, _NPY_MODES.get(channels), 1, {}, "NPY", file_size, label)
+
+
+def probe_image(path):
+    """Open an image lazily and read only its header and metadata chunks"""
+    file_size = os.path.getsize(path)
+    if path.lower().endswith(".npy"):
+        return _probe_npy(path, file_size)
+    with Image.open(path) as img:
+        width, height = img.size
+        # Tile-based reads come first: getexif() can decode the image (PNG eXIf after IDAT), which clears the tiles
+        depth = bit_depth(img)
+        stored_size = (max(t[1][2] for t in img.tile), max(t[1][3] for t in img.tile)) if img.tile else img.size
+        orientation = 1
+        try:
+            orientation = int(img.getexif().get(0x0112, 1) or 1)
+        except Exception:
+            orientation = 1
+        # Pillow already reports the oriented size for some formats (TIFF); those no longer match the
+        # stored raster size given by the tile extents
+        if orientation in _TRANSPOSED_ORIENTATIONS and img.size == stored_size:
+            width, height = height, width
+        # PNG tEXt/iTXt/zTXt chunks ahead of IDAT are already parsed into info on open
+        info = dict(img.info)
+        return ImageProbe(path, width, height, img.mode, orientation, info, img.format, file_size, depth)
@@ -0,0 +1,149 @@
+import torch
+import torch.nn.functional as F
+
+# Rec. 709 luma weights
+_LUMA_WEIGHTS = (0.2126, 0.7152, 0.0722)
+
+
+def _channel_names(channels):
+    if channels == 1:
+        return ["L"]
+    if channels in (3, 4):
+        return list("RGBA"[:channels])
+    return [f"C{i}" for i in range(channels)]
+
+
+@torch.no_grad()
+def batch_statistics(images, clip_low=0.0, clip_high=1.0):
+    """
+    Per-channel min/max/mean/std, NaN/Inf counts and clipping percentages for a [B, H, W, C] batch.
+    Everything is reduced on the tensor's own device and copied back as a single small tensor.
+    """
+    channels = images.shape[-1]
+    x = images.reshape(-1, channels)
+    count = x.shape[0]
+
+    nan_count = torch.isnan(x).sum(dim=0)
+    inf_count = torch.isinf(x).sum(dim=0)
+    has_nonfinite = bool((nan_count + inf_count).any())
+
+    if has_nonfinite:
+        # Only pay for masked copies when the batch actually contains NaN/Inf
+        finite = torch.isfinite(x)
+        x_nan = torch.where(finite, x, torch.nan)
+        mins = torch.where(finite, x, torch.inf).amin(dim=0)
+        maxs = torch.where(finite, x, -torch.inf).amax(dim=0)
+        means = torch.nanmean(x_nan, dim=0)
+        stds = torch.nanmean((x_nan - means).square(), dim=0).sqrt()
+        del x_nan
+    else:
+        mins = x.amin(dim=0)
+        maxs = x.amax(dim=0)
+        stds, means = torch.std_mean(x, dim=0, correction=0)
+
+    clipped_low = (x <= clip_low).sum(dim=0)
+    clipped_high = (x >= clip_high).sum(dim=0)
+
+    packed = torch.stack([
+        mins.double(), maxs.double(), means.double(), stds.double(),
+        nan_count.double(), inf_count.double(),
+        clipped_low.double() * 100.0 / max(1, count),
+        clipped_high.double() * 100.0 / max(1, count),
+    ]).cpu().tolist()
+
+    keys = ["min", "max", "mean", "std", "nan", "inf", "clipped_low_pct", "clipped_high_pct"]
+    stats = {"channels": {}}
+    for c, name in enumerate(_channel_names(channels)):
+        stats["channels"][name] = {key: packed[k][c] for k, key in enumerate(keys)}
+    stats["nan_count"] = int(sum(packed[4]))
+    stats["inf_count"] = int(sum(packed[5]))
+    stats["clipped_low_pct"] = sum(packed[6]) / channels
+    stats["clipped_high_pct"] = sum(packed[7]) / channels
+    return stats
+
+
+def format_statistics(stats):
+    """Display lines for batch_statistics() output"""
+    lines = []
+    for name, s in stats["channels"].items():
+        lines.append(f"{name}: min {s['min']:.3f} | max {s['max']:.3f} | mean {s['mean']:.3f} | std {s['std']:.3f}")
+    lines.append(f"NaN: {stats['nan_count']} | Inf: {stats['inf_count']} | "
+                 f"Clipped: {stats['clipped_low_pct']:.2f}% low, {stats['clipped_high_pct']:.2f}% high")
+    return lines
+
+
+def _luminance(images):
+    """[B, H, W] luma of a [B, H, W, C] batch (single-channel batches are used as is)"""
+    if images.shape[-1] >= 3:
+        weights = torch.tensor(_LUMA_WEIGHTS, dtype=images.dtype, device=images.device)
+        return images[..., :3] @ weights
+    return images[..., 0]
+
+
+@torch.no_grad()
+def frame_statistics(images, blank_threshold=0.01, duplicate_distance=4):
+    """
+    Per-frame mean luminance, min/max/dynamic range, a 64-bit difference hash (dHash), and
+    blank / near-duplicate flags for a [B, H, W, C] batch, all computed in one vectorized pass.
+    A frame is blank when its luma std is below blank_threshold, and a near-duplicate when its hash
+    is within duplicate_distance bits of an earlier non-blank frame. Returns (frames, keep) where
+    keep is a bool tensor on the batch's device that can index the batch directly.
+    """
+    batch = images.shape[0]
+    luma = _luminance(images).float()
+    flat = luma.reshape(batch, -1)
+    std, mean = torch.std_mean(flat, dim=1, correction=0)
+    low = flat.amin(dim=1)
+    high = flat.amax(dim=1)
+
+    # dHash: 9x8 area-downscaled luma, one bit per horizontal gradient sign
+    small = F.interpolate(luma.unsqueeze(1), size=(8, 9), mode="area").squeeze(1)
+    bits = (small[:, :, 1:] > small[:, :, :-1]).reshape(batch, 64)
+
+    blank = std < blank_threshold
+    distances = (bits.unsqueeze(1) != bits.unsqueeze(0)).sum(dim=2)
+    earlier = torch.ones(batch, batch, dtype=torch.bool, device=images.device).tril(diagonal=-1)
+    near = (distances <= duplicate_distance) & earlier & ~blank.unsqueeze(0)
+    duplicate = near.any(dim=1) & ~blank
+    # Nearest earlier match, reported as the frame a duplicate repeats
+    masked = torch.where(near, distances, torch.full_like(distances, 65))
+    duplicate_of = torch.where(duplicate, masked.argmin(dim=1), torch.full_like(mean, -1, dtype=torch.long))
+    keep = ~(blank | duplicate)
+
+    packed = torch.cat([
+        torch.stack([mean, low, high, std]).double().T,
+        torch.stack([blank, duplicate]).double().T,
+        duplicate_of.double().unsqueeze(1),
+        bits.double(),
+    ], dim=1).cpu().tolist()
+
+    frames = []
+    for index, row in enumerate(packed):
+        hash_bits = "".join("1" if bit else "0" for bit in row[7:])
+        frames.append({
+            "index": index,
+            "mean_luminance": row[0],
+            "min_luminance": row[1],
+            "max_luminance": row[2],
+            "dynamic_range": row[2] - row[1],
+            "luminance_std": row[3],
+            "blank": bool(row[4]),
+            "duplicate": bool(row[5]),
+            "duplicate_of": int(row[6]) if row[5] else None,
+            "dhash": f"{int(hash_bits, 2):016x}",
+        })
+    return frames, keep
+
+
+def format_frame_statistics(frames):
+    """Display line summarizing frame_statistics() flags"""
+    blank = [f["index"] for f in frames if f["blank"]]
+    duplicate = [f["index"] for f in frames if f["duplicate"]]
+    if not blank and not duplicate:
+        return f"Frames: {len(frames)} ok"
+    parts = []
+    if blank:
+        parts.append(f"blank {blank}")
+    if duplicate:
+        parts.append(f"near-duplicate {duplicate}")
+    return f"Frames: {len(frames) - len(set(blank + duplicate))}/{len(frames)} ok | " + " | ".join(parts)
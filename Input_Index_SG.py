@@ -0,0 +1,156 @@
+import bisect
+import os
+import threading
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+# Extensions listed by the Load node (.npy is served by the memory-mapped loader)
+IMAGE_EXTENSIONS = (
+    ".png", ".jpg", ".jpeg", ".webp", ".bmp", ".gif", ".tif", ".tiff",
+    ".ppm", ".pgm", ".pnm", ".tga", ".avif", ".heic", ".heif", ".jxl", ".npy",
+)
+
+
+class _DirtyHandler(FileSystemEventHandler):
+    """Watcher callback: any event under the root just marks the index for a re-check"""
+
+    def __init__(self, index):
+        self.index = index
+
+    def on_any_event(self, event):
+        self.index.mark_dirty()
+
+
+class DirectoryIndex:
+    """
+    Sorted listing of the image files under a directory tree, refreshed incrementally.
+    Only directories whose mtime changed are re-listed, and additions/removals are merged into the
+    sorted list with bisect instead of re-sorting. With watchdog installed the directory stats are
+    skipped entirely until the watcher reports a change; without it every call polls directory mtimes.
+    """
+
+    def __init__(self, root, extensions=IMAGE_EXTENSIONS, recursive=True, watch=True):
+        self.root = os.path.abspath(root)
+        self.extensions = tuple(e.lower() for e in extensions)
+        self.recursive = recursive
+        self._lock = threading.Lock()
+        self._dir_mtimes = {}
+        self._dir_files = {}
+        self._files = []
+        self._dirty = True
+        self._observer = None
+        if watch and Observer is not None:
+            try:
+                self._observer = Observer()
+                self._observer.schedule(_DirtyHandler(self), self.root, recursive=recursive)
+                self._observer.daemon = True
+                self._observer.start()
+            except Exception:
+                self._observer = None
+
+    def mark_dirty(self):
+        self._dirty = True
+
+    def files(self):
+        """Current sorted list of relative paths ("sub/name.png" for subfolders)"""
+        with self._lock:
+            if self._dirty or self._observer is None:
+                # Clear first so events that land during the refresh trigger another one
+                self._dirty = False
+                self._refresh()
+            return list(self._files)
+
+    def _refresh(self):
+        if not self._dir_mtimes:
+            self._scan_dir("")
+            return
+        for rel_dir in list(self._dir_mtimes):
+            if rel_dir not in self._dir_mtimes:
+                continue  # dropped together with a removed parent
+            try:
+                mtime = os.stat(self._abs(rel_dir)).st_mtime_ns
+            except OSError:
+                self._drop_dir(rel_dir)
+                continue
+            if mtime != self._dir_mtimes[rel_dir]:
+                self._scan_dir(rel_dir)
+
+    def _abs(self, rel_dir):
+        return os.path.join(self.root, rel_dir) if rel_dir else self.root
+
+    def _scan_dir(self, rel_dir):
+        """List one directory and merge its changes into the sorted list"""
+        path = self._abs(rel_dir)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            entries = list(os.scandir(path))
+        except OSError:
+            self._drop_dir(rel_dir)
+            return
+        self._dir_mtimes[rel_dir] = mtime
+
+        prefix = rel_dir + "/" if rel_dir else ""
+        found = set()
+        subdirs = []
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            try:
+                if entry.is_file():
+                    if entry.name.lower().endswith(self.extensions):
+                        found.add(prefix + entry.name)
+                elif self.recursive and entry.is_dir():
+                    subdirs.append(prefix + entry.name)
+            except OSError:
+                continue
+
+        previous = self._dir_files.get(rel_dir, set())
+        for name in previous - found:
+            i = bisect.bisect_left(self._files, name)
+            if i < len(self._files) and self._files[i] == name:
+                del self._files[i]
+        for name in found - previous:
+            bisect.insort(self._files, name)
+        self._dir_files[rel_dir] = found
+
+        # Subfolders that disappeared from this directory go with everything below them
+        for known in [d for d in self._dir_mtimes if d != rel_dir and d.startswith(prefix) and "/" not in d[len(prefix):]]:
+            if known not in subdirs:
+                self._drop_dir(known)
+        for sub in subdirs:
+            if sub not in self._dir_mtimes:
+                self._scan_dir(sub)
+
+    def _drop_dir(self, rel_dir):
+        """Forget a directory that no longer exists, with everything below it"""
+        prefix = rel_dir + "/" if rel_dir else ""
+        for known in [d for d in self._dir_mtimes if d == rel_dir or d.startswith(prefix)]:
+            for name in self._dir_files.pop(known, ()):
+                i = bisect.bisect_left(self._files, name)
+                if i < len(self._files) and self._files[i] == name:
+                    del self._files[i]
+            del self._dir_mtimes[known]
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_directory_index(root):
+    """Shared index per directory, created on first use"""
+    root = os.path.abspath(root)
+    with _indexes_lock:
+        index = _indexes.get(root)
+        if index is None:
+            index = DirectoryIndex(root)
+            _indexes[root] = index
+        return index
+
+
+def list_input_images(root):
+    return get_directory_index(root).files()
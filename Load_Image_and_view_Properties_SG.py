@@ -1,12 +1,92 @@
 import torch
-import math
 import os
 import folder_paths
 from PIL import Image, ImageOps
 import numpy as np
 import hashlib
-import json
-import re
+import threading
+from collections import OrderedDict
+from .Aspect_Ratio_SG import aspect_ratio, ratio_line
+from .Image_Depth_SG import read_deep_pixels
+from .Image_Mmap_SG import load_mmap_tensor, pixels_to_tensors
+from .Input_Index_SG import DirectoryIndex, list_input_images
+from .Image_Probe_SG import probe_image
+from .Metadata_Extractor_SG import extract_image_metadata
+from .Metadata_Index_SG import get_metadata_index
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# Hash used by IS_CHANGED: "sha256", "blake2b" or "xxhash" (falls back to blake2b if xxhash is not installed)
+HASH_ALGORITHM = "sha256"
+HASH_CHUNK_SIZE = 1024 * 1024
+DIGEST_CACHE_SIZE = 256
+
+# "mmap" maps uncompressed TIFF/BMP/PPM and .npy pixels straight from disk (other files are decoded),
+# "decode" goes through PIL for every image file (.npy arrays are always mapped)
+LOADER_MODES = ["mmap", "decode"]
+
+_digest_cache = OrderedDict()
+_digest_cache_lock = threading.Lock()
+
+
+def _new_hasher(algorithm):
+    if algorithm == "xxhash" and xxhash is not None:
+        return xxhash.xxh3_128()
+    if algorithm in ("xxhash", "blake2b"):
+        return hashlib.blake2b(digest_size=32)
+    return hashlib.sha256()
+
+
+def file_digest(path, algorithm=None):
+    """Hash a file in fixed-size chunks, skipping the read when (path, size, mtime, inode) is unchanged"""
+    algorithm = algorithm or HASH_ALGORITHM
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_size, st.st_mtime_ns, st.st_ino, algorithm)
+
+    with _digest_cache_lock:
+        digest = _digest_cache.get(key)
+        if digest is not None:
+            _digest_cache.move_to_end(key)
+            return digest
+
+    m = _new_hasher(algorithm)
+    buf = bytearray(HASH_CHUNK_SIZE)
+    view = memoryview(buf)
+    with open(path, 'rb', buffering=0) as f:
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            m.update(view[:n])
+    digest = m.hexdigest()
+
+    with _digest_cache_lock:
+        _digest_cache[key] = digest
+        _digest_cache.move_to_end(key)
+        while len(_digest_cache) > DIGEST_CACHE_SIZE:
+            _digest_cache.popitem(last=False)
+    return digest
+
+
+def index_folder(folder, prune=True):
+    """Bulk-index every image under a folder (subfolders included); returns (indexed, pruned) counts"""
+    index = get_metadata_index()
+    if index is None:
+        return 0, 0
+    pruned = index.prune(folder) if prune else 0
+    node = LoadImageandviewPropertiesSG()
+    indexed = 0
+    for name in DirectoryIndex(folder, watch=False).files():
+        try:
+            node.analyze_properties(os.path.join(folder, name))
+            indexed += 1
+        except Exception as e:
+            print(f"Error indexing {name}: {e}")
+    return indexed, pruned
+
 
 class LoadImageandviewPropertiesSG:
     """Load image with drag-and-drop and automatically extract all parameters"""
@@ -15,11 +95,17 @@ class LoadImageandviewPropertiesSG:
     
     @classmethod
     def INPUT_TYPES(cls):
-        input_dir = folder_paths.get_input_directory()
-        files = [f for f in os.listdir(input_dir) if os.path.isfile(os.path.join(input_dir, f))]
+        # Cached, incrementally sorted listing: only changed directories are re-read
+        files = list_input_images(folder_paths.get_input_directory())
         return {
             "required": {
-                "image": (sorted(files), {"image_upload": True}),
+                "image": (files, {"image_upload": True}),
+            },
+            "optional": {
+                "loader": (LOADER_MODES, {
+                    "default": "mmap",
+                    "tooltip": "mmap: memory-map uncompressed TIFF/BMP/PPM and .npy files and convert them in one pass (16-bit kept at full precision)\ndecode: always decode image files (16-bit, 32-bit and float sources still keep full precision); .npy files are always memory-mapped"
+                }),
             },
         }
     
@@ -29,13 +115,10 @@ class LoadImageandviewPropertiesSG:
     OUTPUT_NODE = True
     
     @classmethod
-    def IS_CHANGED(cls, image):
+    def IS_CHANGED(cls, image, loader="mmap"):
         # Force re-execution when image changes
         image_path = folder_paths.get_annotated_filepath(image)
-        m = hashlib.sha256()
-        with open(image_path, 'rb') as f:
-            m.update(f.read())
-        return m.digest().hex()
+        return file_digest(image_path)
     
     @classmethod
     def VALIDATE_INPUTS(cls, image):
@@ -44,160 +127,101 @@ class LoadImageandviewPropertiesSG:
             return "Invalid image file: {}".format(image)
         return True
     
-    def extract_model_name(self, img):
-        """Extract model name from image metadata"""
-        model_name = "N/A"
-        try:
-            if not hasattr(img, 'info') or not img.info:
-                return model_name
-            
-            if 'prompt' in img.info:
-                try:
-                    prompt_data = json.loads(img.info['prompt'])
-                    for node_id, node_data in prompt_data.items():
-                        class_type = node_data.get('class_type', '')
-                        inputs = node_data.get('inputs', {})
-                        
-                        if 'CheckpointLoader' in class_type and 'ckpt_name' in inputs:
-                            model_name = inputs['ckpt_name']
-                            break
-                        if 'UNETLoader' in class_type and 'unet_name' in inputs:
-                            model_name = f"{inputs['unet_name']} (UNET)"
-                            break
-                        if 'Loader' in class_type:
-                            if 'ckpt_name' in inputs:
-                                model_name = inputs['ckpt_name']
-                                break
-                            elif 'unet_name' in inputs:
-                                model_name = f"{inputs['unet_name']} (UNET)"
-                                break
-                            elif 'model_name' in inputs:
-                                model_name = inputs['model_name']
-                                break
-                except Exception as e:
-                    print(f"Error parsing prompt metadata: {e}")
-            
-            if model_name == "N/A" and 'workflow' in img.info:
-                try:
-                    workflow_data = json.loads(img.info['workflow'])
-                    for node in workflow_data.get('nodes', []):
-                        node_type = node.get('type', '')
-                        if 'Checkpoint' in node_type or 'Loader' in node_type:
-                            widgets = node.get('widgets_values', [])
-                            if widgets and len(widgets) > 0:
-                                model_name = widgets[0]
-                                break
-                except Exception as e:
-                    print(f"Error parsing workflow metadata: {e}")
-            
-            if model_name == "N/A" and 'parameters' in img.info:
-                try:
-                    params = img.info['parameters']
-                    model_pattern = r'Model:\s*([^,\n]+)'
-                    match = re.search(model_pattern, params)
-                    if match:
-                        model_name = match.group(1).strip()
-                except Exception as e:
-                    print(f"Error parsing A1111 metadata: {e}")
+    def analyze_properties(self, image_path):
+        """Properties from the persistent index when the file is unchanged, otherwise from a fresh probe"""
+        index = get_metadata_index()
+        if index is None:
+            return self.probe_properties(image_path)
+        st = os.stat(image_path)
+        props = index.get(image_path, st)
+        if props is None:
+            props = self.probe_properties(image_path)
+            index.put(image_path, props, st)
+        return props
+    
+    def probe_properties(self, image_path):
+        """Build the properties text from a header-only probe, without decoding pixels"""
+        probe = probe_image(image_path)
         
-        except Exception as e:
-            print(f"Error extracting model metadata: {e}")
+        # Extract metadata
+        model_name, gen_params = extract_image_metadata(probe.info)
         
-        return model_name
-    
-    def extract_generation_params(self, img):
-        """Extract generation parameters (seed, steps, cfg, sampler, scheduler) from image metadata"""
-        params = {
-            'seed': 'N/A',
-            'steps': 'N/A',
-            'cfg': 'N/A',
-            'sampler': 'N/A',
-            'scheduler': 'N/A'
-        }
+        # Dimensions are already corrected for EXIF orientation by the probe
+        width, height = probe.width, probe.height
         
-        try:
-            if not hasattr(img, 'info') or not img.info:
-                return params
-            
-            # Try ComfyUI format first
-            if 'prompt' in img.info:
-                try:
-                    prompt_data = json.loads(img.info['prompt'])
-                    for node_id, node_data in prompt_data.items():
-                        class_type = node_data.get('class_type', '')
-                        inputs = node_data.get('inputs', {})
-                        
-                        # KSampler node has all the info we need
-                        if class_type == "KSampler":
-                            params['seed'] = inputs.get('seed', 'N/A')
-                            params['steps'] = inputs.get('steps', 'N/A')
-                            params['cfg'] = inputs.get('cfg', 'N/A')
-                            params['sampler'] = inputs.get('sampler_name', 'N/A')
-                            params['scheduler'] = inputs.get('scheduler', 'N/A')
-                            return params
-                        
-                        # Check individual nodes for distributed sampler setup
-                        if 'seed' in inputs or 'noise_seed' in inputs:
-                            params['seed'] = inputs.get('seed', inputs.get('noise_seed', params['seed']))
-                        if 'steps' in inputs:
-                            params['steps'] = inputs.get('steps', params['steps'])
-                        if 'cfg' in inputs:
-                            params['cfg'] = inputs.get('cfg', params['cfg'])
-                        if 'sampler_name' in inputs:
-                            params['sampler'] = inputs.get('sampler_name', params['sampler'])
-                        if 'scheduler' in inputs:
-                            params['scheduler'] = inputs.get('scheduler', params['scheduler'])
-                except Exception as e:
-                    print(f"Error parsing ComfyUI generation params: {e}")
-            
-            # Try A1111/Forge format
-            if 'parameters' in img.info and any(v == 'N/A' for v in params.values()):
-                try:
-                    metadata_text = img.info['parameters']
-                    
-                    seed_match = re.search(r'Seed:\s*(\d+)', metadata_text)
-                    if seed_match:
-                        params['seed'] = int(seed_match.group(1))
-                    
-                    steps_match = re.search(r'Steps:\s*(\d+)', metadata_text)
-                    if steps_match:
-                        params['steps'] = int(steps_match.group(1))
-                    
-                    cfg_match = re.search(r'CFG scale:\s*([\d.]+)', metadata_text)
-                    if cfg_match:
-                        params['cfg'] = float(cfg_match.group(1))
-                    
-                    sampler_match = re.search(r'Sampler:\s*([^,\n]+)', metadata_text)
-                    if sampler_match:
-                        params['sampler'] = sampler_match.group(1).strip()
-                    
-                    scheduler_match = re.search(r'Schedule type:\s*([^,\n]+)', metadata_text)
-                    if scheduler_match:
-                        params['scheduler'] = scheduler_match.group(1).strip()
-                except Exception as e:
-                    print(f"Error parsing A1111 generation params: {e}")
+        # Calculate resolution in megapixels
+        total_pixels = width * height
+        resolution_mp = float(total_pixels / 1_000_000)
         
-        except Exception as e:
-            print(f"Error extracting generation parameters: {e}")
+        # Get actual file size
+        file_size_mb = float(probe.file_size) / (1024 * 1024)
+        
+        # Aspect ratio from the shared, memoized lookup
+        width_ratio, height_ratio, _, _ = aspect_ratio(width, height)
         
-        return params
+        # Create display lines for UI
+        line1 = f"{width}x{height} | {resolution_mp:.2f}MP "
+        line2 = ratio_line(width, height)
+        
+        line3 = f"File Size: {file_size_mb:.2f}MB | Depth: {probe.bit_depth}"
     
-    def load_and_analyze(self, image):
-        # Load image from file
+        # Add metadata lines
+        line4 = f"Model: {model_name}"
+        line5 = f"Seed: {gen_params['seed']} | Steps: {gen_params['steps']} | CFG: {gen_params['cfg']}"
+        line6 = f"Sampler: {gen_params['sampler']} | Scheduler: {gen_params['scheduler']}"
+        
+        return {
+            "text": [line1, line2, line3, "", line4, line5, line6],
+            "width": width,
+            "height": height,
+            "width_ratio": width_ratio,
+            "height_ratio": height_ratio,
+            "resolution_mp": resolution_mp,
+            "file_size_mb": file_size_mb,
+            "bit_depth": probe.bit_depth,
+            "model_name": model_name,
+            "gen_params": gen_params,
+        }
+    
+    def load_and_analyze(self, image, loader="mmap"):
         image_path = folder_paths.get_annotated_filepath(image)
+        
+        # Properties come from the header probe, pixels are decoded only for the tensor outputs
+        props = self.analyze_properties(image_path)
+        
+        # Uncompressed rasters skip the decode and the uint8/float32 copies entirely.
+        # .npy arrays have no PIL decoder, so they are always mapped whatever the loader setting
+        is_npy = image_path.lower().endswith(".npy")
+        if loader == "mmap" or is_npy:
+            mapped = load_mmap_tensor(image_path)
+            if mapped is None and is_npy:
+                raise ValueError(f"Unsupported .npy array in {image}: expected [H, W], [H, W, C] or [1, H, W, C] "
+                                 f"with 1, 3 or 4 numeric channels")
+            if mapped is not None:
+                image_tensor, mask = mapped
+                return {
+                    "ui": {"text": props["text"]},
+                    "result": (image_tensor, mask, props["width"], props["height"], props["width_ratio"],
+                               props["height_ratio"], props["resolution_mp"])
+                }
+        
+        # Load image from file
         img = Image.open(image_path)
         
-        # Extract metadata
-        model_name = self.extract_model_name(img)
-        gen_params = self.extract_generation_params(img)
+        # 16-bit, 32-bit and float sources are normalized by their native depth instead of going through 8-bit RGB
+        deep = read_deep_pixels(image_path, img)
+        if deep is not None:
+            pixels, color, alpha, scale = deep
+            image_tensor, mask = pixels_to_tensors(pixels, color, alpha, scale)
+            return {
+                "ui": {"text": props["text"]},
+                "result": (image_tensor, mask, props["width"], props["height"], props["width_ratio"],
+                           props["height_ratio"], props["resolution_mp"])
+            }
         
         # Handle EXIF orientation
         img = ImageOps.exif_transpose(img)
         
-        # Convert to RGB if needed
-        if img.mode == 'I':
-            img = img.point(lambda i: i * (1 / 255))
-        
         # Store original for mask extraction
         original_img = img
         if img.mode != 'RGB':
@@ -214,75 +238,10 @@ class LoadImageandviewPropertiesSG:
             # Create mask matching image dimensions (all white/unmasked)
             mask = torch.zeros((img.size[1], img.size[0]), dtype=torch.float32, device="cpu")
         
-        # Run analysis on loaded image
-        batch_size, height, width, channels = image_tensor.shape
-        
-        # Calculate resolution in megapixels
-        total_pixels = width * height
-        resolution_mp = float(total_pixels / 1_000_000)
-             
-        # Get actual file 
-        try:
-            file_size_bytes = os.path.getsize(image_path)
-            file_size_mb = float(file_size_bytes) / (1024 * 1024)
-        except:
-            file_size_mb = 0.0
-
-        
-        # GCD calculation for aspect ratio
-        def gcd(a, b):
-            while b:
-                a, b = b, a % b
-            return a
-        
-        # Find closest standard aspect ratio
-        def find_closest_standard_ratio(decimal_ratio):
-            standard_ratios = [
-                (1.0, '1:1'), (1.25, '5:4'), (1.33333, '4:3'),
-                (1.5, '3:2'), (1.6, '16:10'), (1.66667, '5:3'),
-                (1.77778, '16:9'), (1.88889, '17:9'), (2.0, '2:1'),
-                (2.33333, '21:9'), (2.35, '2.35:1'), (2.39, '2.39:1'),
-                (2.4, '12:5'),
-            ]
-            
-            closest_diff = float('inf')
-            closest_ratio = None
-            error_threshold = 0.05
-            
-            for std_value, std_string in standard_ratios:
-                diff = abs(std_value - decimal_ratio)
-                if diff < closest_diff:
-                    closest_diff = diff
-                    closest_ratio = std_string
-            
-            if closest_diff <= error_threshold:
-                return closest_ratio
-            return None
-        
-        # Calculate aspect ratio
-        divisor = gcd(width, height)
-        width_ratio = float(width // divisor)
-        height_ratio = float(height // divisor)
-        aspect_ratio_decimal = width / height
-        closest_standard = find_closest_standard_ratio(aspect_ratio_decimal)
-        
-        # Create display lines for UI
-        line1 = f"{width}x{height} | {resolution_mp:.2f}MP "
-        if closest_standard and closest_standard != f"{int(width_ratio)}:{int(height_ratio)}":
-            line2 = f"Ratio: {int(width_ratio)}:{int(height_ratio)} or {aspect_ratio_decimal:.2f}:1 or ~{closest_standard}"
-        else:
-            line2 = f"Ratio: {int(width_ratio)}:{int(height_ratio)} or {aspect_ratio_decimal:.2f}:1"
-        
-        line3 = f"File Size: {file_size_mb:.2f}MB"
-    
-        # Add metadata lines
-        line4 = f"Model: {model_name}"
-        line5 = f"Seed: {gen_params['seed']} | Steps: {gen_params['steps']} | CFG: {gen_params['cfg']}"
-        line6 = f"Sampler: {gen_params['sampler']} | Scheduler: {gen_params['scheduler']}"
-        
         return {
-            "ui": {"text": [line1, line2, line3, "", line4, line5, line6]},
-            "result": (image_tensor, mask, width, height, width_ratio, height_ratio, resolution_mp)
+            "ui": {"text": props["text"]},
+            "result": (image_tensor, mask, props["width"], props["height"], props["width_ratio"],
+                       props["height_ratio"], props["resolution_mp"])
         }
 
 NODE_CLASS_MAPPINGS = {
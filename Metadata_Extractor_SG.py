@@ -0,0 +1,152 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from .Parameters_Parser_SG import parse_generation_info, NODE_FIELDS
+from .Workflow_Scan_SG import workflow_model_name
+
+PROMPT_CACHE_SIZE = 128
+
+_prompt_cache = OrderedDict()
+_prompt_cache_lock = threading.Lock()
+
+
+def default_gen_params():
+    return {'seed': 'N/A', 'steps': 'N/A', 'cfg': 'N/A', 'sampler': 'N/A', 'scheduler': 'N/A'}
+
+
+def _input_text(value):
+    """Model names are stored and shown as text; loader inputs linked to another node's output are [node_id, slot] lists"""
+    return value if isinstance(value, str) else str(value)
+
+
+def _walk_prompt(prompt_data):
+    """Collect model name and generation params from a ComfyUI prompt graph in a single traversal"""
+    model_name = "N/A"
+    params = default_gen_params()
+    model_found = False
+    sampler_found = False
+
+    for node_id, node_data in prompt_data.items():
+        if not isinstance(node_data, dict):
+            continue
+        class_type = node_data.get('class_type', '')
+        inputs = node_data.get('inputs', {})
+
+        if not model_found:
+            if 'CheckpointLoader' in class_type and 'ckpt_name' in inputs:
+                model_name = _input_text(inputs['ckpt_name'])
+                model_found = True
+            elif 'UNETLoader' in class_type and 'unet_name' in inputs:
+                model_name = f"{inputs['unet_name']} (UNET)"
+                model_found = True
+            elif 'Loader' in class_type:
+                if 'ckpt_name' in inputs:
+                    model_name = _input_text(inputs['ckpt_name'])
+                    model_found = True
+                elif 'unet_name' in inputs:
+                    model_name = f"{inputs['unet_name']} (UNET)"
+                    model_found = True
+                elif 'model_name' in inputs:
+                    model_name = _input_text(inputs['model_name'])
+                    model_found = True
+
+        if not sampler_found:
+            # KSampler node has all the info we need
+            if class_type == "KSampler":
+                params['seed'] = inputs.get('seed', 'N/A')
+                params['steps'] = inputs.get('steps', 'N/A')
+                params['cfg'] = inputs.get('cfg', 'N/A')
+                params['sampler'] = inputs.get('sampler_name', 'N/A')
+                params['scheduler'] = inputs.get('scheduler', 'N/A')
+                sampler_found = True
+            else:
+                # Check individual nodes for distributed sampler setup
+                if 'seed' in inputs or 'noise_seed' in inputs:
+                    params['seed'] = inputs.get('seed', inputs.get('noise_seed', params['seed']))
+                if 'steps' in inputs:
+                    params['steps'] = inputs['steps']
+                if 'cfg' in inputs:
+                    params['cfg'] = inputs['cfg']
+                if 'sampler_name' in inputs:
+                    params['sampler'] = inputs['sampler_name']
+                if 'scheduler' in inputs:
+                    params['scheduler'] = inputs['scheduler']
+
+        if model_found and sampler_found:
+            break
+
+    return model_name, params
+
+
+def extract_prompt_metadata(prompt_text=None, prompt_data=None):
+    """
+    Parse a ComfyUI prompt once and return (model_name, gen_params).
+    Results are memoized on a hash of the prompt string; pass prompt_data as well when the
+    caller already holds the parsed dict so a cache miss does not need json.loads.
+    """
+    if not prompt_text and not prompt_data:
+        return "N/A", default_gen_params()
+    if prompt_text is None:
+        prompt_text = json.dumps(prompt_data)
+    if isinstance(prompt_text, str):
+        prompt_text = prompt_text.encode('utf-8', 'surrogatepass')
+
+    key = hashlib.blake2b(prompt_text, digest_size=16).digest()
+    with _prompt_cache_lock:
+        cached = _prompt_cache.get(key)
+        if cached is not None:
+            _prompt_cache.move_to_end(key)
+            return cached[0], dict(cached[1])
+
+    if prompt_data is None:
+        prompt_data = json.loads(prompt_text)
+    model_name, params = _walk_prompt(prompt_data)
+
+    with _prompt_cache_lock:
+        _prompt_cache[key] = (model_name, dict(params))
+        while len(_prompt_cache) > PROMPT_CACHE_SIZE:
+            _prompt_cache.popitem(last=False)
+    return model_name, params
+
+
+def _a1111_metadata(metadata_text, model_name, params):
+    """Fill model name and generation params from the single-pass A1111/Forge trailer parse"""
+    info = parse_generation_info(metadata_text, NODE_FIELDS)
+    if model_name == "N/A" and info.get('model'):
+        model_name = info['model']
+    for field in ('seed', 'steps', 'cfg', 'sampler', 'scheduler'):
+        if field in info:
+            params[field] = info[field]
+    return model_name, params
+
+
+def extract_image_metadata(info):
+    """Extract (model_name, gen_params) from image text chunks: ComfyUI prompt, then workflow, then A1111/Forge parameters"""
+    model_name = "N/A"
+    params = default_gen_params()
+    if not info:
+        return model_name, params
+
+    # Try ComfyUI format first
+    if 'prompt' in info:
+        try:
+            model_name, params = extract_prompt_metadata(info['prompt'])
+        except Exception as e:
+            print(f"Error parsing prompt metadata: {e}")
+
+    if model_name == "N/A" and 'workflow' in info:
+        try:
+            model_name = _input_text(workflow_model_name(info['workflow']))
+        except Exception as e:
+            print(f"Error parsing workflow metadata: {e}")
+
+    # Try A1111/Forge format
+    if 'parameters' in info and isinstance(info['parameters'], str):
+        try:
+            if model_name == "N/A" or any(v == 'N/A' for v in params.values()):
+                model_name, params = _a1111_metadata(info['parameters'], model_name, params)
+        except Exception as e:
+            print(f"Error parsing A1111 metadata: {e}")
+
+    return model_name, params
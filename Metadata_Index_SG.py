@@ -0,0 +1,132 @@
+import json
+import os
+import sqlite3
+import threading
+
+METADATA_INDEX_FILENAME = "image_properties_sg.sqlite3"
+_SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS properties (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    width INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    width_ratio REAL NOT NULL,
+    height_ratio REAL NOT NULL,
+    resolution_mp REAL NOT NULL,
+    file_size_mb REAL NOT NULL,
+    bit_depth TEXT,
+    model_name TEXT,
+    gen_params TEXT,
+    text TEXT
+)
+"""
+
+_COLUMNS = ("width", "height", "width_ratio", "height_ratio", "resolution_mp",
+            "file_size_mb", "bit_depth", "model_name", "gen_params", "text")
+
+
+class MetadataIndex:
+    """
+    Persistent properties index in a local SQLite file, keyed by (path, size, mtime).
+    A row is only returned while the file's size and mtime still match, and is replaced on the next store.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        # Indexes created before bit depth was recorded: add the column, their rows are re-probed on the next get
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(properties)")}
+        if "bit_depth" not in columns:
+            self._conn.execute("ALTER TABLE properties ADD COLUMN bit_depth TEXT")
+        # Version 1 labels deep sources that load through the 8-bit decode; older labels are re-probed
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] < _SCHEMA_VERSION:
+            self._conn.execute("UPDATE properties SET bit_depth = NULL")
+            self._conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        self._conn.commit()
+
+    @staticmethod
+    def _key(path, st=None):
+        st = st or os.stat(path)
+        return os.path.abspath(path), st.st_size, st.st_mtime_ns
+
+    def get(self, path, st=None):
+        """Stored properties for an unchanged file, or None"""
+        key = self._key(path, st)
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM properties WHERE path = ? AND size = ? AND mtime_ns = ?",
+                key).fetchone()
+        if row is None:
+            return None
+        props = dict(zip(_COLUMNS, row))
+        if props["bit_depth"] is None:
+            return None
+        props["gen_params"] = json.loads(props["gen_params"] or "{}")
+        props["text"] = json.loads(props["text"] or "[]")
+        return props
+
+    def put(self, path, props, st=None):
+        key = self._key(path, st)
+        values = [props[c] for c in _COLUMNS[:-2]] + [json.dumps(props["gen_params"]), json.dumps(props["text"])]
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO properties (path, size, mtime_ns, {', '.join(_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * (3 + len(_COLUMNS)))})",
+                (*key, *values))
+            self._conn.commit()
+
+    def prune(self, under=None):
+        """Delete rows whose file is gone or has changed since it was indexed; returns the number removed"""
+        with self._lock:
+            if under:
+                prefix = os.path.join(os.path.abspath(under), "")
+                rows = self._conn.execute(
+                    "SELECT path, size, mtime_ns FROM properties WHERE substr(path, 1, ?) = ?",
+                    (len(prefix), prefix)).fetchall()
+            else:
+                rows = self._conn.execute("SELECT path, size, mtime_ns FROM properties").fetchall()
+        stale = []
+        for path, size, mtime_ns in rows:
+            try:
+                st = os.stat(path)
+            except OSError:
+                stale.append((path,))
+                continue
+            if st.st_size != size or st.st_mtime_ns != mtime_ns:
+                stale.append((path,))
+        if stale:
+            with self._lock:
+                self._conn.executemany("DELETE FROM properties WHERE path = ?", stale)
+                self._conn.commit()
+        return len(stale)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_metadata_index():
+    """Shared index stored in ComfyUI's user directory, or None if it cannot be opened"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            try:
+                import folder_paths
+                user_dir = folder_paths.get_user_directory()
+                os.makedirs(user_dir, exist_ok=True)
+                _index = MetadataIndex(os.path.join(user_dir, METADATA_INDEX_FILENAME))
+            except Exception as e:
+                print(f"Metadata index disabled: {e}")
+                _index = False
+        return _index or None
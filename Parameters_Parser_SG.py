@@ -0,0 +1,173 @@
+import functools
+import json
+import operator
+import re
+
+_LORA_TAG_RE = re.compile(r'<lora:([^:>]+)(?::([^:>]+))?[^>]*>')
+
+_NEGATIVE_PREFIX = "Negative prompt:"
+_split_pair = operator.methodcaller("split", ": ", 1)
+
+# Trailer keys -> parse_generation_info() field and converter (None keeps the string)
+_FIELDS = {
+    "Steps": ("steps", int),
+    "Seed": ("seed", int),
+    "CFG scale": ("cfg", float),
+    "Sampler": ("sampler", None),
+    "Schedule type": ("scheduler", None),
+    "Model": ("model", None),
+    "Model hash": ("model_hash", None),
+    "VAE": ("vae", None),
+    "VAE hash": ("vae_hash", None),
+    "Denoising strength": ("denoising", float),
+    "Clip skip": ("clip_skip", int),
+    "Hires upscale": ("hires_upscale", float),
+    "Hires steps": ("hires_steps", int),
+    "Hires upscaler": ("hires_upscaler", None),
+    "Version": ("version", None),
+}
+_FIELD_KEYS = {field: key for key, (field, _) in _FIELDS.items()}
+
+# The fields the nodes display
+NODE_FIELDS = ("model", "seed", "steps", "cfg", "sampler", "scheduler")
+
+
+def _unquote(value):
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value[1:-1]
+
+
+def _split_trailer(line):
+    """
+    Tokenize the trailer into {key: value} in one pass, or None if it is not a list of "Key: value" pairs.
+    A1111/Forge join pairs with ", " and ": ", so the trailer is split in C; the rare quoted value
+    that contains ", " ("Lora hashes", "Hires prompt", ...) is glued back together first.
+    """
+    items = line.split(", ")
+    quoted = '"' in line
+    if quoted:
+        merged = []
+        pending = None
+        for item in items:
+            if pending is not None:
+                pending += ", " + item
+                if item.count('"') % 2:
+                    merged.append(pending)
+                    pending = None
+            elif '"' in item and item.count('"') % 2:
+                pending = item
+            else:
+                merged.append(item)
+        if pending is not None:
+            merged.append(pending)
+        items = merged
+    try:
+        params = dict(map(_split_pair, items))
+    except ValueError:
+        return None
+    if quoted:
+        for key, value in params.items():
+            if value[:1] == '"' and value[-1:] == '"' and len(value) > 1:
+                params[key] = _unquote(value)
+    return params
+
+
+@functools.lru_cache(maxsize=16)
+def _fields_pattern(fields):
+    keys = "|".join(re.escape(_FIELD_KEYS[f]) for f in fields if f in _FIELD_KEYS)
+    return re.compile(r'(?:^|, )(' + keys + r'): ([^,]*)')
+
+
+def _trailer_fields(text, fields):
+    """Raw values of just the requested fields: one precompiled scan of the trailer line"""
+    text = text.rstrip()
+    last_line = text[text.rfind("\n") + 1:]
+    if '"' in last_line:
+        # Quoted values may hide ", Key: " sequences, use the full tokenizer
+        return parse_parameters(text)["params"]
+    if last_line.count(": ") < 3 and not last_line.startswith("Steps:"):
+        return {}
+    return dict(_fields_pattern(tuple(fields)).findall(last_line))
+
+
+def parse_parameters(text):
+    """
+    Split an A1111/Forge "parameters" string into prompt, negative prompt and the key-value trailer.
+    Returns {"prompt", "negative_prompt", "params": {key: raw string}}.
+    """
+    text = text.strip()
+    cut = text.rfind("\n")
+    last_line = text[cut + 1:]
+    params = _split_trailer(last_line)
+    # Same rule as A1111: the last line is the trailer only if it holds at least three pairs
+    if params and (len(params) >= 3 or last_line.startswith("Steps:")):
+        text = text[:cut] if cut >= 0 else ""
+    else:
+        params = {}
+
+    prompt, negative_prompt = text, ""
+    if text.startswith(_NEGATIVE_PREFIX):
+        prompt, negative_prompt = "", text[len(_NEGATIVE_PREFIX):]
+    else:
+        neg = text.find("\n" + _NEGATIVE_PREFIX)
+        if neg >= 0:
+            prompt, negative_prompt = text[:neg], text[neg + 1 + len(_NEGATIVE_PREFIX):]
+
+    return {
+        "prompt": prompt.strip(),
+        "negative_prompt": negative_prompt.strip(),
+        "params": params,
+    }
+
+
+def parse_generation_info(text, fields=None):
+    """
+    Typed generation info from a "parameters" string: steps, seed, cfg, sampler, scheduler, model,
+    model_hash, vae, vae_hash, denoising, clip_skip, hires_*, version, size (w, h), loras
+    [(name, hash or weight)], prompt and negative_prompt. Pass fields to convert only those.
+    Fields missing from the string are left out.
+    """
+    if fields:
+        params = _trailer_fields(text, fields)
+    else:
+        parsed = parse_parameters(text)
+        params = parsed["params"]
+    info = {}
+    for field in fields or _FIELD_KEYS:
+        key = _FIELD_KEYS.get(field)
+        value = params.get(key) if key else None
+        if not value:
+            continue
+        convert = _FIELDS[key][1]
+        if convert is None:
+            info[field] = value.strip()
+            continue
+        try:
+            info[field] = convert(value)
+        except ValueError:
+            info[field] = value
+    if fields:
+        return info
+
+    width, sep, height = params.get("Size", "").partition("x")
+    if sep and width.isdigit() and height.isdigit():
+        info["size"] = (int(width), int(height))
+
+    loras = []
+    lora_hashes = params.get("Lora hashes")
+    if lora_hashes:
+        for item in lora_hashes.split(","):
+            name, _, lora_hash = item.partition(":")
+            if name.strip():
+                loras.append((name.strip(), lora_hash.strip()))
+    elif "<lora:" in parsed["prompt"]:
+        for name, weight in _LORA_TAG_RE.findall(parsed["prompt"]):
+            loras.append((name, weight or "1"))
+    if loras:
+        info["loras"] = loras
+
+    info["prompt"] = parsed["prompt"]
+    info["negative_prompt"] = parsed["negative_prompt"]
+    return info
@@ -0,0 +1,105 @@
+import hashlib
+import os
+import threading
+import time
+
+import numpy as np
+from PIL import Image
+
+PREVIEW_PREFIX = "preview_sg_"
+# Temp previews are evicted oldest-first above this total size, and regardless of size after this age
+PREVIEW_MAX_BYTES = 1024 * 1024 * 1024
+PREVIEW_MAX_AGE = 6 * 60 * 60
+PREVIEW_PRUNE_INTERVAL = 60
+
+_prune_lock = threading.Lock()
+_last_prune = {}
+
+
+def frame_digest(img_array, variant=""):
+    """Content id for a uint8 frame; hashes the buffer in place instead of copying it with tobytes()"""
+    img_array = np.ascontiguousarray(img_array)
+    m = hashlib.blake2b(digest_size=16)
+    m.update(f"{img_array.shape}|{img_array.dtype}|{variant}".encode())
+    m.update(memoryview(img_array).cast("B"))
+    return m.hexdigest()
+
+
+def cached_preview(img_array, output_dir, writer, extension="png", variant=""):
+    """
+    Return the filename of a preview for this frame, calling writer(img_array, filepath) only when an
+    identical preview is not already on disk. variant distinguishes previews of the same frame
+    written with different settings.
+    """
+    filename = f"{PREVIEW_PREFIX}{frame_digest(img_array, variant)}.{extension}"
+    filepath = os.path.join(output_dir, filename)
+    if os.path.exists(filepath):
+        # Refresh the age so a preview that is still in use is not evicted
+        try:
+            os.utime(filepath)
+            return filename
+        except OSError:
+            pass
+    # Write to a temp name first so a concurrent reader never sees a half-written file
+    tmp_path = os.path.join(output_dir, f"{filename[:-len(extension) - 1]}.{threading.get_ident()}.tmp.{extension}")
+    writer(img_array, tmp_path)
+    os.replace(tmp_path, filepath)
+    prune_previews(output_dir)
+    return filename
+
+
+def prune_previews(output_dir, max_bytes=None, max_age=None, force=False):
+    """Delete cached previews older than max_age, then the oldest ones until the total is under max_bytes"""
+    max_bytes = PREVIEW_MAX_BYTES if max_bytes is None else max_bytes
+    max_age = PREVIEW_MAX_AGE if max_age is None else max_age
+    now = time.time()
+    with _prune_lock:
+        if not force and now - _last_prune.get(output_dir, 0) < PREVIEW_PRUNE_INTERVAL:
+            return
+        _last_prune[output_dir] = now
+
+    entries = []
+    try:
+        with os.scandir(output_dir) as it:
+            for entry in it:
+                if entry.name.startswith(PREVIEW_PREFIX) and entry.is_file():
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+    except OSError:
+        return
+
+    entries.sort()
+    total = sum(size for _, size, _ in entries)
+    for mtime, size, path in entries:
+        if now - mtime <= max_age and total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+# Preview codecs: (file extension, Pillow save kwargs). All favour encode speed over size.
+PREVIEW_FORMATS = {
+    "WEBP (fast, small)": ("webp", {"quality": 85, "method": 0}),
+    "JPEG (fastest)": ("jpg", {"quality": 85}),
+    "PNG (lossless)": ("png", {"compress_level": 1}),
+}
+PREVIEW_DEFAULT_FORMAT = "WEBP (fast, small)"
+PREVIEW_DEFAULT_MAX_EDGE = 2048
+
+
+def preview_extension(preview_format):
+    return PREVIEW_FORMATS.get(preview_format, PREVIEW_FORMATS[PREVIEW_DEFAULT_FORMAT])[0]
+
+
+def write_preview(img_array, filepath, preview_format=PREVIEW_DEFAULT_FORMAT, max_edge=PREVIEW_DEFAULT_MAX_EDGE):
+    """Write a size-capped preview of a uint8 frame; max_edge 0 keeps full resolution"""
+    extension, save_kwargs = PREVIEW_FORMATS.get(preview_format, PREVIEW_FORMATS[PREVIEW_DEFAULT_FORMAT])
+    img = Image.fromarray(img_array)
+    if max_edge and max(img.size) > max_edge:
+        img.thumbnail((max_edge, max_edge), Image.Resampling.BILINEAR, reducing_gap=2.0)
+    if extension == "jpg" and img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    img.save(filepath, format="JPEG" if extension == "jpg" else extension.upper(), **save_kwargs)
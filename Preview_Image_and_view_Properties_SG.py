@@ -5,6 +5,12 @@ import folder_paths
 from PIL import Image, ImageOps
 import numpy as np
 import hashlib
+import json
+from .Aspect_Ratio_SG import aspect_ratio, ratio_line
+from .Image_Stats_SG import frame_statistics, format_frame_statistics
+from .Image_Convert_SG import iter_preview_frames
+from .Preview_Cache_SG import (cached_preview, write_preview, preview_extension,
+                               PREVIEW_FORMATS, PREVIEW_DEFAULT_FORMAT, PREVIEW_DEFAULT_MAX_EDGE)
 
 class PreviewImageandviewPropertiesSG:
     """Preview image with passthrough and automatically view all properties"""
@@ -16,15 +22,35 @@ class PreviewImageandviewPropertiesSG:
         return {
             "required": {
                 "images": ("IMAGE",),
+            },
+            "optional": {
+                "preview_max_edge": ("INT", {
+                    "default": PREVIEW_DEFAULT_MAX_EDGE, "min": 0, "max": 16384, "step": 64,
+                    "tooltip": "Longest edge of the preview in pixels (0 = full resolution).\nOnly affects the preview, the image output is untouched"
+                }),
+                "preview_format": (list(PREVIEW_FORMATS.keys()), {"default": PREVIEW_DEFAULT_FORMAT}),
+                "frame_analysis": ("BOOLEAN", {
+                    "default": True,
+                    "tooltip": "Per-frame luminance, dynamic range and a perceptual hash, computed in one pass over the batch.\nBlank and near-duplicate frames are dropped from good_frames"
+                }),
+                "blank_threshold": ("FLOAT", {
+                    "default": 0.01, "min": 0.0, "max": 1.0, "step": 0.001,
+                    "tooltip": "A frame whose luminance std is below this is flagged as blank"
+                }),
+                "duplicate_distance": ("INT", {
+                    "default": 4, "min": 0, "max": 64,
+                    "tooltip": "A frame whose 64-bit perceptual hash differs from an earlier frame's by at most this many bits is flagged as a near-duplicate"
+                }),
             }
         }
     
-    RETURN_TYPES = ("IMAGE", "INT", "INT", "INT", "FLOAT", "FLOAT", "FLOAT")
-    RETURN_NAMES = ("image", "batch_count", "width", "height", "width_ratio", "height_ratio", "Resolution_in_MP")
+    RETURN_TYPES = ("IMAGE", "INT", "INT", "INT", "FLOAT", "FLOAT", "FLOAT", "IMAGE", "STRING")
+    RETURN_NAMES = ("image", "batch_count", "width", "height", "width_ratio", "height_ratio", "Resolution_in_MP", "good_frames", "frame_stats")
     FUNCTION = "preview_and_analyze"
     OUTPUT_NODE = True
     
-    def preview_and_analyze(self, images):
+    def preview_and_analyze(self, images, preview_max_edge=PREVIEW_DEFAULT_MAX_EDGE, preview_format=PREVIEW_DEFAULT_FORMAT,
+                            frame_analysis=True, blank_threshold=0.01, duplicate_distance=4):
         # Image is already a tensor [batch, H, W, 3]
         image_tensor = images
         
@@ -35,54 +61,17 @@ class PreviewImageandviewPropertiesSG:
         total_pixels = width * height
         resolution_mp = float(total_pixels / 1_000_000)
         
-        # Calculate image size in MB (uncompressed in memory)
-        size_bytes = width * height * channels * 4 * batch_size
+        # Calculate image size in MB (uncompressed in memory), per frame
+        size_bytes = width * height * channels * image_tensor.element_size()
         size_mb = float(size_bytes / (1024 * 1024))
         
-        # GCD calculation for aspect ratio
-        def gcd(a, b):
-            while b:
-                a, b = b, a % b
-            return a
-        
-        # Find closest standard aspect ratio
-        def find_closest_standard_ratio(decimal_ratio):
-            standard_ratios = [
-                (1.0, '1:1'), (1.25, '5:4'), (1.33333, '4:3'),
-                (1.5, '3:2'), (1.6, '16:10'), (1.66667, '5:3'),
-                (1.77778, '16:9'), (1.88889, '17:9'), (2.0, '2:1'),
-                (2.33333, '21:9'), (2.35, '2.35:1'), (2.39, '2.39:1'),
-                (2.4, '12:5'),
-            ]
-            
-            closest_diff = float('inf')
-            closest_ratio = None
-            error_threshold = 0.05
-            
-            for std_value, std_string in standard_ratios:
-                diff = abs(std_value - decimal_ratio)
-                if diff < closest_diff:
-                    closest_diff = diff
-                    closest_ratio = std_string
-            
-            if closest_diff <= error_threshold:
-                return closest_ratio
-            return None
-        
-        # Calculate aspect ratio
-        divisor = gcd(width, height)
-        width_ratio = float(width // divisor)
-        height_ratio = float(height // divisor)
-        aspect_ratio_decimal = width / height
-        closest_standard = find_closest_standard_ratio(aspect_ratio_decimal)
+        # Aspect ratio from the shared, memoized lookup
+        width_ratio, height_ratio, _, _ = aspect_ratio(width, height)
         
         # Create display lines for UI
         line1 = f"{width}x{height} | {resolution_mp:.2f}MP "
         
-        if closest_standard and closest_standard != f"{int(width_ratio)}:{int(height_ratio)}":
-            line2 = f"Ratio: {int(width_ratio)}:{int(height_ratio)} or {aspect_ratio_decimal:.2f}:1 or ~{closest_standard}"
-        else:
-            line2 = f"Ratio: {int(width_ratio)}:{int(height_ratio)} or {aspect_ratio_decimal:.2f}:1"
+        line2 = ratio_line(width, height)
         
         if batch_size > 1:
             total_size_mb = size_mb * batch_size
@@ -90,25 +79,35 @@ class PreviewImageandviewPropertiesSG:
         else:
             line3 = f"Tensor Size: {size_mb:.2f}MB"
         
+        lines = [line1, line2, line3]
+        
+        # Per-frame stats and blank/near-duplicate flags, one vectorized pass over the batch
+        good_frames = image_tensor
+        frame_stats = "[]"
+        if frame_analysis and image_tensor.numel() > 0:
+            frames, keep = frame_statistics(image_tensor, blank_threshold, duplicate_distance)
+            # Never return an empty batch: if every frame is flagged, the first one is kept
+            if not keep.any():
+                keep[0] = True
+            if not keep.all():
+                good_frames = image_tensor[keep]
+            frame_stats = json.dumps(frames)
+            lines.append(format_frame_statistics(frames))
+        
         # Convert tensor to numpy for image preview
         # ComfyUI expects images in format [B, H, W, C] with values 0-1
-        images_np = (image_tensor.cpu().numpy() * 255).astype(np.uint8)
-        
-        # Prepare results for preview - need to save temp images
-        results = []
-        for i in range(batch_size):
-            img_array = images_np[i]
-            results.append(img_array)
+        # Frames are downscaled in torch first so only preview-sized data is copied to the host
+        results = iter_preview_frames(image_tensor, preview_max_edge)
         
         return {
             "ui": {
-                "text": [line1, line2, line3],
-                "images": self.save_images(results)
+                "text": lines,
+                "images": self.save_images(results, preview_format, preview_max_edge)
             },
-            "result": (image_tensor, batch_size, width, height, width_ratio, height_ratio, resolution_mp)
+            "result": (image_tensor, batch_size, width, height, width_ratio, height_ratio, resolution_mp, good_frames, frame_stats)
         }
     
-    def save_images(self, images_np_list):
+    def save_images(self, images_np_list, preview_format=PREVIEW_DEFAULT_FORMAT, preview_max_edge=PREVIEW_DEFAULT_MAX_EDGE):
         """Save images temporarily for preview"""
         from comfy.cli_args import args
         import json
@@ -117,15 +116,13 @@ class PreviewImageandviewPropertiesSG:
         output_dir = folder_paths.get_temp_directory()
         
         results = []
-        for i, img_array in enumerate(images_np_list):
-            img = Image.fromarray(img_array)
-            
-            # Create unique filename
-            filename = f"preview_{hash(img.tobytes())}_{i}.png"
-            filepath = os.path.join(output_dir, filename)
-            
-            # Save image
-            img.save(filepath, compress_level=4)
+        for img_array in images_np_list:
+            # Identical frames map to the same file, so re-running a preview skips the encode
+            filename = cached_preview(
+                img_array, output_dir,
+                lambda arr, path: write_preview(arr, path, preview_format, preview_max_edge),
+                extension=preview_extension(preview_format),
+                variant=f"{preview_format}|{preview_max_edge}")
             
             results.append({
                 "filename": filename,
@@ -0,0 +1,95 @@
+import asyncio
+import os
+import folder_paths
+from aiohttp import web
+from server import PromptServer
+from .Load_Image_and_view_Properties_SG import LoadImageandviewPropertiesSG, index_folder
+from .Write_Behind_SG import get_write_behind_status
+
+PROPERTIES_ROUTE = "/image_properties_sg/properties"
+INDEX_ROUTE = "/image_properties_sg/index"
+WRITE_BEHIND_ROUTE = "/image_properties_sg/write_behind"
+
+
+def resolve_image_path(filename, subfolder="", image_type="input"):
+    """Map a /view-style (filename, subfolder, type) triple to a file path, refusing anything outside the base directory"""
+    base_dir = folder_paths.get_directory_by_type(image_type)
+    if base_dir is None or not filename:
+        return None
+    base_dir = os.path.abspath(base_dir)
+    path = os.path.abspath(os.path.join(base_dir, os.path.normpath(subfolder or ""), filename))
+    if os.path.commonpath((base_dir, path)) != base_dir or not os.path.isfile(path):
+        return None
+    return path
+
+
+def resolve_folder(subfolder="", image_type="input"):
+    """Same as resolve_image_path, for a folder to bulk-index"""
+    base_dir = folder_paths.get_directory_by_type(image_type)
+    if base_dir is None:
+        return None
+    base_dir = os.path.abspath(base_dir)
+    path = os.path.abspath(os.path.join(base_dir, os.path.normpath(subfolder or "")))
+    if os.path.commonpath((base_dir, path)) != base_dir or not os.path.isdir(path):
+        return None
+    return path
+
+
+def properties_etag(st):
+    """Weak validator from the file's size and mtime, so unchanged files are never re-probed by the browser"""
+    return f'"{st.st_size:x}-{st.st_mtime_ns:x}"'
+
+
+def image_properties(path):
+    """Header-only properties of one image as a JSON-serialisable dict"""
+    props = LoadImageandviewPropertiesSG().analyze_properties(path)
+    return {
+        "text": props["text"],
+        "width": props["width"],
+        "height": props["height"],
+        "width_ratio": props["width_ratio"],
+        "height_ratio": props["height_ratio"],
+        "resolution_mp": props["resolution_mp"],
+        "file_size_mb": props["file_size_mb"],
+        "bit_depth": props["bit_depth"],
+        "model_name": props["model_name"],
+        "gen_params": props["gen_params"],
+    }
+
+
+@PromptServer.instance.routes.get(PROPERTIES_ROUTE)
+async def get_image_properties(request):
+    query = request.rel_url.query
+    path = resolve_image_path(query.get("filename", ""), query.get("subfolder", ""), query.get("type", "input"))
+    if path is None:
+        return web.Response(status=404)
+
+    st = os.stat(path)
+    etag = properties_etag(st)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("If-None-Match") == etag:
+        return web.Response(status=304, headers=headers)
+
+    try:
+        # The probe touches the disk, keep it off the event loop
+        data = await asyncio.get_running_loop().run_in_executor(None, image_properties, path)
+    except Exception as e:
+        return web.json_response({"error": str(e)}, status=415)
+    return web.json_response(data, headers=headers)
+
+
+@PromptServer.instance.routes.post(INDEX_ROUTE)
+async def post_index_folder(request):
+    query = request.rel_url.query
+    folder = resolve_folder(query.get("subfolder", ""), query.get("type", "input"))
+    if folder is None:
+        return web.Response(status=404)
+
+    indexed, pruned = await asyncio.get_running_loop().run_in_executor(None, index_folder, folder)
+    return web.json_response({"indexed": indexed, "pruned": pruned})
+
+
+@PromptServer.instance.routes.get(WRITE_BEHIND_ROUTE)
+async def get_write_behind(request):
+    # Pending/completed/failed counts and recent errors of the Save node's background writes
+    return web.json_response(get_write_behind_status())
@@ -0,0 +1,58 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Candidate qualities encoded in parallel per search round; each round narrows the range about 4x
+QUALITY_SEARCH_WIDTH = 3
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    # Shared by all searches, separate from the frame encode pool so nested submits cannot deadlock
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=max(2, os.cpu_count() or 1),
+                                           thread_name_prefix="SG-quality-search")
+        return _executor
+
+
+def search_quality(encode, max_bytes, high=100, low=1, width=QUALITY_SEARCH_WIDTH):
+    """
+    Highest quality in [low, high] whose encode(quality) -> bytes fits in max_bytes.
+    Each round encodes up to width candidates spread over the open range in parallel (the first round
+    also tries high, so a frame that already fits costs a single round). Returns (quality, data, trials,
+    fits); if even low does not fit, low's encode is returned with fits False.
+    Like any bisection it assumes size grows with quality, which holds closely enough for JPEG and WEBP.
+    """
+    executor = _get_executor()
+    passed, failed = low - 1, high + 1
+    best = None
+    smallest = None
+    trials = 0
+    first = True
+    while failed - passed > 1:
+        span = failed - passed
+        candidates = {passed + span * (i + 1) // (width + 1) for i in range(width)}
+        if first:
+            candidates.add(high)
+            first = False
+        candidates = sorted(q for q in candidates if passed < q < failed)
+        futures = [(q, executor.submit(encode, q)) for q in candidates]
+        trials += len(futures)
+        for quality, future in futures:
+            data = future.result()
+            if len(data) <= max_bytes:
+                if quality > passed:
+                    passed, best = quality, data
+            else:
+                if quality < failed:
+                    failed = quality
+                if quality == low:
+                    smallest = data
+        # Results above the first failure or below the best pass are discarded with the futures
+    if best is None:
+        return low, smallest, trials, False
+    return passed, best, trials, True
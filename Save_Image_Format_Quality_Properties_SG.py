@@ -1,5 +1,7 @@
 import torch
 import math
+import functools
+import io
 import os
 import folder_paths
 from PIL import Image, ImageOps, PngImagePlugin
@@ -8,6 +10,67 @@ import hashlib
 import json
 from datetime import datetime
 import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from .Aspect_Ratio_SG import ratio_line
+from .Batch_Container_SG import (BATCH_OUTPUTS, CONTAINER_FORMATS, use_container, MultiPageTiffWriter,
+                                 AnimatedWebpWriter, ApngWriter)
+from .Image_Convert_SG import iter_uint8_frames, frame_to_uint8, downscale_frame
+from .Metadata_Extractor_SG import extract_prompt_metadata, default_gen_params
+from .Quality_Search_SG import search_quality
+from .Save_Stats_SG import SaveStats
+from .Preview_Cache_SG import (write_preview, preview_extension,
+                               PREVIEW_FORMATS, PREVIEW_DEFAULT_FORMAT, PREVIEW_DEFAULT_MAX_EDGE)
+from .Streaming_Encode_SG import STREAMING_MODES, should_stream, write_png_streaming, write_tiff_streaming
+from .Write_Behind_SG import get_write_behind_queue, get_write_behind_status
+
+# PNG text chunk encodings. Compression only applies to values of at least PNG_TEXT_COMPRESS_MIN characters
+# (workflow, prompt); short keys stay plain tEXt.
+PNG_TEXT_CHUNKS = [
+    "tEXt (uncompressed, widest support)",
+    "zTXt (compressed)",
+    "iTXt (compressed, UTF-8)",
+]
+PNG_TEXT_COMPRESS_MIN = 1024
+
+FORMAT_EXTENSIONS = {
+    "PNG (lossless, larger files)": "png",
+    "JPEG (lossy, smaller files)": "jpg",
+    "WEBP (modern, good compression)": "webp",
+    "BMP (uncompressed, largest)": "bmp",
+    "TIFF (flexible, lossless, limited support)": "tiff"
+}
+
+# Pillow format names, frames are encoded to memory first so encode and write time can be told apart
+PIL_FORMATS = {"png": "PNG", "jpg": "JPEG", "webp": "WEBP", "bmp": "BMP", "tiff": "TIFF"}
+
+# Frames held at once by the concurrent encoders (queued or encoding): two per worker, but never more than
+# MAX_IN_FLIGHT_FRAMES or MAX_IN_FLIGHT_BYTES of uint8 data, so a many-core host does not convert most of a
+# large batch ahead of the encoders
+MAX_IN_FLIGHT_FRAMES = 8
+MAX_IN_FLIGHT_BYTES = 128 * 1024 * 1024
+
+
+def max_in_flight(workers, frame):
+    """In-flight frame limit for frames shaped like this one"""
+    frame_bytes = max(1, math.prod(frame.shape))
+    return max(1, min(workers * 2, MAX_IN_FLIGHT_FRAMES, MAX_IN_FLIGHT_BYTES // frame_bytes))
+
+
+# Next free counter per (folder, filename prefix). Files queued for write-behind are not on disk yet,
+# so folder_paths.get_save_image_path alone would hand out the same numbers to the next prompt.
+_reserved_counters = {}
+_reserved_counters_lock = threading.Lock()
+
+
+def reserve_counter(folder, filename, counter):
+    key = (os.path.normcase(os.path.abspath(folder)), filename)
+    with _reserved_counters_lock:
+        counter = max(counter, _reserved_counters.get(key, 0))
+        _reserved_counters[key] = counter
+    return counter
 
 class SaveImageFormatQualityPropertiesSG:
     """Save image with custom image format and further control quality and compression levels"""
@@ -71,6 +134,55 @@ class SaveImageFormatQualityPropertiesSG:
                     "packbits (lossless, basic)"
                 ], {"default": "tiff_deflate (lossless, better compression)"}),
                 "tiff_jpeg_quality": ("INT", {"default": 90, "min": 1, "max": 100, "step": 1}),
+                "max_bytes": ("INT", {
+                    "default": 0, "min": 0, "max": 1024 * 1024 * 1024, "step": 1024,
+                    "tooltip": "JPEG and lossy WEBP only: size budget per file in bytes (0 = off).\n"
+                               "The quality setting becomes the upper bound, and the highest quality\n"
+                               "whose file fits is searched for in memory; only that encode is written"
+                }),
+                "preview_max_edge": ("INT", {
+                    "default": PREVIEW_DEFAULT_MAX_EDGE, "min": 0, "max": 16384, "step": 64,
+                    "tooltip": "TIFF/BMP, and every format in write-behind mode: longest edge of the browser preview\n(0 = full resolution). The saved file is always full resolution"
+                }),
+                "preview_format": (list(PREVIEW_FORMATS.keys()), {"default": PREVIEW_DEFAULT_FORMAT}),
+                "encode_workers": ("INT", {
+                    "default": 0, "min": 0, "max": 256, "step": 1,
+                    "tooltip": "Threads used to encode batch images in parallel.\n0 = CPU count, 1 = one after another"
+                }),
+                "write_mode": ([
+                    "Immediate",
+                    "Write-behind (background)"
+                ], {
+                    "default": "Immediate",
+                    "tooltip": "• Immediate: node finishes after every file is written\n"
+                               "• Write-behind: frames are queued and written in the background,\n"
+                               "  so the next prompt can start while files are still being saved"
+                }),
+                "png_text_chunks": (PNG_TEXT_CHUNKS, {
+                    "default": PNG_TEXT_CHUNKS[0],
+                    "tooltip": "How the workflow and prompt are stored in PNG files.\n"
+                               "Compressed chunks make large workflows much smaller on disk;\n"
+                               "tEXt is the safest choice for other tools that read the metadata"
+                }),
+                "batch_output": (BATCH_OUTPUTS, {
+                    "default": BATCH_OUTPUTS[0],
+                    "tooltip": "Single file writes the whole batch into one container:\n"
+                               "TIFF as a multi-page TIFF, WEBP and PNG as an animation.\n"
+                               "Frames are encoded and appended one at a time; other formats\n"
+                               "keep one file per frame. Containers are always written immediately"
+                }),
+                "frame_duration_ms": ("INT", {
+                    "default": 100, "min": 1, "max": 60000, "step": 1,
+                    "tooltip": "Display time of each frame in animated WEBP/PNG containers"
+                }),
+                "streaming_save": (STREAMING_MODES, {
+                    "default": "Auto",
+                    "tooltip": "PNG and TIFF (none/deflate) only: encode row strips straight from the tensor,\n"
+                               "so memory stays proportional to the strip size instead of the image size.\n"
+                               "• Auto: stream frames of 64MP and larger\n"
+                               "• On: always stream when the format allows it\n"
+                               "• Off: always build a full image in memory"
+                }),
             },
             "hidden": {
                 "prompt": "PROMPT",
@@ -78,139 +190,42 @@ class SaveImageFormatQualityPropertiesSG:
             },
         }
 
-    RETURN_TYPES = ()
-    RETURN_NAMES = ()
+    RETURN_TYPES = ("STRING",)
+    RETURN_NAMES = ("save_report",)
     FUNCTION = "save_and_analyze"
     OUTPUT_NODE = True
 
-    def extract_model_name(self, prompt):
-        model_name = "N/A"
-        try:
-            if not prompt:
-                return model_name
-            for node_id, node_data in prompt.items():
-                class_type = node_data.get('class_type', '')
-                inputs = node_data.get('inputs', {})
-                if 'CheckpointLoader' in class_type and 'ckpt_name' in inputs:
-                    model_name = inputs['ckpt_name']
-                    break
-                if 'UNETLoader' in class_type and 'unet_name' in inputs:
-                    model_name = f"{inputs['unet_name']} (UNET)"
-                    break
-                if 'Loader' in class_type:
-                    if 'ckpt_name' in inputs:
-                        model_name = inputs['ckpt_name']
-                        break
-                    elif 'unet_name' in inputs:
-                        model_name = f"{inputs['unet_name']} (UNET)"
-                        break
-                    elif 'model_name' in inputs:
-                        model_name = inputs['model_name']
-                        break
-        except Exception as e:
-            print(f"Error extracting model metadata: {e}")
-        return model_name
-
-    def extract_generation_params(self, prompt):
-        params = {'seed': 'N/A', 'steps': 'N/A', 'cfg': 'N/A', 'sampler': 'N/A', 'scheduler': 'N/A'}
-        try:
-            if not prompt:
-                return params
-            for node_id, node_data in prompt.items():
-                class_type = node_data.get('class_type', '')
-                inputs = node_data.get('inputs', {})
-                if class_type == "KSampler":
-                    params['seed'] = inputs.get('seed', 'N/A')
-                    params['steps'] = inputs.get('steps', 'N/A')
-                    params['cfg'] = inputs.get('cfg', 'N/A')
-                    params['sampler'] = inputs.get('sampler_name', 'N/A')
-                    params['scheduler'] = inputs.get('scheduler', 'N/A')
-                    return params
-                if 'seed' in inputs or 'noise_seed' in inputs:
-                    params['seed'] = inputs.get('seed', inputs.get('noise_seed', params['seed']))
-                if 'steps' in inputs:
-                    params['steps'] = inputs.get('steps', params['steps'])
-                if 'cfg' in inputs:
-                    params['cfg'] = inputs.get('cfg', params['cfg'])
-                if 'sampler_name' in inputs:
-                    params['sampler'] = inputs.get('sampler_name', params['sampler'])
-                if 'scheduler' in inputs:
-                    params['scheduler'] = inputs.get('scheduler', params['scheduler'])
-        except Exception as e:
-            print(f"Error extracting generation parameters: {e}")
-        return params
-
     def save_and_analyze(self, images, filename_prefix="ComfyUI", Properties="Both", format="PNG (lossless, larger files)",
                          png_compress_level=6, jpeg_quality=95, jpeg_optimize=True,
                          jpeg_subsampling="Auto (based on quality)", webp_quality=90, webp_method=4,
                          webp_lossless=False, tiff_compression="tiff_deflate (lossless, better compression)",
-                         tiff_jpeg_quality=90, prompt=None, extra_pnginfo=None):
+                         tiff_jpeg_quality=90, max_bytes=0, preview_max_edge=PREVIEW_DEFAULT_MAX_EDGE,
+                         preview_format=PREVIEW_DEFAULT_FORMAT, encode_workers=0, write_mode="Immediate",
+                         png_text_chunks=PNG_TEXT_CHUNKS[0], batch_output=BATCH_OUTPUTS[0], frame_duration_ms=100,
+                         streaming_save="Auto", prompt=None, extra_pnginfo=None):
         image_tensor = images
         batch_size, height, width, channels = image_tensor.shape
         total_pixels = width * height
         resolution_mp = float(total_pixels / 1_000_000)
 
-        # Get actual file 
+        # The prompt is serialized once: the same string keys the metadata cache and goes into the PNG chunk
+        prompt_text = json.dumps(prompt) if prompt else None
         try:
-            file_size_bytes = os.path.getsize(image_path)
-            file_size_mb = float(file_size_bytes) / (1024 * 1024)
-        except:
-            file_size_mb = 0.0
-
-        def gcd(a, b):
-            while b:
-                a, b = b, a % b
-            return a
-        def find_closest_standard_ratio(decimal_ratio):
-            standard_ratios = [(1.0, '1:1'), (1.25, '5:4'), (1.33333, '4:3'),
-                (1.5, '3:2'), (1.6, '16:10'), (1.66667, '5:3'),
-                (1.77778, '16:9'), (1.88889, '17:9'), (2.0, '2:1'),
-                (2.33333, '21:9'), (2.35, '2.35:1'), (2.39, '2.39:1'),
-                (2.4, '12:5')]
-            closest_diff = float('inf')
-            closest_ratio = None
-            error_threshold = 0.05
-            for std_value, std_string in standard_ratios:
-                diff = abs(std_value - decimal_ratio)
-                if diff < closest_diff:
-                    closest_diff = diff
-                    closest_ratio = std_string
-            if closest_diff <= error_threshold:
-                return closest_ratio
-            return None
-
-        divisor = gcd(width, height)
-        width_ratio = float(width // divisor)
-        height_ratio = float(height // divisor)
-        aspect_ratio_decimal = width / height
-        closest_standard = find_closest_standard_ratio(aspect_ratio_decimal)
-
-        model_name = self.extract_model_name(prompt)
-        gen_params = self.extract_generation_params(prompt)
+            model_name, gen_params = extract_prompt_metadata(prompt_text=prompt_text, prompt_data=prompt)
+        except Exception as e:
+            print(f"Error extracting prompt metadata: {e}")
+            model_name, gen_params = "N/A", default_gen_params()
 
         line1 = f"{width}x{height} | {resolution_mp:.2f}MP "
-        if closest_standard and closest_standard != f"{int(width_ratio)}:{int(height_ratio)}":
-            line2 = f"Ratio: {int(width_ratio)}:{int(height_ratio)} or {aspect_ratio_decimal:.2f}:1 or ~{closest_standard}"
-        else:
-            line2 = f"Ratio: {int(width_ratio)}:{int(height_ratio)} or {aspect_ratio_decimal:.2f}:1"
-
-        line3 = f"File Size: {file_size_mb:.2f}MB"
-
+        line2 = ratio_line(width, height)
 
         line4 = f"Model: {model_name}"
         line5 = f"Seed: {gen_params['seed']} | Steps: {gen_params['steps']} | CFG: {gen_params['cfg']}"
         line6 = f"Sampler: {gen_params['sampler']} | Scheduler: {gen_params['scheduler']}"
-        
-        if Properties == "None":
-            display_lines = []
-        elif Properties == "Basic":
-            display_lines = [line1, line2, line3]
-        elif Properties == "Metadata":
-            display_lines = [line4, line5, line6]
-        else:
-            display_lines = [line1, line2, line3, "", line4, line5, line6]
 
-        images_np = (image_tensor.cpu().numpy() * 255).astype(np.uint8)
+        # Frames are converted lazily, one at a time, while they are saved
+        stats = SaveStats()
+        images_np = stats.timed(iter_uint8_frames(image_tensor), "convert")
         quality_params = {
             "png_compress_level": png_compress_level,
             "jpeg_quality": jpeg_quality,
@@ -221,6 +236,12 @@ class SaveImageFormatQualityPropertiesSG:
             "webp_lossless": webp_lossless,
             "tiff_compression": tiff_compression,
             "tiff_jpeg_quality": tiff_jpeg_quality,
+            "max_bytes": max_bytes,
+            "png_text_chunks": png_text_chunks,
+            "batch_output": batch_output,
+            "frame_duration_ms": frame_duration_ms,
+            "preview_max_edge": preview_max_edge,
+            "preview_format": preview_format,
         }
         saved_images = self.save_images_with_format(
             images_np_list=images_np,
@@ -232,115 +253,353 @@ class SaveImageFormatQualityPropertiesSG:
             model_name=model_name,
             gen_params=gen_params,
             prompt=prompt,
-            extra_pnginfo=extra_pnginfo
+            extra_pnginfo=extra_pnginfo,
+            prompt_text=prompt_text,
+            encode_workers=encode_workers,
+            write_behind=write_mode.startswith("Write-behind"),
+            image_tensor=image_tensor,
+            streaming_save=streaming_save,
+            stats=stats
         )
+        stats.finish()
+
+        # Line 3 and the timing line are measured on the files actually written
+        save_lines = stats.lines()
+        if Properties == "None":
+            display_lines = []
+        elif Properties == "Basic":
+            display_lines = [line1, line2] + save_lines
+        elif Properties == "Metadata":
+            display_lines = [line4, line5, line6]
+        else:
+            display_lines = [line1, line2] + save_lines + ["", line4, line5, line6]
+
+        if write_mode.startswith("Write-behind") and Properties != "None":
+            status = get_write_behind_status()
+            display_lines = display_lines + [f"Write-behind: {status['pending']} pending | {status['failed']} failed"]
+            if status["errors"]:
+                last_error = status["errors"][-1]
+                display_lines.append(f"Last write error: {os.path.basename(last_error['file'])}: {last_error['error']}")
 
-        return {"ui": {"text": display_lines, "images": saved_images}}
+        ui = {"text": display_lines, "images": saved_images}
+        file_extension = FORMAT_EXTENSIONS[format]
+        if use_container(batch_output, file_extension, batch_size) and CONTAINER_FORMATS[file_extension]:
+            ui["animated"] = (True,)
+        return {"ui": ui, "result": (json.dumps(stats.as_dict()),)}
 
     def save_images_with_format(self, images_np_list, filename_prefix, format_choice, quality_params, width, height,
-                                model_name=None, gen_params=None, prompt=None, extra_pnginfo=None):
-        format_map = {
-            "PNG (lossless, larger files)": "png",
-            "JPEG (lossy, smaller files)": "jpg",
-            "WEBP (modern, good compression)": "webp",
-            "BMP (uncompressed, largest)": "bmp",
-            "TIFF (flexible, lossless, limited support)": "tiff"
-        }
-        file_extension = format_map[format_choice]
+                                model_name=None, gen_params=None, prompt=None, extra_pnginfo=None, encode_workers=0,
+                                write_behind=False, image_tensor=None, streaming_save="Off", stats=None,
+                                prompt_text=None):
+        file_extension = FORMAT_EXTENSIONS[format_choice]
         filename_prefix = self.parse_filename(filename_prefix)
         full_output_folder, filename, counter, subfolder, _ = folder_paths.get_save_image_path(
             filename_prefix, self.output_dir, width, height)
+        counter = reserve_counter(full_output_folder, filename, counter)
+        save_kwargs = self.get_save_kwargs(file_extension, quality_params)
+        # PNG text chunks (workflow, prompt) are serialized, and compressed, once per batch rather than once per frame
+        pnginfo = None
+        if file_extension == "png":
+            start = time.perf_counter()
+            pnginfo = self.build_pnginfo(model_name, gen_params or {}, prompt, extra_pnginfo,
+                                         quality_params.get("png_text_chunks", PNG_TEXT_CHUNKS[0]), prompt_text)
+            if stats is not None:
+                stats.add("metadata", time.perf_counter() - start)
+        preview_options = (quality_params.get("preview_format", PREVIEW_DEFAULT_FORMAT),
+                           quality_params.get("preview_max_edge", PREVIEW_DEFAULT_MAX_EDGE))
+        frame_count = image_tensor.shape[0] if image_tensor is not None else 0
+        if use_container(quality_params.get("batch_output"), file_extension, frame_count):
+            return self.save_batch_container(
+                images_np_list, frame_count, file_extension, full_output_folder, filename, counter, subfolder,
+                save_kwargs, pnginfo, preview_options, width, height, image_tensor.shape[-1],
+                quality_params.get("frame_duration_ms", 100), encode_workers, stats)
+
+        save_frame = self.save_frame
+        if image_tensor is not None and should_stream(streaming_save, file_extension, save_kwargs,
+                                                      width, height, image_tensor.shape[-1]):
+            # Encoders pull row strips from the tensor frames (and time the conversion themselves);
+            # the lazy uint8 frames are never produced
+            images_np_list = iter(image_tensor)
+            save_frame = self.save_frame_streaming
+        elif quality_params.get("max_bytes") and "quality" in save_kwargs and file_extension in ("jpg", "webp"):
+            save_frame = functools.partial(self.save_frame_to_budget, max_bytes=quality_params["max_bytes"])
+
+        def frame_jobs():
+            # Filenames follow the batch index, so they do not depend on which worker finishes first
+            for i, img_array in enumerate(images_np_list):
+                file_number = f"{counter + i:05d}"
+                final_filename = f"{filename}_{file_number}_.{file_extension}"
+                filepath = os.path.join(full_output_folder, final_filename)
+                preview_path = None
+                result = {"filename": final_filename, "subfolder": subfolder, "type": self.type}
+                # Write-behind files do not exist yet when the node returns, so the UI shows previews of them too
+                if file_extension in ["tiff", "bmp"] or write_behind:
+                    preview_filename = f"{filename}_{file_number}_preview.{preview_extension(preview_options[0])}"
+                    preview_path = os.path.join(self.temp_dir, preview_filename)
+                    result = {"filename": preview_filename, "subfolder": "", "type": "temp"}
+                reserve_counter(full_output_folder, filename, counter + i + 1)
+                yield img_array, filepath, preview_path, result
+
         results = []
-        for i, img_array in enumerate(images_np_list):
-            img = Image.fromarray(img_array)
-            file_number = f"{counter:05d}"
-            final_filename = f"{filename}_{file_number}_.{file_extension}"
-            filepath = os.path.join(full_output_folder, final_filename)
-
-            if file_extension == "png":
-                pnginfo = PngImagePlugin.PngInfo()
-                # Add standard comfyUI metadata keys: workflow, notes, parameters, prompt
-                if extra_pnginfo is not None:
-                    for key, value in extra_pnginfo.items():
-                        if isinstance(value, (dict, list)):
-                            pnginfo.add_text(key, json.dumps(value))
-                        else:
-                            pnginfo.add_text(key, str(value))
-                metadata_dict = {
-                    "model_name": model_name,
-                    "seed": gen_params.get('seed', 'N/A'),
-                    "steps": gen_params.get('steps', 'N/A'),
-                    "cfg": gen_params.get('cfg', 'N/A'),
-                    "sampler": gen_params.get('sampler', 'N/A'),
-                    "scheduler": gen_params.get('scheduler', 'N/A'),
-                }
-                pnginfo.add_text("parameters", json.dumps(metadata_dict))
-                if prompt:
-                    pnginfo.add_text("prompt", json.dumps(prompt))
-                img.save(filepath, compress_level=quality_params["png_compress_level"], pnginfo=pnginfo)
-
-            elif file_extension == "jpg":
-                subsampling_map = {
-                    "4:4:4 (No subsampling, best quality)": 0,
-                    "4:2:2 (Moderate subsampling)": 1,
-                    "4:2:0 (Maximum subsampling, smaller files)": 2,
-                    "Auto (based on quality)": -1
-                }
-                subsampling_value = subsampling_map.get(quality_params["jpeg_subsampling"], -1)
-                save_kwargs = {
-                    "quality": quality_params["jpeg_quality"],
-                    "optimize": quality_params["jpeg_optimize"],
-                }
-                if subsampling_value >= 0:
-                    save_kwargs["subsampling"] = subsampling_value
-                img.save(filepath, **save_kwargs)
-
-            elif file_extension == "webp":
-                save_kwargs = {
-                    "method": quality_params["webp_method"],
-                }
-                if quality_params["webp_lossless"]:
-                    save_kwargs["lossless"] = True
+        if write_behind:
+            # Queued frames are private CPU snapshots: uint8 frames are fresh arrays already, streamed tensor
+            # frames are copied so a later in-place op on the batch cannot change what gets written.
+            # Previews are written here, before the node returns; the queue blocks when full to apply
+            # backpressure. File sizes are not known when the node returns.
+            write_queue = get_write_behind_queue()
+            preview_format, preview_max_edge = preview_options
+            for img_array, filepath, preview_path, result in frame_jobs():
+                start = time.perf_counter()
+                if torch.is_tensor(img_array):
+                    img_array = img_array.detach().to("cpu", copy=True)
+                    preview_frame = frame_to_uint8(downscale_frame(img_array, preview_max_edge))
                 else:
-                    save_kwargs["quality"] = quality_params["webp_quality"]
-                img.save(filepath, **save_kwargs)
-
-            elif file_extension == "bmp":
-                img.save(filepath)
-
-            elif file_extension == "tiff":
-                compression_map = {
-                    "none (uncompressed, largest)": None,
-                    "lzw (lossless, good compression)": "tiff_lzw",
-                    "tiff_deflate (lossless, better compression)": "tiff_deflate",
-                    "jpeg (lossy, smallest)": "jpeg",
-                    "packbits (lossless, basic)": "packbits"
-                }
-                compression_value = compression_map.get(quality_params["tiff_compression"])
-                save_kwargs = {}
-                if compression_value:
-                    save_kwargs["compression"] = compression_value
-                if compression_value == "jpeg":
-                    save_kwargs["quality"] = quality_params["tiff_jpeg_quality"]
-                img.save(filepath, **save_kwargs)
-
-            preview_filename = final_filename
-            preview_subfolder = subfolder
-            preview_type = self.type
-            if file_extension in ["tiff", "bmp"]:
-                preview_filename = f"{filename}_{file_number}_preview.png"
-                preview_path = os.path.join(self.temp_dir, preview_filename)
-                img.save(preview_path, compress_level=4)
-                preview_subfolder = ""
-                preview_type = "temp"
-            results.append({
-                "filename": preview_filename,
-                "subfolder": preview_subfolder,
-                "type": preview_type,
-            })
-            counter += 1
+                    preview_frame = img_array
+                write_preview(preview_frame, preview_path, preview_format, preview_max_edge)
+                if stats is not None:
+                    stats.add("preview", time.perf_counter() - start)
+                write_queue.submit(filepath, save_frame, img_array, filepath, file_extension,
+                                   save_kwargs, pnginfo, None, preview_options)
+                results.append(result)
+                if stats is not None:
+                    stats.pending += 1
+            return results
+
+        workers = encode_workers if encode_workers > 0 else (os.cpu_count() or 1)
+        if workers == 1:
+            for img_array, filepath, preview_path, result in frame_jobs():
+                save_frame(img_array, filepath, file_extension, save_kwargs, pnginfo, preview_path, preview_options,
+                           stats)
+                results.append(result)
+            return results
+
+        # Pillow releases the GIL while encoding, so frames encode concurrently in threads.
+        # In-flight frames are bounded so the lazily converted batch is never fully materialized.
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            limit = None
+            for img_array, filepath, preview_path, result in frame_jobs():
+                limit = limit or max_in_flight(workers, img_array)
+                if len(pending) >= limit:
+                    results.append(self._wait_frame(pending.popleft()))
+                future = executor.submit(save_frame, img_array, filepath, file_extension,
+                                         save_kwargs, pnginfo, preview_path, preview_options, stats)
+                pending.append((future, result))
+            while pending:
+                results.append(self._wait_frame(pending.popleft()))
         return results
 
+    def save_batch_container(self, images_np_list, frame_count, file_extension, full_output_folder, filename, counter,
+                             subfolder, save_kwargs, pnginfo, preview_options, width, height, channels,
+                             duration_ms=100, encode_workers=0, stats=None):
+        """Write every frame of the batch into one multi-page TIFF or animated WEBP/PNG, one frame at a time"""
+        final_filename = f"{filename}_{counter:05d}_.{file_extension}"
+        filepath = os.path.join(full_output_folder, final_filename)
+        reserve_counter(full_output_folder, filename, counter + 1)
+        if file_extension == "tiff":
+            writer = MultiPageTiffWriter(filepath, save_kwargs)
+        elif file_extension == "webp":
+            writer = AnimatedWebpWriter(filepath, save_kwargs, width, height, duration_ms, alpha=channels == 4)
+        else:
+            writer = ApngWriter(filepath, save_kwargs, frame_count, duration_ms, pnginfo)
+
+        def prepare(img_array):
+            start = time.perf_counter()
+            return writer.prepare(img_array), time.perf_counter() - start
+
+        # Frames encode in parallel but are appended in batch order; TIFF pages are encoded while appended
+        workers = 1 if file_extension == "tiff" else (encode_workers if encode_workers > 0 else (os.cpu_count() or 1))
+        raw_bytes = 0
+        encode_time = write_time = 0.0
+        first_frame = None
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                pending = deque()
+
+                def append_next():
+                    nonlocal encode_time, write_time
+                    prepared, seconds = pending.popleft().result()
+                    start = time.perf_counter()
+                    writer.append(prepared)
+                    encode_time += seconds
+                    write_time += time.perf_counter() - start
+
+                for img_array in images_np_list:
+                    raw_bytes += img_array.nbytes
+                    if first_frame is None:
+                        first_frame = img_array
+                        limit = max_in_flight(workers, img_array)
+                    if len(pending) >= limit:
+                        append_next()
+                    pending.append(executor.submit(prepare, img_array))
+                while pending:
+                    append_next()
+        finally:
+            file_bytes = writer.close()
+        if stats is not None:
+            stats.add_frame(filepath, raw_bytes, file_bytes, encode_time, write_time, frames=frame_count)
+
+        if file_extension == "tiff":
+            # Browsers cannot show TIFF: the single preview entry shows the first page
+            preview_filename = f"{filename}_{counter:05d}_preview.{preview_extension(preview_options[0])}"
+            write_preview(first_frame, os.path.join(self.temp_dir, preview_filename), *preview_options)
+            return [{"filename": preview_filename, "subfolder": "", "type": "temp"}]
+        return [{"filename": final_filename, "subfolder": subfolder, "type": self.type}]
+
+    @staticmethod
+    def _wait_frame(job):
+        future, result = job
+        future.result()
+        return result
+
+    def get_save_kwargs(self, file_extension, quality_params):
+        """Translate the node's quality options into Pillow save() keyword arguments for one format"""
+        save_kwargs = {}
+        if file_extension == "png":
+            save_kwargs["compress_level"] = quality_params["png_compress_level"]
+
+        elif file_extension == "jpg":
+            subsampling_map = {
+                "4:4:4 (No subsampling, best quality)": 0,
+                "4:2:2 (Moderate subsampling)": 1,
+                "4:2:0 (Maximum subsampling, smaller files)": 2,
+                "Auto (based on quality)": -1
+            }
+            subsampling_value = subsampling_map.get(quality_params["jpeg_subsampling"], -1)
+            save_kwargs["quality"] = quality_params["jpeg_quality"]
+            save_kwargs["optimize"] = quality_params["jpeg_optimize"]
+            if subsampling_value >= 0:
+                save_kwargs["subsampling"] = subsampling_value
+
+        elif file_extension == "webp":
+            save_kwargs["method"] = quality_params["webp_method"]
+            if quality_params["webp_lossless"]:
+                save_kwargs["lossless"] = True
+            else:
+                save_kwargs["quality"] = quality_params["webp_quality"]
+
+        elif file_extension == "tiff":
+            compression_map = {
+                "none (uncompressed, largest)": None,
+                "lzw (lossless, good compression)": "tiff_lzw",
+                "tiff_deflate (lossless, better compression)": "tiff_deflate",
+                "jpeg (lossy, smallest)": "jpeg",
+                "packbits (lossless, basic)": "packbits"
+            }
+            compression_value = compression_map.get(quality_params["tiff_compression"])
+            if compression_value:
+                save_kwargs["compression"] = compression_value
+            if compression_value == "jpeg":
+                save_kwargs["quality"] = quality_params["tiff_jpeg_quality"]
+        return save_kwargs
+
+    def build_pnginfo(self, model_name, gen_params, prompt, extra_pnginfo, text_chunks=PNG_TEXT_CHUNKS[0],
+                      prompt_text=None):
+        """prompt_text: the prompt already serialized by the caller, reused instead of dumping it again"""
+        pnginfo = PngImagePlugin.PngInfo()
+
+        def add_text(key, value):
+            if text_chunks == PNG_TEXT_CHUNKS[0] or len(value) < PNG_TEXT_COMPRESS_MIN:
+                pnginfo.add_text(key, value)
+            elif text_chunks == PNG_TEXT_CHUNKS[2]:
+                pnginfo.add_itxt(key, value, zip=True)
+            else:
+                # Pillow falls back to a compressed iTXt chunk if the value is not Latin-1
+                pnginfo.add_text(key, value, zip=True)
+
+        # Add standard comfyUI metadata keys: workflow, notes, parameters, prompt
+        if extra_pnginfo is not None:
+            for key, value in extra_pnginfo.items():
+                if isinstance(value, (dict, list)):
+                    add_text(key, json.dumps(value))
+                else:
+                    add_text(key, str(value))
+        metadata_dict = {
+            "model_name": model_name,
+            "seed": gen_params.get('seed', 'N/A'),
+            "steps": gen_params.get('steps', 'N/A'),
+            "cfg": gen_params.get('cfg', 'N/A'),
+            "sampler": gen_params.get('sampler', 'N/A'),
+            "scheduler": gen_params.get('scheduler', 'N/A'),
+        }
+        add_text("parameters", json.dumps(metadata_dict))
+        if prompt:
+            add_text("prompt", prompt_text if prompt_text is not None else json.dumps(prompt))
+        return pnginfo
+
+    def save_frame(self, img_array, filepath, file_extension, save_kwargs, pnginfo=None, preview_path=None,
+                   preview_options=(PREVIEW_DEFAULT_FORMAT, PREVIEW_DEFAULT_MAX_EDGE), stats=None):
+        """Encode and write a single frame, plus a size-capped preview for formats browsers cannot show"""
+        start = time.perf_counter()
+        img = Image.fromarray(img_array)
+        buffer = io.BytesIO()
+        if file_extension == "png":
+            img.save(buffer, format="PNG", pnginfo=pnginfo, **save_kwargs)
+        else:
+            img.save(buffer, format=PIL_FORMATS[file_extension], **save_kwargs)
+        encoded = time.perf_counter()
+        with open(filepath, "wb") as f:
+            f.write(buffer.getbuffer())
+        written = time.perf_counter()
+        if stats is not None:
+            stats.add_frame(filepath, img_array.nbytes, buffer.tell(), encoded - start, written - encoded)
+        del buffer
+        if preview_path:
+            preview_format, preview_max_edge = preview_options
+            write_preview(img_array, preview_path, preview_format, preview_max_edge)
+            if stats is not None:
+                stats.add("preview", time.perf_counter() - written)
+
+    def save_frame_to_budget(self, img_array, filepath, file_extension, save_kwargs, pnginfo=None, preview_path=None,
+                             preview_options=(PREVIEW_DEFAULT_FORMAT, PREVIEW_DEFAULT_MAX_EDGE), stats=None,
+                             max_bytes=0):
+        """Write the highest-quality JPEG/WEBP encode of a frame that fits in max_bytes"""
+        start = time.perf_counter()
+        img = Image.fromarray(img_array)
+        if file_extension == "jpg" and img.mode not in ("RGB", "L", "CMYK"):
+            img = img.convert("RGB")
+        img.load()
+
+        def encode(quality):
+            # Candidates are encoded concurrently, and save() keeps its options on the image instance,
+            # so every encode gets its own copy
+            buffer = io.BytesIO()
+            img.copy().save(buffer, format=PIL_FORMATS[file_extension], **dict(save_kwargs, quality=quality))
+            return buffer.getvalue()
+
+        quality, data, trials, fits = search_quality(encode, max_bytes, high=save_kwargs["quality"])
+        if not fits:
+            print(f"Warning: {os.path.basename(filepath)} is {len(data)} bytes at quality {quality}, "
+                  f"over the {max_bytes} byte budget")
+        encoded = time.perf_counter()
+        with open(filepath, "wb") as f:
+            f.write(data)
+        written = time.perf_counter()
+        if stats is not None:
+            stats.add_frame(filepath, img_array.nbytes, len(data), encoded - start, written - encoded,
+                            quality=quality, trials=trials, fits=fits)
+
+    def save_frame_streaming(self, frame, filepath, file_extension, save_kwargs, pnginfo=None, preview_path=None,
+                             preview_options=(PREVIEW_DEFAULT_FORMAT, PREVIEW_DEFAULT_MAX_EDGE), stats=None):
+        """Encode one [H, W, C] tensor frame strip by strip, for frames too large to hold as full images"""
+        timings = {}
+        if file_extension == "png":
+            file_bytes = write_png_streaming(frame, filepath, save_kwargs.get("compress_level", 6), pnginfo,
+                                             timings=timings)
+        else:
+            file_bytes = write_tiff_streaming(frame, filepath, save_kwargs.get("compression"), timings=timings)
+        written = time.perf_counter()
+        if stats is not None:
+            stats.add("convert", timings.get("convert", 0.0))
+            stats.add_frame(filepath, frame.numel(), file_bytes, timings.get("encode", 0.0), timings.get("write", 0.0))
+        if preview_path:
+            # Downscaled in torch first, so only the preview-sized frame is converted
+            preview_format, preview_max_edge = preview_options
+            write_preview(frame_to_uint8(downscale_frame(frame, preview_max_edge)), preview_path,
+                          preview_format, preview_max_edge)
+            if stats is not None:
+                stats.add("preview", time.perf_counter() - written)
+
     def parse_filename(self, filename_prefix):
         def replace_date(match):
             format_str = match.group(1)
@@ -0,0 +1,101 @@
+import os
+import threading
+import time
+
+
+class SaveStats:
+    """Bytes written per frame and time spent per stage during one save call; encode threads may update it"""
+
+    STAGES = ("convert", "metadata", "encode", "write", "preview")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages = dict.fromkeys(self.STAGES, 0.0)
+        self.frames = []
+        self.pending = 0
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def add(self, stage, seconds):
+        with self._lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def timed(self, iterable, stage):
+        """Yield from iterable, charging the time spent producing each item to stage"""
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self.add(stage, time.perf_counter() - start)
+            yield item
+
+    def add_frame(self, filepath, raw_bytes, file_bytes, encode, write, **extra):
+        """extra: per-frame details of the encoder, e.g. the quality and trials of a size-budget search"""
+        record = {
+            "filename": os.path.basename(filepath),
+            "bytes": file_bytes,
+            "raw_bytes": raw_bytes,
+            "compression_ratio": raw_bytes / file_bytes if file_bytes else 0.0,
+            "encode_ms": encode * 1000,
+            "write_ms": write * 1000,
+            **extra,
+        }
+        with self._lock:
+            self.frames.append(record)
+            self.stages["encode"] += encode
+            self.stages["write"] += write
+
+    def finish(self):
+        self.elapsed = time.perf_counter() - self.started
+
+    @property
+    def total_bytes(self):
+        return sum(frame["bytes"] for frame in self.frames)
+
+    @property
+    def compression_ratio(self):
+        total = self.total_bytes
+        return sum(frame["raw_bytes"] for frame in self.frames) / total if total else 0.0
+
+    def as_dict(self):
+        return {
+            "frames": sorted(self.frames, key=lambda frame: frame["filename"]),
+            "pending": self.pending,
+            "total_bytes": self.total_bytes,
+            "compression_ratio": self.compression_ratio,
+            "stages_ms": {stage: seconds * 1000 for stage, seconds in self.stages.items()},
+            "elapsed_ms": self.elapsed * 1000,
+        }
+
+    def lines(self):
+        """Display lines: file size and compression, then per-stage time (summed over encode threads)"""
+        count = len(self.frames)
+        total_mb = self.total_bytes / (1024 * 1024)
+        if count == 0:
+            size_line = "File Size: pending (write-behind)" if self.pending else "File Size: 0.00MB"
+        elif count == 1 and not self.pending:
+            size_line = f"File Size: {total_mb:.2f}MB | {self.compression_ratio:.1f}:1 vs raw"
+        else:
+            size_line = (f"Files: {count} | {total_mb:.2f}MB total | {total_mb / count:.2f}MB avg"
+                         f" | {self.compression_ratio:.1f}:1 vs raw")
+            if self.pending:
+                size_line += f" | {self.pending} pending"
+        # Stages that did not run (metadata for non-PNG, encode/write of write-behind frames) are left out
+        stages = " | ".join(f"{stage} {seconds * 1000:.0f}ms" for stage, seconds in self.stages.items() if seconds > 0)
+        lines = [size_line, f"Time: {stages} | total {self.elapsed * 1000:.0f}ms"]
+
+        searched = [frame for frame in self.frames if "quality" in frame]
+        if searched:
+            qualities = [frame["quality"] for frame in searched]
+            trials = sum(frame["trials"] for frame in searched) / len(searched)
+            quality = f"{min(qualities)}" if min(qualities) == max(qualities) else f"{min(qualities)}-{max(qualities)}"
+            line = f"Quality: {quality} | {trials:.1f} trials/frame"
+            over = sum(1 for frame in searched if not frame["fits"])
+            if over:
+                line += f" | {over} over budget"
+            lines.append(line)
+        return lines
@@ -0,0 +1,207 @@
+import struct
+import time
+import zlib
+
+import numpy as np
+
+from .Image_Convert_SG import iter_uint8_strips, strip_rows
+
+STREAMING_MODES = ["Auto", "On", "Off"]
+# "Auto" streams frames of at least this many pixels (about 8k x 8k)
+STREAMING_AUTO_PIXELS = 64 * 1000 * 1000
+# Float bytes converted per strip; the encoders' temporaries scale with this, not with the image
+STREAMING_TILE_BYTES = 4 * 1024 * 1024
+# TIFF compressions the strip writer supports: Pillow compression name -> TIFF Compression tag
+STREAMING_TIFF_COMPRESSIONS = {None: 1, "tiff_deflate": 8}
+# Classic TIFF stores 32-bit offsets
+_TIFF_MAX_BYTES = 0xFFFFFFFF - (1 << 20)
+# Compressed PNG data is flushed into IDAT chunks of at least this size
+_PNG_IDAT_BYTES = 256 * 1024
+
+_PNG_COLOR_TYPES = {1: 0, 2: 4, 3: 2, 4: 6}
+_TIFF_SHORT, _TIFF_LONG = 3, 4
+
+
+def should_stream(mode, file_extension, save_kwargs, width, height, channels=3):
+    """Whether a frame is written by the strip encoders instead of a full Pillow image"""
+    if mode == "Off" or (mode == "Auto" and width * height < STREAMING_AUTO_PIXELS):
+        return False
+    if file_extension == "png":
+        return channels in _PNG_COLOR_TYPES
+    if file_extension == "tiff":
+        return (save_kwargs.get("compression") in STREAMING_TIFF_COMPRESSIONS
+                and width * height * channels < _TIFF_MAX_BYTES)
+    return False
+
+
+def _timed_strips(frame, tile_bytes, timings):
+    """iter_uint8_strips(), adding the conversion time to timings["convert"]"""
+    strips = iter_uint8_strips(frame, tile_bytes)
+    while True:
+        start = time.perf_counter()
+        strip = next(strips, None)
+        timings["convert"] = timings.get("convert", 0.0) + time.perf_counter() - start
+        if strip is None:
+            return
+        yield strip
+
+
+def _add_time(timings, stage, start):
+    now = time.perf_counter()
+    timings[stage] = timings.get(stage, 0.0) + now - start
+    return now
+
+
+def write_png_chunk(fp, chunk_type, data):
+    fp.write(struct.pack(">I", len(data)))
+    fp.write(chunk_type)
+    fp.write(data)
+    fp.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(chunk_type)) & 0xFFFFFFFF))
+
+
+def _filter_rows(rows, prior, bpp):
+    """
+    PNG-filter a [n, W*C] uint8 strip given the row above it, choosing per row the filter with the
+    smallest sum of absolute signed residuals (the libpng heuristic). Returns [n, 1 + W*C] uint8.
+    """
+    x = rows.astype(np.int16)
+    up = np.empty_like(x)
+    up[0] = prior
+    up[1:] = x[:-1]
+    left = np.zeros_like(x)
+    left[:, bpp:] = x[:, :-bpp]
+    upleft = np.zeros_like(x)
+    upleft[:, bpp:] = up[:, :-bpp]
+
+    p = left + up - upleft
+    pa = np.abs(p - left)
+    pb = np.abs(p - up)
+    pc = np.abs(p - upleft)
+    paeth = np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, up, upleft))
+    del p, pa, pb, pc
+
+    candidates = np.stack([x, x - left, x - up, x - ((left + up) >> 1), x - paeth]).astype(np.uint8)
+    del left, upleft, paeth
+    cost = np.abs(candidates.view(np.int8), dtype=np.int16).sum(axis=2, dtype=np.int64)
+    choice = cost.argmin(axis=0)
+
+    out = np.empty((rows.shape[0], rows.shape[1] + 1), dtype=np.uint8)
+    out[:, 0] = choice
+    out[:, 1:] = candidates[choice, np.arange(rows.shape[0])]
+    return out
+
+
+def write_png_streaming(frame, filepath, compress_level=6, pnginfo=None, tile_bytes=STREAMING_TILE_BYTES,
+                        timings=None):
+    """
+    Write one [H, W, C] float frame as an 8-bit PNG, converting, filtering and deflating it strip by strip.
+    pnginfo is a PngImagePlugin.PngInfo whose chunks are written as Pillow would.
+    Returns the file size; convert/encode/write seconds are added to the timings dict if given.
+    """
+    timings = {} if timings is None else timings
+    height, width, channels = frame.shape
+    chunks = [chunk[:2] + (chunk[2] if len(chunk) > 2 else False,) for chunk in (pnginfo.chunks if pnginfo else ())]
+    compressor = zlib.compressobj(compress_level)
+    prior = np.zeros(width * channels, dtype=np.int16)
+    with open(filepath, "wb") as fp:
+        fp.write(b"\x89PNG\r\n\x1a\n")
+        write_png_chunk(fp, b"IHDR", struct.pack(">IIBBBBB", width, height, 8, _PNG_COLOR_TYPES[channels], 0, 0, 0))
+        for chunk_type, data, after_idat in chunks:
+            if not after_idat:
+                write_png_chunk(fp, chunk_type, data)
+
+        pending = []
+        pending_bytes = 0
+        for strip in _timed_strips(frame, tile_bytes, timings):
+            start = time.perf_counter()
+            rows = strip.reshape(strip.shape[0], -1)
+            if compress_level == 0:
+                filtered = np.zeros((rows.shape[0], rows.shape[1] + 1), dtype=np.uint8)
+                filtered[:, 1:] = rows
+            else:
+                filtered = _filter_rows(rows, prior, channels)
+            prior = rows[-1].astype(np.int16)
+            data = compressor.compress(memoryview(filtered).cast("B"))
+            if data:
+                pending.append(data)
+                pending_bytes += len(data)
+            start = _add_time(timings, "encode", start)
+            if pending_bytes >= _PNG_IDAT_BYTES:
+                write_png_chunk(fp, b"IDAT", b"".join(pending))
+                pending, pending_bytes = [], 0
+                _add_time(timings, "write", start)
+        start = time.perf_counter()
+        pending.append(compressor.flush())
+        start = _add_time(timings, "encode", start)
+        write_png_chunk(fp, b"IDAT", b"".join(pending))
+
+        for chunk_type, data, after_idat in chunks:
+            if after_idat:
+                write_png_chunk(fp, chunk_type, data)
+        write_png_chunk(fp, b"IEND", b"")
+        _add_time(timings, "write", start)
+        return fp.tell()
+
+
+def _tiff_entry(tag, field_type, values, fp_end, extra):
+    """One IFD entry; values that do not fit in 4 bytes are appended to extra at offset fp_end + len(extra)"""
+    fmt = "<%d%s" % (len(values), "H" if field_type == _TIFF_SHORT else "I")
+    data = struct.pack(fmt, *values)
+    if len(data) <= 4:
+        return struct.pack("<HHI", tag, field_type, len(values)) + data.ljust(4, b"\x00")
+    offset = fp_end + len(extra)
+    extra += data
+    return struct.pack("<HHII", tag, field_type, len(values), offset)
+
+
+def write_tiff_streaming(frame, filepath, compression=None, tile_bytes=STREAMING_TILE_BYTES, timings=None):
+    """
+    Write one [H, W, C] float frame as an 8-bit striped TIFF (uncompressed or Adobe Deflate),
+    one strip per converted row slice; the IFD goes at the end once strip offsets are known.
+    Returns the file size; convert/encode/write seconds are added to the timings dict if given.
+    """
+    timings = {} if timings is None else timings
+    height, width, channels = frame.shape
+    compression_tag = STREAMING_TIFF_COMPRESSIONS[compression]
+    offsets, counts = [], []
+    with open(filepath, "wb") as fp:
+        fp.write(b"II*\x00\x00\x00\x00\x00")
+        for strip in _timed_strips(frame, tile_bytes, timings):
+            start = time.perf_counter()
+            data = memoryview(np.ascontiguousarray(strip)).cast("B")
+            if compression_tag == 8:
+                data = zlib.compress(data)
+            start = _add_time(timings, "encode", start)
+            offsets.append(fp.tell())
+            counts.append(len(data))
+            fp.write(data)
+            _add_time(timings, "write", start)
+        start = time.perf_counter()
+        if fp.tell() % 2:
+            fp.write(b"\x00")
+
+        ifd_offset = fp.tell()
+        entries = [
+            (256, _TIFF_LONG, [width]),
+            (257, _TIFF_LONG, [height]),
+            (258, _TIFF_SHORT, [8] * channels),
+            (259, _TIFF_SHORT, [compression_tag]),
+            (262, _TIFF_SHORT, [2 if channels >= 3 else 1]),
+            (273, _TIFF_LONG, offsets),
+            (277, _TIFF_SHORT, [channels]),
+            (278, _TIFF_LONG, [strip_rows(width, channels, tile_bytes)]),
+            (279, _TIFF_LONG, counts),
+            (284, _TIFF_SHORT, [1]),
+        ]
+        if channels in (2, 4):
+            entries.append((338, _TIFF_SHORT, [2]))  # unassociated alpha
+        extra = bytearray()
+        extra_offset = ifd_offset + 2 + len(entries) * 12 + 4
+        ifd = b"".join(_tiff_entry(tag, field_type, values, extra_offset, extra)
+                       for tag, field_type, values in entries)
+        fp.write(struct.pack("<H", len(entries)) + ifd + b"\x00\x00\x00\x00" + bytes(extra))
+        size = fp.tell()
+        fp.seek(4)
+        fp.write(struct.pack("<I", ifd_offset))
+        _add_time(timings, "write", start)
+        return size
@@ -0,0 +1,105 @@
+import json
+import re
+
+# Workflows smaller than this are parsed with json.loads; larger ones are scanned node by node
+WORKFLOW_STREAM_THRESHOLD = 1024 * 1024
+
+_WS = re.compile(r'[ \t\n\r]*')
+# Flat arrays of scalars (the bulk of "links"), strings (with escapes) and brackets:
+# everything needed to skip a container without decoding it
+_SKIP_TOKEN = re.compile(r'\[[^\[\]{}"]*\]|"(?:[^"\\]|\\.)*"|[\[\]{}]')
+_decoder = json.JSONDecoder()
+
+
+def _skip_ws(text, pos):
+    return _WS.match(text, pos).end()
+
+
+def _expect(text, pos, char):
+    pos = _skip_ws(text, pos)
+    if text[pos:pos + 1] != char:
+        raise ValueError(f"Expected {char!r} at {pos}")
+    return pos + 1
+
+
+def skip_value(text, pos):
+    """Return the position after the JSON value starting at pos, without building it"""
+    pos = _skip_ws(text, pos)
+    if text[pos:pos + 1] not in ("{", "["):
+        return _decoder.raw_decode(text, pos)[1]
+    depth = 0
+    for match in _SKIP_TOKEN.finditer(text, pos):
+        token = match.group()
+        if len(token) > 1 and token[0] == "[":
+            if depth == 0:
+                return match.end()
+        elif token in ("{", "["):
+            depth += 1
+        elif token in ("}", "]"):
+            depth -= 1
+            if depth == 0:
+                return match.end()
+    raise ValueError("Unterminated JSON container")
+
+
+def iter_object_items(text, pos=0):
+    """Yield (key, value_pos) for each member of the object at pos; values the caller doesn't decode are skipped"""
+    pos = _expect(text, pos, "{")
+    pos = _skip_ws(text, pos)
+    if text[pos:pos + 1] == "}":
+        return
+    while True:
+        key, pos = _decoder.raw_decode(text, _skip_ws(text, pos))
+        pos = _expect(text, pos, ":")
+        value_pos = _skip_ws(text, pos)
+        yield key, value_pos
+        pos = _skip_ws(text, skip_value(text, value_pos))
+        if text[pos:pos + 1] == "}":
+            return
+        pos = _expect(text, pos, ",")
+
+
+def iter_array_values(text, pos):
+    """Decode the elements of the array at pos one at a time"""
+    pos = _expect(text, pos, "[")
+    pos = _skip_ws(text, pos)
+    if text[pos:pos + 1] == "]":
+        return
+    while True:
+        value, pos = _decoder.raw_decode(text, _skip_ws(text, pos))
+        yield value
+        pos = _skip_ws(text, pos)
+        if text[pos:pos + 1] == "]":
+            return
+        pos = _expect(text, pos, ",")
+
+
+def _is_model_loader(node):
+    node_type = node.get('type', '')
+    return 'Checkpoint' in node_type or 'Loader' in node_type
+
+
+def workflow_model_name(workflow_text, threshold=WORKFLOW_STREAM_THRESHOLD):
+    """
+    widgets_values[0] of the first Checkpoint/Loader node of a ComfyUI workflow, or "N/A".
+    Large workflows are scanned: top-level members other than "nodes" are skipped unparsed,
+    nodes are decoded one at a time, and the scan stops at the first loader.
+    """
+    if 'Loader' not in workflow_text and 'Checkpoint' not in workflow_text:
+        return "N/A"
+
+    if len(workflow_text) < threshold:
+        nodes = json.loads(workflow_text).get('nodes', [])
+    else:
+        nodes = ()
+        for key, value_pos in iter_object_items(workflow_text):
+            if key == 'nodes':
+                nodes = iter_array_values(workflow_text, value_pos)
+                break
+
+    for node in nodes:
+        if isinstance(node, dict) and _is_model_loader(node):
+            widgets = node.get('widgets_values', [])
+            if widgets and len(widgets) > 0:
+                return widgets[0]
+    return "N/A"
@@ -0,0 +1,82 @@
+import atexit
+import os
+import queue
+import threading
+import time
+from collections import deque
+
+WRITE_BEHIND_QUEUE_SIZE = 64
+WRITE_BEHIND_WORKERS = max(1, min(4, os.cpu_count() or 1))
+
+
+class WriteBehindQueue:
+    """Bounded background queue that encodes and writes files after the node has returned"""
+
+    def __init__(self, maxsize=WRITE_BEHIND_QUEUE_SIZE, workers=WRITE_BEHIND_WORKERS):
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._failed = 0
+        self._errors = deque(maxlen=100)
+        self._threads = []
+        for i in range(workers):
+            thread = threading.Thread(target=self._worker, name=f"SG-write-behind-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, label, fn, *args, **kwargs):
+        """Queue a write; blocks while the queue is full so producers cannot outrun the disk"""
+        with self._lock:
+            self._pending += 1
+        self._queue.put((label, fn, args, kwargs))
+
+    def _worker(self):
+        while True:
+            label, fn, args, kwargs = self._queue.get()
+            try:
+                fn(*args, **kwargs)
+                with self._lock:
+                    self._completed += 1
+            except Exception as e:
+                print(f"Error writing {label}: {e}")
+                with self._lock:
+                    self._failed += 1
+                    self._errors.append({"file": label, "error": str(e), "time": time.time()})
+            finally:
+                with self._lock:
+                    self._pending -= 1
+                self._queue.task_done()
+
+    def flush(self):
+        """Block until every queued write has finished"""
+        self._queue.join()
+
+    def status(self):
+        with self._lock:
+            return {
+                "pending": self._pending,
+                "completed": self._completed,
+                "failed": self._failed,
+                "errors": list(self._errors),
+            }
+
+
+_write_behind_queue = None
+_write_behind_lock = threading.Lock()
+
+
+def get_write_behind_queue():
+    global _write_behind_queue
+    with _write_behind_lock:
+        if _write_behind_queue is None:
+            _write_behind_queue = WriteBehindQueue()
+            atexit.register(_write_behind_queue.flush)
+        return _write_behind_queue
+
+
+def get_write_behind_status():
+    """Counts of pending/completed/failed background writes and the most recent errors"""
+    if _write_behind_queue is None:
+        return {"pending": 0, "completed": 0, "failed": 0, "errors": []}
+    return _write_behind_queue.status()
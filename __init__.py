@@ -6,19 +6,23 @@ from .Load_Image_and_view_Properties_SG import LoadImageandviewPropertiesSG
 from .View_Image_Properties_SG import ViewImagePropertiesSG
 from .Preview_Image_and_view_Properties_SG import PreviewImageandviewPropertiesSG
 from .Save_Image_Format_Quality_Properties_SG import SaveImageFormatQualityPropertiesSG
+from .Batch_Folder_Analyzer_SG import BatchFolderAnalyzerSG
+from . import Properties_Route_SG  # registers the HTTP routes: Load node properties, write-behind status
 
 NODE_CLASS_MAPPINGS = {
     "ViewImagePropertiesSG": ViewImagePropertiesSG,
     "LoadImageandviewPropertiesSG": LoadImageandviewPropertiesSG,
     "PreviewImageandviewPropertiesSG": PreviewImageandviewPropertiesSG,
-    "SaveImageFormatQualityPropertiesSG": SaveImageFormatQualityPropertiesSG
+    "SaveImageFormatQualityPropertiesSG": SaveImageFormatQualityPropertiesSG,
+    "BatchFolderAnalyzerSG": BatchFolderAnalyzerSG
 }
 
 NODE_DISPLAY_NAME_MAPPINGS = {
     "ViewImagePropertiesSG": "View Image Properties-SG",
     "LoadImageandviewPropertiesSG": "Load Image and view Properties-SG",
     "PreviewImageandviewPropertiesSG": "Preview Image and view Properties-SG",
-    "SaveImageFormatQualityPropertiesSG": "Save Image Format Quality Properties-SG"
+    "SaveImageFormatQualityPropertiesSG": "Save Image Format Quality Properties-SG",
+    "BatchFolderAnalyzerSG": "Batch Folder Analyzer-SG"
 }
 
 WEB_DIRECTORY = "./js"
@@ -0,0 +1,143 @@
+"""
+Throughput of the A1111/Forge "parameters" parsing: legacy regex chain vs the single-pass trailer parser.
+
+    python benchmarks/bench_a1111_parser.py --repeat 20000
+    python benchmarks/bench_a1111_parser.py --corpus /path/to/images   # parameters chunks of real PNGs
+
+The legacy variant is the six re.search calls the Load node used before, each one scanning the whole string.
+"node fields" runs both on the six fields the nodes display. "all fields" adds size, hashes, VAE, denoising,
+hires, LoRAs and version: one more re.search per field for the chain, and no extra scan for the parser.
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SAMPLE_PARAMETERS = [
+    "masterpiece, best quality, 1girl, looking at viewer, <lora:detail_tweaker:0.6>\n"
+    "Negative prompt: lowres, bad anatomy, worst quality\n"
+    "Steps: 28, Sampler: DPM++ 2M, Schedule type: Karras, CFG scale: 7, Seed: 3366548721, Size: 832x1216, "
+    "Model hash: 67ab2fd8ec, Model: ponyDiffusionV6XL, VAE hash: 235745af8d, VAE: sdxl_vae.safetensors, "
+    "Denoising strength: 0.4, Clip skip: 2, Hires upscale: 1.5, Hires steps: 15, Hires upscaler: 4x-UltraSharp, "
+    "Lora hashes: \"detail_tweaker: 7a3e5a8c2b1d\", Version: v1.10.1",
+    "a photo of an astronaut riding a horse on mars\n"
+    "Steps: 20, Sampler: Euler a, CFG scale: 7.5, Seed: 42, Size: 512x512, Model hash: 6ce0161689, "
+    "Model: v1-5-pruned-emaonly, Version: v1.6.0",
+    "cinematic still of a lighthouse at dusk, volumetric light, 35mm\n"
+    "Negative prompt: cartoon, painting\n"
+    "Steps: 30, Sampler: DPM++ SDE Karras, CFG scale: 5, Seed: 1234567890, Size: 1024x1024, "
+    "Model hash: 31e35c80fc, Model: sd_xl_base_1.0, Denoising strength: 0.35, "
+    "Hires upscale: 2, Hires upscaler: Latent, Version: f0.0.17v1.8.0rc-latest-276-g29be1da7",
+    "portrait of an old fisherman, detailed skin, rim light\n"
+    "Steps: 25, Sampler: Euler, Schedule type: Simple, CFG scale: 1, Distilled CFG Scale: 3.5, Seed: 987654321, "
+    "Size: 896x1152, Model hash: 275ef623d3, Model: flux1-dev-bnb-nf4-v2, Version: f2.0.1v1.10.1-previous-313",
+]
+
+
+def legacy_parse(text):
+    params = {}
+    match = re.search(r'Model:\s*([^,\n]+)', text)
+    model = match.group(1).strip() if match else "N/A"
+    seed_match = re.search(r'Seed:\s*(\d+)', text)
+    if seed_match:
+        params['seed'] = int(seed_match.group(1))
+    steps_match = re.search(r'Steps:\s*(\d+)', text)
+    if steps_match:
+        params['steps'] = int(steps_match.group(1))
+    cfg_match = re.search(r'CFG scale:\s*([\d.]+)', text)
+    if cfg_match:
+        params['cfg'] = float(cfg_match.group(1))
+    sampler_match = re.search(r'Sampler:\s*([^,\n]+)', text)
+    if sampler_match:
+        params['sampler'] = sampler_match.group(1).strip()
+    scheduler_match = re.search(r'Schedule type:\s*([^,\n]+)', text)
+    if scheduler_match:
+        params['scheduler'] = scheduler_match.group(1).strip()
+    return model, params
+
+
+# The same chain stretched to every field the parser returns, one re.search per field
+LEGACY_EXTRA_PATTERNS = {
+    "model_hash": r'Model hash:\s*([^,\n]+)',
+    "vae": r'VAE:\s*([^,\n]+)',
+    "vae_hash": r'VAE hash:\s*([^,\n]+)',
+    "size": r'Size:\s*(\d+)x(\d+)',
+    "denoising": r'Denoising strength:\s*([\d.]+)',
+    "clip_skip": r'Clip skip:\s*(\d+)',
+    "hires_upscale": r'Hires upscale:\s*([\d.]+)',
+    "hires_steps": r'Hires steps:\s*(\d+)',
+    "hires_upscaler": r'Hires upscaler:\s*([^,\n]+)',
+    "loras": r'Lora hashes:\s*"([^"]*)"',
+    "version": r'Version:\s*([^,\n]+)',
+}
+
+
+def legacy_parse_all(text):
+    model, params = legacy_parse(text)
+    for field, pattern in LEGACY_EXTRA_PATTERNS.items():
+        match = re.search(pattern, text)
+        if match:
+            params[field] = match.groups()
+    return model, params
+
+
+def load_corpus(folder):
+    from PIL import Image
+    corpus = []
+    for root, _, files in os.walk(folder):
+        for name in files:
+            if not name.lower().endswith((".png", ".webp", ".jpg", ".jpeg")):
+                continue
+            try:
+                with Image.open(os.path.join(root, name)) as img:
+                    text = img.info.get("parameters")
+            except Exception:
+                continue
+            if isinstance(text, str):
+                corpus.append(text)
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20000, help="passes over the corpus")
+    parser.add_argument("--corpus", help="folder of images whose 'parameters' chunks are used instead of the samples")
+    args = parser.parse_args()
+
+    from Parameters_Parser_SG import parse_generation_info, NODE_FIELDS
+
+    corpus = load_corpus(args.corpus) if args.corpus else SAMPLE_PARAMETERS
+    if not corpus:
+        sys.exit("No 'parameters' chunks found")
+    total = len(corpus) * args.repeat
+    print(f"{len(corpus)} parameter strings x {args.repeat} passes")
+
+    variants = (
+        ("legacy regex chain, node fields", legacy_parse),
+        ("single-pass parser, node fields", lambda text: parse_generation_info(text, NODE_FIELDS)),
+        ("legacy regex chain, all fields", legacy_parse_all),
+        ("single-pass parser, all fields", parse_generation_info),
+    )
+    for name, fn in variants:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for text in corpus:
+                fn(text)
+        elapsed = time.perf_counter() - start
+        print(f"{name}: {elapsed * 1000:.1f} ms | {total / elapsed:,.0f} strings/sec")
+
+    # The parser must agree with the legacy chain on the fields the node displays
+    mismatches = 0
+    for text in corpus:
+        model, params = legacy_parse(text)
+        info = parse_generation_info(text)
+        if info.get("model", "N/A") != model or any(info.get(k) != v for k, v in params.items()):
+            mismatches += 1
+    print(f"field mismatches vs legacy: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
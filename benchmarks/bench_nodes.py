@@ -0,0 +1,271 @@
+"""
+End-to-end benchmark of the four nodes outside ComfyUI, with a regression check against a stored baseline.
+
+    python benchmarks/bench_nodes.py                                   # default matrix, compare if a baseline exists
+    python benchmarks/bench_nodes.py --sizes 1 4 --batches 1 8 --nodes save load
+    python benchmarks/bench_nodes.py --save-baseline                   # record benchmarks/baseline_nodes.json
+
+folder_paths and comfy.cli_args are stubbed with temp directories (comfy_stubs.py). View, Preview and Save
+run on generated gradient-plus-noise batches of 1-64 MP frames; Load reads generated files in every format
+with both loaders. Each case runs in its own subprocess after a tiny warm-up call, so imports are excluded
+and ru_maxrss is per case. Wall time is the best of --repeat runs (the first, cold run is reported too).
+Cases whose float32 batch would exceed --max-tensor-mb are skipped.
+
+Baselines are machine specific and none is committed: record one per machine or CI runner with
+--save-baseline (see benchmarks/README.md). A case regresses when its wall time or peak RSS grows by more
+than --tolerance over the baseline (plus a small absolute allowance); the exit status is then 1.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from comfy_stubs import install_stubs, load_module
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline_nodes.json")
+
+NODES = ("view", "preview", "save", "load")
+FORMATS = {
+    "png": "PNG (lossless, larger files)",
+    "jpg": "JPEG (lossy, smaller files)",
+    "webp": "WEBP (modern, good compression)",
+    "bmp": "BMP (uncompressed, largest)",
+    "tiff": "TIFF (flexible, lossless, limited support)",
+}
+LOADERS = ("mmap", "decode")
+# Fixture encodings favour fast generation; TIFF is uncompressed so the mmap loader applies
+FIXTURE_SAVE_KWARGS = {
+    "png": {"compress_level": 1},
+    "jpg": {"quality": 90},
+    "webp": {"quality": 80, "method": 0},
+    "bmp": {},
+    "tiff": {},
+}
+# Peak RSS below this much growth is noise (allocator arenas, page cache accounting)
+RSS_SLACK_MB = 16
+# Likewise for wall time: millisecond-scale cases jitter by more than the relative tolerance
+TIME_SLACK_S = 0.010
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def frame_side(mp):
+    """Square frame edge (a multiple of 64) closest to mp megapixels"""
+    return max(64, int(round(math.sqrt(mp * 1_000_000) / 64)) * 64)
+
+
+def case_key(case):
+    parts = [case["node"], case.get("format") or "-"]
+    if case.get("loader"):
+        parts.append(case["loader"])
+    parts.append(f"{case['mp']:g}MP")
+    parts.append(f"x{case['batch']}")
+    return "/".join(parts)
+
+
+def build_cases(args):
+    cases = []
+    for node in args.nodes:
+        for mp in args.sizes:
+            if node == "load":
+                for file_format in args.formats:
+                    for loader in LOADERS:
+                        cases.append({"node": node, "format": file_format, "loader": loader, "mp": mp, "batch": 1})
+                continue
+            for batch in args.batches:
+                side = frame_side(mp)
+                if batch * side * side * 3 * 4 / (1024 * 1024) > args.max_tensor_mb:
+                    continue
+                for file_format in (args.formats if node == "save" else [None]):
+                    cases.append({"node": node, "format": file_format, "mp": mp, "batch": batch})
+    return cases
+
+
+def make_images(batch, side):
+    import torch
+
+    # Gradients plus noise, different per frame, filled a few rows at a time so building the batch
+    # does not raise the peak RSS above the batch itself
+    images = torch.empty(batch, side, side, 3)
+    x = torch.linspace(0, 1, side).view(1, -1)
+    for b in range(batch):
+        for start in range(0, side, 256):
+            y = torch.linspace(0, 1, side)[start:start + 256].view(-1, 1)
+            rows = images[b, start:start + 256]
+            rows[..., 0] = x
+            rows[..., 1] = y
+            rows[..., 2] = (x * y + b / max(1, batch)) % 1.0
+            rows.add_(torch.rand(rows.shape).mul_(0.05)).clamp_(0, 1)
+    return images
+
+
+def fixture_name(mp, file_format):
+    return f"fixture_{mp:g}mp.{file_format}"
+
+
+def write_fixtures(fixtures_dir, sizes, formats):
+    """Files for the Load node, plus a 64x64 warm-up file per format; existing fixtures are reused"""
+    import numpy as np
+    from PIL import Image
+
+    for mp in [0] + list(sizes):
+        side = frame_side(mp) if mp else 64
+        missing = [f for f in formats if not os.path.exists(os.path.join(fixtures_dir, fixture_name(mp, f)))]
+        if not missing:
+            continue
+        ramp = np.linspace(0, 255, side, dtype=np.float32)
+        pixels = np.empty((side, side, 3), dtype=np.uint8)
+        pixels[..., 0] = ramp[None, :]
+        pixels[..., 1] = ramp[:, None]
+        pixels[..., 2] = np.random.default_rng(0).integers(0, 32, (side, side), dtype=np.uint8)
+        img = Image.fromarray(pixels)
+        for file_format in missing:
+            img.save(os.path.join(fixtures_dir, fixture_name(mp, file_format)), **FIXTURE_SAVE_KWARGS[file_format])
+
+
+def run_case(case, repeat, fixtures_dir):
+    """Child process: time one case and print its RESULT line"""
+    import torch
+
+    dirs = install_stubs(input_dir=fixtures_dir)
+    node_type = case["node"]
+    if node_type == "view":
+        node = load_module("View_Image_Properties_SG").ViewImagePropertiesSG()
+        call = node.image_properties
+    elif node_type == "preview":
+        node = load_module("Preview_Image_and_view_Properties_SG").PreviewImageandviewPropertiesSG()
+        call = node.preview_and_analyze
+    elif node_type == "save":
+        node = load_module("Save_Image_Format_Quality_Properties_SG").SaveImageFormatQualityPropertiesSG()
+        call = lambda images: node.save_and_analyze(images, "bench", format=FORMATS[case["format"]])
+    else:
+        node = load_module("Load_Image_and_view_Properties_SG").LoadImageandviewPropertiesSG()
+        call = lambda filename: node.load_and_analyze(filename, case["loader"])
+
+    side = frame_side(case["mp"])
+    if node_type == "load":
+        warmup_input, bench_input = fixture_name(0, case["format"]), fixture_name(case["mp"], case["format"])
+    else:
+        warmup_input, bench_input = make_images(1, 64), make_images(case["batch"], side)
+    with torch.no_grad():
+        call(warmup_input)
+
+        base_rss = peak_rss_mb()
+        times = []
+        for _ in range(repeat):
+            # Fresh output/temp directories, so preview caches and earlier files do not carry over
+            for kind in ("output", "temp"):
+                shutil.rmtree(dirs[kind], ignore_errors=True)
+                os.makedirs(dirs[kind])
+            start = time.perf_counter()
+            call(bench_input)
+            times.append(time.perf_counter() - start)
+
+    wall = min(times)
+    megapixels = case["batch"] * side * side / 1_000_000
+    print("RESULT " + json.dumps({
+        "key": case_key(case),
+        "wall_s": wall,
+        "first_s": times[0],
+        "mp_per_s": megapixels / wall if wall > 0 else 0.0,
+        "peak_rss_mb": max(0.0, peak_rss_mb() - base_rss),
+    }), flush=True)
+
+
+def compare(result, baseline, tolerance):
+    """Return (delta text, regressed) for one result against its baseline entry"""
+    if not baseline:
+        return "", False
+    wall_ratio = result["wall_s"] / baseline["wall_s"] if baseline["wall_s"] > 0 else 1.0
+    wall_limit = baseline["wall_s"] * (1 + tolerance) + TIME_SLACK_S
+    rss_limit = baseline["peak_rss_mb"] * (1 + tolerance) + RSS_SLACK_MB
+    regressed = result["wall_s"] > wall_limit or result["peak_rss_mb"] > rss_limit
+    text = f"{(wall_ratio - 1) * 100:+6.1f}% time, {result['peak_rss_mb'] - baseline['peak_rss_mb']:+8.1f} MB"
+    return text + ("  REGRESSION" if regressed else ""), regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", nargs="+", choices=NODES, default=list(NODES))
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 4, 16, 64], help="frame sizes in megapixels")
+    parser.add_argument("--batches", type=int, nargs="+", default=[1, 8, 64])
+    parser.add_argument("--formats", nargs="+", choices=list(FORMATS), default=list(FORMATS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-tensor-mb", type=float, default=4096, help="skip batches larger than this")
+    parser.add_argument("--fixtures", help="directory for Load fixtures (kept between runs); default: a temp dir")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="write these results to --baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative growth of time and RSS")
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        run_case(json.loads(args.case), args.repeat, args.fixtures)
+        return
+
+    cases = build_cases(args)
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f).get("cases", {})
+
+    fixtures_dir = args.fixtures or tempfile.mkdtemp(prefix="sg_fixtures_")
+    os.makedirs(fixtures_dir, exist_ok=True)
+    results = {}
+    regressions = 0
+    try:
+        if "load" in args.nodes:
+            write_fixtures(fixtures_dir, args.sizes, args.formats)
+        print(f"{len(cases)} cases | best of {args.repeat} | baseline: {args.baseline if baseline else 'none'}")
+        for case in cases:
+            key = case_key(case)
+            proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--case", json.dumps(case),
+                                   "--repeat", str(args.repeat), "--fixtures", fixtures_dir],
+                                  capture_output=True, text=True)
+            lines = [line for line in proc.stdout.splitlines() if line.startswith("RESULT ")]
+            if proc.returncode != 0 or not lines:
+                print(f"{key:32} FAILED: {(proc.stderr.strip().splitlines() or ['no output'])[-1]}")
+                regressions += 1
+                continue
+            result = json.loads(lines[-1][len("RESULT "):])
+            results[key] = result
+            delta, regressed = compare(result, baseline.get(key), args.tolerance)
+            regressions += regressed
+            print(f"{key:32} {result['wall_s'] * 1000:9.1f} ms (cold {result['first_s'] * 1000:9.1f})"
+                  f" | {result['mp_per_s']:8.1f} MP/s | peak RSS {result['peak_rss_mb']:8.1f} MB  {delta}")
+    finally:
+        if not args.fixtures:
+            shutil.rmtree(fixtures_dir, ignore_errors=True)
+
+    if args.save_baseline:
+        saved = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                saved = json.load(f).get("cases", {})
+        saved.update({key: {"wall_s": r["wall_s"], "peak_rss_mb": r["peak_rss_mb"]} for key, r in results.items()})
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"machine": {"platform": platform.platform(), "python": platform.python_version(),
+                                   "cpu_count": os.cpu_count()},
+                       "cases": saved}, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline} ({len(saved)} cases)")
+
+    if regressions:
+        print(f"{regressions} case(s) regressed or failed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Cost of PNG workflow metadata in batch saves: PngInfo rebuilt per frame vs built once per batch,
+and the on-disk size of tEXt vs compressed zTXt/iTXt text chunks.
+
+    python benchmarks/bench_png_metadata.py --batch 64 --workflow-mb 1 5
+
+Frames are small (--size) so the time is dominated by metadata rather than pixel encoding.
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from comfy_stubs import install_stubs, load_module
+
+
+def run(node, frames, out_dir, workflow, prompt, text_chunks, per_frame):
+    gen_params = {"seed": 1, "steps": 20, "cfg": 7.0, "sampler": "euler", "scheduler": "normal"}
+    extra_pnginfo = {"workflow": workflow}
+    start = time.perf_counter()
+    pnginfo = None if per_frame else node.build_pnginfo("model", gen_params, prompt, extra_pnginfo, text_chunks)
+    metadata_time = time.perf_counter() - start
+    for i, frame in enumerate(frames):
+        if per_frame:
+            t = time.perf_counter()
+            pnginfo = node.build_pnginfo("model", gen_params, prompt, extra_pnginfo, text_chunks)
+            metadata_time += time.perf_counter() - t
+        node.save_frame(frame, os.path.join(out_dir, f"{i:05d}.png"), "png", {"compress_level": 4}, pnginfo)
+    elapsed = time.perf_counter() - start
+    size = sum(os.path.getsize(os.path.join(out_dir, name)) for name in os.listdir(out_dir))
+    return elapsed, metadata_time, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch", type=int, default=64)
+    parser.add_argument("--size", type=int, default=64, help="frame edge in pixels")
+    parser.add_argument("--workflow-mb", type=float, nargs="+", default=[1, 5])
+    args = parser.parse_args()
+
+    from bench_workflow_scan import make_workflow
+    install_stubs()
+    save_module = load_module("Save_Image_Format_Quality_Properties_SG")
+    node = save_module.SaveImageFormatQualityPropertiesSG()
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 256, (args.size, args.size, 3), dtype=np.uint8) for _ in range(args.batch)]
+
+    variants = [("per frame, tEXt", save_module.PNG_TEXT_CHUNKS[0], True)]
+    variants += [(f"per batch, {mode.split()[0]}", mode, False) for mode in save_module.PNG_TEXT_CHUNKS]
+    for workflow_mb in args.workflow_mb:
+        workflow = json.loads(make_workflow(workflow_mb, "middle", False))
+        prompt = {str(node_info["id"]): {"class_type": node_info["type"], "inputs": {}} for node_info in workflow["nodes"]}
+        print(f"workflow {workflow_mb:g} MB | batch {args.batch} x {args.size}x{args.size}")
+        for name, text_chunks, per_frame in variants:
+            out_dir = tempfile.mkdtemp()
+            try:
+                elapsed, metadata_time, size = run(node, frames, out_dir, workflow, prompt, text_chunks, per_frame)
+            finally:
+                shutil.rmtree(out_dir, ignore_errors=True)
+            print(f"  {name:20}: {elapsed * 1000:8.1f} ms total | {metadata_time * 1000:8.1f} ms metadata"
+                  f" | {size / (1024 * 1024):8.2f} MB on disk")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Peak RSS and wall time of saving one large frame: full Pillow image vs the strip-streaming encoders.
+
+    python benchmarks/bench_streaming_save.py --width 16384 --height 16384 --formats png tiff
+
+"pillow" is the Save node's regular path (uint8 frame -> Image.fromarray -> save), "streaming" writes
+row strips converted straight from the tensor. Each run is its own subprocess so ru_maxrss is not shared,
+and the figure reported is the peak above the already allocated input tensor.
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from comfy_stubs import load_module
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def make_frame(width, height):
+    import torch
+
+    # Gradients plus noise, so it compresses like a real render. The frame is filled a few rows at a
+    # time, so building it does not raise the peak RSS above the frame itself.
+    frame = torch.empty(height, width, 3)
+    x = torch.linspace(0, 1, width).view(1, -1)
+    for start in range(0, height, 256):
+        y = torch.linspace(0, 1, height)[start:start + 256].view(-1, 1)
+        rows = frame[start:start + 256]
+        rows[..., 0] = x
+        rows[..., 1] = y
+        rows[..., 2] = x * y
+        rows.add_(torch.rand(rows.shape).mul_(0.05)).clamp_(0, 1)
+    return frame
+
+
+def run_variant(variant, file_format, width, height, png_level):
+    frame = make_frame(width, height)
+    base_rss = peak_rss_mb()
+    extension = "png" if file_format == "png" else "tiff"
+    fd, path = tempfile.mkstemp(suffix="." + extension)
+    os.close(fd)
+    start = time.perf_counter()
+    if variant == "pillow":
+        from PIL import Image
+        img = Image.fromarray(load_module("Image_Convert_SG").frame_to_uint8(frame))
+        if file_format == "png":
+            img.save(path, compress_level=png_level)
+        else:
+            img.save(path, compression="tiff_deflate")
+    else:
+        streaming = load_module("Streaming_Encode_SG")
+        if file_format == "png":
+            streaming.write_png_streaming(frame, path, png_level)
+        else:
+            streaming.write_tiff_streaming(frame, path, "tiff_deflate")
+    elapsed = time.perf_counter() - start
+    size_mb = os.path.getsize(path) / (1024 * 1024)
+    os.remove(path)
+    print(f"{file_format} {variant:9}: {elapsed:7.2f} s | peak RSS above input: {peak_rss_mb() - base_rss:8.1f} MB"
+          f" | file {size_mb:.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--width", type=int, default=8192)
+    parser.add_argument("--height", type=int, default=8192)
+    parser.add_argument("--formats", nargs="+", choices=["png", "tiff"], default=["png", "tiff"])
+    parser.add_argument("--png-level", type=int, default=6)
+    parser.add_argument("--variant", choices=["pillow", "streaming"])
+    args = parser.parse_args()
+
+    if args.variant:
+        run_variant(args.variant, args.formats[0], args.width, args.height, args.png_level)
+        return
+
+    input_mb = args.width * args.height * 3 * 4 / (1024 * 1024)
+    print(f"{args.width}x{args.height} | input tensor {input_mb:.1f} MB | uint8 frame {input_mb / 4:.1f} MB")
+    for file_format in args.formats:
+        for variant in ("pillow", "streaming"):
+            subprocess.run([sys.executable, os.path.abspath(__file__), "--variant", variant, "--formats", file_format,
+                            "--width", str(args.width), "--height", str(args.height),
+                            "--png-level", str(args.png_level)],
+                           check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Peak RSS and wall time of the Save node's tensor -> uint8 conversion.
+
+    python benchmarks/bench_uint8_conversion.py --batch 16 --width 3840 --height 2160
+
+Each variant runs in its own subprocess so ru_maxrss is not shared between them.
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def run_variant(variant, batch, width, height):
+    import numpy as np
+    import torch
+
+    images = torch.rand((batch, height, width, 3), dtype=torch.float32)
+    base_rss = peak_rss_mb()
+    start = time.perf_counter()
+    if variant == "legacy":
+        frames = (images.cpu().numpy() * 255).astype(np.uint8)
+        checksum = sum(int(f[0, 0, 0]) for f in frames)
+    else:
+        from Image_Convert_SG import iter_uint8_frames
+        checksum = sum(int(f[0, 0, 0]) for f in iter_uint8_frames(images))
+    elapsed = time.perf_counter() - start
+    print(f"{variant}: {elapsed * 1000:.1f} ms | peak RSS above input: {peak_rss_mb() - base_rss:.1f} MB | checksum {checksum}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch", type=int, default=16)
+    parser.add_argument("--width", type=int, default=3840)
+    parser.add_argument("--height", type=int, default=2160)
+    parser.add_argument("--variant", choices=["legacy", "tiled"])
+    args = parser.parse_args()
+
+    if args.variant:
+        run_variant(args.variant, args.batch, args.width, args.height)
+        return
+
+    input_mb = args.batch * args.width * args.height * 3 * 4 / (1024 * 1024)
+    print(f"batch {args.batch} x {args.width}x{args.height} | input tensor {input_mb:.1f} MB")
+    for variant in ("legacy", "tiled"):
+        subprocess.run([sys.executable, os.path.abspath(__file__), "--variant", variant,
+                        "--batch", str(args.batch), "--width", str(args.width), "--height", str(args.height)],
+                       check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Model-name lookup in embedded ComfyUI workflows: full json.loads vs the streaming node scan.
+
+    python benchmarks/bench_workflow_scan.py --sizes 1 5 20
+
+Synthetic workflows of roughly the given sizes (MB) are built with the checkpoint loader placed first,
+in the middle and last among the nodes; "links", "groups" and "extra" come before "nodes" in half of
+the runs so the scanner has to skip them. Peak memory is measured with tracemalloc in a separate run.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_node(node_id, rng):
+    return {
+        "id": node_id,
+        "type": rng.choice(["KSampler", "CLIPTextEncode", "VAEDecode", "EmptyLatentImage", "SaveImage"]),
+        "pos": [rng.random() * 4000, rng.random() * 4000],
+        "size": [315, 262],
+        "flags": {},
+        "order": node_id,
+        "mode": 0,
+        "inputs": [{"name": "model", "type": "MODEL", "link": node_id * 2}],
+        "outputs": [{"name": "LATENT", "type": "LATENT", "links": [node_id * 2 + 1], "slot_index": 0}],
+        "properties": {"Node name for S&R": "KSampler"},
+        "widgets_values": ["a very long prompt, " * rng.randint(5, 40), rng.randint(0, 2 ** 32), "randomize", 20, 7.0],
+    }
+
+
+def make_workflow(size_mb, loader_at, links_first, seed=0):
+    rng = random.Random(seed)
+    nodes = []
+    approx = 0
+    while approx < size_mb * 1024 * 1024 * 0.8:
+        node = make_node(len(nodes) + 1, rng)
+        approx += len(json.dumps(node))
+        nodes.append(node)
+    loader = {"id": 0, "type": "CheckpointLoaderSimple", "widgets_values": ["sd_xl_base_1.0.safetensors"],
+              "outputs": [], "inputs": [], "properties": {}}
+    index = {"first": 0, "middle": len(nodes) // 2, "last": len(nodes)}[loader_at]
+    nodes.insert(index, loader)
+    links = [[i, i, 0, i + 1, 0, "MODEL"] for i in range(len(nodes) * 4)]
+    extra = {"ds": {"scale": 1.0, "offset": [0, 0]}}
+    if links_first:
+        workflow = {"last_node_id": len(nodes), "links": links, "groups": [], "extra": extra, "nodes": nodes}
+    else:
+        workflow = {"last_node_id": len(nodes), "nodes": nodes, "links": links, "groups": [], "extra": extra}
+    return json.dumps(workflow)
+
+
+def measure(fn, text):
+    # Timed without tracemalloc, which slows down allocation-heavy code like json.loads
+    start = time.perf_counter()
+    result = fn(text)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn(text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 5, 20])
+    args = parser.parse_args()
+
+    from Workflow_Scan_SG import workflow_model_name
+
+    variants = (
+        ("json.loads", lambda text: workflow_model_name(text, threshold=float("inf"))),
+        ("streaming", lambda text: workflow_model_name(text, threshold=0)),
+    )
+    for size_mb in args.sizes:
+        for links_first in (False, True):
+            for loader_at in ("first", "middle", "last"):
+                text = make_workflow(size_mb, loader_at, links_first)
+                row = [f"{len(text) / (1024 * 1024):5.1f} MB | loader {loader_at:6} | links {'before' if links_first else 'after':6}"]
+                for name, fn in variants:
+                    result, elapsed, peak = measure(fn, text)
+                    assert result == "sd_xl_base_1.0.safetensors", result
+                    row.append(f"{name}: {elapsed * 1000:7.1f} ms, peak {peak:6.1f} MB")
+                print(" | ".join(row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Stand-ins for the parts of ComfyUI the nodes import (folder_paths, comfy.cli_args), so benchmarks can
+drive the nodes outside a ComfyUI install. Directories live under a temp root, one per process.
+
+    from comfy_stubs import install_stubs, load_module
+    dirs = install_stubs()
+    save = load_module("Save_Image_Format_Quality_Properties_SG")
+"""
+import argparse
+import importlib
+import os
+import re
+import sys
+import tempfile
+import types
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE_NAME = "image_properties_sg"
+
+
+def _folder_paths_module(dirs):
+    folder_paths = types.ModuleType("folder_paths")
+    folder_paths.stub_dirs = dirs
+    folder_paths.get_input_directory = lambda: dirs["input"]
+    folder_paths.get_output_directory = lambda: dirs["output"]
+    folder_paths.get_temp_directory = lambda: dirs["temp"]
+    folder_paths.get_user_directory = lambda: dirs["user"]
+    folder_paths.get_directory_by_type = lambda image_type: dirs.get(image_type)
+
+    def annotated(name):
+        for image_type in ("input", "output", "temp"):
+            suffix = f" [{image_type}]"
+            if name.endswith(suffix):
+                return name[:-len(suffix)], dirs[image_type]
+        return name, dirs["input"]
+
+    def get_annotated_filepath(name, default_dir=None):
+        name, base_dir = annotated(name)
+        return os.path.join(default_dir or base_dir, name)
+
+    def get_save_image_path(filename_prefix, output_dir, image_width=0, image_height=0):
+        # Same contract as ComfyUI: next counter after the highest "<prefix>_<counter>_" file in the folder
+        subfolder, filename = os.path.split(os.path.normpath(filename_prefix))
+        full_output_folder = os.path.join(output_dir, subfolder)
+        os.makedirs(full_output_folder, exist_ok=True)
+        pattern = re.compile(re.escape(filename) + r"_(\d+)_")
+        counters = [int(m.group(1)) for m in map(pattern.match, os.listdir(full_output_folder)) if m]
+        return full_output_folder, filename, max(counters, default=0) + 1, subfolder, filename_prefix
+
+    folder_paths.get_annotated_filepath = get_annotated_filepath
+    folder_paths.exists_annotated_filepath = lambda name: os.path.exists(get_annotated_filepath(name))
+    folder_paths.get_save_image_path = get_save_image_path
+    return folder_paths
+
+
+def install_stubs(root=None, input_dir=None):
+    """Register folder_paths and comfy.cli_args stubs; returns the {type: directory} mapping they use"""
+    root = root or tempfile.mkdtemp(prefix="sg_bench_")
+    dirs = {name: os.path.join(root, name) for name in ("input", "output", "temp", "user")}
+    if input_dir:
+        dirs["input"] = input_dir
+    for path in dirs.values():
+        os.makedirs(path, exist_ok=True)
+
+    # Modules imported earlier hold on to the folder_paths module itself, so an existing stub is repointed
+    folder_paths = sys.modules.get("folder_paths")
+    if getattr(folder_paths, "stub_dirs", None) is not None:
+        folder_paths.stub_dirs.clear()
+        folder_paths.stub_dirs.update(dirs)
+        dirs = folder_paths.stub_dirs
+    else:
+        sys.modules["folder_paths"] = _folder_paths_module(dirs)
+    comfy = types.ModuleType("comfy")
+    comfy.__path__ = []
+    cli_args = types.ModuleType("comfy.cli_args")
+    cli_args.args = argparse.Namespace(disable_metadata=False, preview_method="auto")
+    comfy.cli_args = cli_args
+    sys.modules["comfy"] = comfy
+    sys.modules["comfy.cli_args"] = cli_args
+    return dirs
+
+
+def load_module(name):
+    """
+    Import one of the repo's modules. They use package-relative imports, so they are loaded through a bare
+    package pointing at the repo; the package __init__ (node registration, server routes) is skipped.
+    """
+    if PACKAGE_NAME not in sys.modules:
+        package = types.ModuleType(PACKAGE_NAME)
+        package.__path__ = [REPO_DIR]
+        sys.modules[PACKAGE_NAME] = package
+    return importlib.import_module(f"{PACKAGE_NAME}.{name}")
@@ -0,0 +1,87 @@
+import { app } from "../../scripts/app.js";
+
+app.registerExtension({
+    name: "BatchFolderAnalyzerSG.display",
+    async beforeRegisterNodeDef(nodeType, nodeData, app) {
+        if (nodeData.name === "BatchFolderAnalyzerSG") {
+            const onNodeCreated = nodeType.prototype.onNodeCreated;
+            nodeType.prototype.onNodeCreated = function () {
+                const r = onNodeCreated ? onNodeCreated.apply(this, arguments) : undefined;
+
+                // Set initial minimum width only when first created
+                const currentSize = this.size || this.computeSize();
+                this.size = [Math.max(500, currentSize[0]), currentSize[1]];
+
+                // Report lines are drawn in a custom widget below the inputs
+                const displayWidget = this.addCustomWidget({
+                    name: "display_info",
+                    type: "DISPLAY_INFO",
+                    value: [],
+                    draw: function(ctx, node, width, y) {
+                        if (!node.imageParamsText || node.imageParamsText.length === 0) {
+                            return 0;
+                        }
+
+                        const lineHeight = 18;
+                        const padding = 5;
+
+                        ctx.save();
+                        ctx.font = "12px monospace";
+                        ctx.fillStyle = "#ccc";
+                        ctx.textBaseline = "top";
+
+                        for (let i = 0; i < node.imageParamsText.length; i++) {
+                            ctx.fillText(node.imageParamsText[i], 10, y + padding + (i * lineHeight));
+                        }
+
+                        ctx.restore();
+                        return (node.imageParamsText.length * lineHeight) + (padding * 2);
+                    },
+                    computeSize: function(width) {
+                        if (!this.parent || !this.parent.imageParamsText) {
+                            return [width, 0];
+                        }
+
+                        const lineHeight = 18;
+                        const padding = 10;
+                        return [width, (this.parent.imageParamsText.length * lineHeight) + padding];
+                    }
+                });
+
+                displayWidget.parent = this;
+                this.displayWidget = displayWidget;
+
+                return r;
+            };
+
+            const onConfigure = nodeType.prototype.onConfigure;
+            nodeType.prototype.onConfigure = function(info) {
+                onConfigure?.apply(this, arguments);
+                if (info.imageParamsText) {
+                    this.imageParamsText = info.imageParamsText;
+                }
+            };
+
+            const onSerialize = nodeType.prototype.onSerialize;
+            nodeType.prototype.onSerialize = function(info) {
+                const data = onSerialize ? onSerialize.apply(this, arguments) : info;
+                if (this.imageParamsText) {
+                    data.imageParamsText = this.imageParamsText;
+                }
+                return data;
+            };
+
+            const onExecuted = nodeType.prototype.onExecuted;
+            nodeType.prototype.onExecuted = function (message) {
+                onExecuted?.apply(this, arguments);
+                if (message && message.text) {
+                    this.imageParamsText = message.text;
+
+                    // Grow to fit the report, never shrink a node the user resized
+                    const newSize = this.computeSize();
+                    this.setSize([Math.max(this.size[0], newSize[0]), Math.max(this.size[1], newSize[1])]);
+                }
+            };
+        }
+    }
+});
@@ -1,4 +1,5 @@
 import { app } from "../../scripts/app.js";
+import { api } from "../../scripts/api.js";
 
 app.registerExtension({
     name: "LoadImageandviewPropertiesSG.display",
@@ -18,99 +19,85 @@ app.registerExtension({
                 if (imageWidget) {
                     const self = this;
                     let lastValue = imageWidget.value;
+                    let requestId = 0;
 
-                    // Create a timer to check for value changes
-                    const checkInterval = setInterval(() => {
-                        if (imageWidget.value !== lastValue) {
-                            lastValue = imageWidget.value;
-                            if (imageWidget.value && typeof imageWidget.value === 'string') {
-                                // Load and analyze the image
-                                const img = new Image();
-                                const imageUrl = `/view?filename=${encodeURIComponent(imageWidget.value)}&type=input&subfolder=`;
-
-                                img.onload = function() {
-                                    const width = img.naturalWidth;
-                                    const height = img.naturalHeight;
-
-                                    // Calculate parameters
-                                    const resolution_mp = (width * height / 1_000_000).toFixed(2);
-
-                                    // GCD calculation
-                                    function gcd(a, b) {
-                                        while (b) {
-                                            let temp = b;
-                                            b = a % b;
-                                            a = temp;
-                                        }
-                                        return a;
-                                    }
-
-                                    const divisor = gcd(width, height);
-                                    const width_ratio = width / divisor;
-                                    const height_ratio = height / divisor;
-                                    const aspect_decimal = (width / height).toFixed(2);
-
-                                    // Find closest standard ratio
-                                    const standardRatios = [
-                                        [1.0, '1:1'], [1.25, '5:4'], [1.33333, '4:3'],
-                                        [1.5, '3:2'], [1.6, '16:10'], [1.66667, '5:3'],
-                                        [1.77778, '16:9'], [1.88889, '17:9'], [2.0, '2:1'],
-                                        [2.33333, '21:9'], [2.35, '2.35:1'], [2.39, '2.39:1'],
-                                        [2.4, '12:5']
-                                    ];
-
-                                    let closestRatio = null;
-                                    let closestDiff = Infinity;
-                                    const aspectRatio = width / height;
-
-                                    for (const [value, label] of standardRatios) {
-                                        const diff = Math.abs(value - aspectRatio);
-                                        if (diff < closestDiff) {
-                                            closestDiff = diff;
-                                            closestRatio = label;
-                                        }
-                                    }
-                                    if (closestDiff > 0.05) {
-                                        closestRatio = null;
-                                    }
-
-                                    // Calculate tensor size
-                                    const tensorSizeMB = (width * height * 3 * 4 / (1024 * 1024)).toFixed(2);
-
-                                    // Create display lines
-                                    const line1 = `${width}x${height} | ${resolution_mp}MP`;
-                                    let line2;
-                                    if (closestRatio && closestRatio !== `${width_ratio}:${height_ratio}`) {
-                                        line2 = `Ratio: ${width_ratio}:${height_ratio} or ${aspect_decimal}:1 or ~${closestRatio}`;
-                                    } else {
-                                        line2 = `Ratio: ${width_ratio}:${height_ratio} or ${aspect_decimal}:1`;
-                                    }
-                                    const line3 = `Tensor Size: ${tensorSizeMB}MB`;
-
-                                    // Store and redraw
-                                    self.imageParamsText = [line1, line2, line3];
-
-                                    // Force redraw
-                                    app.graph.setDirtyCanvas(true, true);
-                                };
-
-                                img.onerror = function() {
-                                    console.error("Failed to load image:", imageUrl);
-                                };
-
-                                img.src = imageUrl;
-                            }
+                    // Ask the server for header-only properties instead of downloading the full image
+                    const refreshProperties = (value) => {
+                        if (value === lastValue) {
+                            return;
                         }
-                    }, 500); // Check every 500ms
-
-                    // Clean up interval when node is removed
-                    const onRemoved = this.onRemoved;
-                    this.onRemoved = function() {
-                        clearInterval(checkInterval);
-                        if (onRemoved) {
-                            onRemoved.apply(this, arguments);
+                        lastValue = value;
+                        if (!value || typeof value !== 'string') {
+                            return;
                         }
+
+                        // Uploaded files may be "subfolder/name [input]"
+                        let name = value;
+                        let type = "input";
+                        const annotation = name.match(/^(.*) \[(input|output|temp)\]$/);
+                        if (annotation) {
+                            name = annotation[1];
+                            type = annotation[2];
+                        }
+                        const slash = name.lastIndexOf("/");
+                        const subfolder = slash >= 0 ? name.slice(0, slash) : "";
+                        const filename = slash >= 0 ? name.slice(slash + 1) : name;
+
+                        const currentRequest = ++requestId;
+                        const url = `/image_properties_sg/properties?filename=${encodeURIComponent(filename)}&type=${type}&subfolder=${encodeURIComponent(subfolder)}`;
+
+                        // The response carries an ETag, so unchanged files come back as 304 from the browser cache
+                        api.fetchApi(url)
+                            .then((response) => {
+                                if (!response.ok) {
+                                    throw new Error(`HTTP ${response.status}`);
+                                }
+                                return response.json();
+                            })
+                            .then((data) => {
+                                // Ignore answers for a selection that has already changed again
+                                if (currentRequest !== requestId) {
+                                    return;
+                                }
+                                self.imageParamsText = data.text;
+                                app.graph.setDirtyCanvas(true, true);
+                            })
+                            .catch((error) => {
+                                console.error("Failed to load image properties:", url, error);
+                            });
+                    };
+
+                    // React to selection in the combo
+                    const callback = imageWidget.callback;
+                    imageWidget.callback = function () {
+                        const callbackResult = callback?.apply(this, arguments);
+                        refreshProperties(imageWidget.value);
+                        return callbackResult;
                     };
+
+                    // Uploads and drag-and-drop assign the value directly, without calling the callback
+                    let descriptor = null;
+                    for (let obj = imageWidget; obj && !descriptor; obj = Object.getPrototypeOf(obj)) {
+                        descriptor = Object.getOwnPropertyDescriptor(obj, "value");
+                    }
+                    if (!descriptor || descriptor.configurable !== false) {
+                        let storedValue = imageWidget.value;
+                        Object.defineProperty(imageWidget, "value", {
+                            configurable: true,
+                            enumerable: true,
+                            get() {
+                                return descriptor?.get ? descriptor.get.call(this) : storedValue;
+                            },
+                            set(value) {
+                                if (descriptor?.set) {
+                                    descriptor.set.call(this, value);
+                                } else {
+                                    storedValue = value;
+                                }
+                                refreshProperties(imageWidget.value);
+                            },
+                        });
+                    }
                 }
 
                 return result;
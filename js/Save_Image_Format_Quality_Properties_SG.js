@@ -63,14 +63,24 @@ app.registerExtension({
                     
                     // Define which widgets belong to which format
                     const widgetMap = {
-                        "PNG (lossless, larger files)": ["png_compress_level"],
-                        "JPEG (lossy, smaller files)": ["jpeg_quality", "jpeg_optimize", "jpeg_subsampling"],
-                        "WEBP (modern, good compression)": ["webp_quality", "webp_method", "webp_lossless"],
-                        "BMP (uncompressed, largest)": [],
-                        "TIFF (flexible, lossless, limited support)": ["tiff_compression", "tiff_jpeg_quality"]
+                        "PNG (lossless, larger files)": ["png_compress_level", "png_text_chunks"],
+                        "JPEG (lossy, smaller files)": ["jpeg_quality", "jpeg_optimize", "jpeg_subsampling", "max_bytes"],
+                        "WEBP (modern, good compression)": ["webp_quality", "webp_method", "webp_lossless", "max_bytes"],
+                        "BMP (uncompressed, largest)": ["preview_max_edge", "preview_format"],
+                        "TIFF (flexible, lossless, limited support)": ["tiff_compression", "tiff_jpeg_quality", "preview_max_edge", "preview_format"]
                     };
                     
-                    const activeWidgets = widgetMap[format] || [];
+                    const activeWidgets = [...(widgetMap[format] || [])];
+                    
+                    // Write-behind shows a temp preview for every format, written with the preview settings
+                    const writeModeWidget = this.widgets.find(w => w.name === "write_mode");
+                    if (writeModeWidget && String(writeModeWidget.value).startsWith("Write-behind")) {
+                        for (const name of ["preview_max_edge", "preview_format"]) {
+                            if (!activeWidgets.includes(name)) {
+                                activeWidgets.push(name);
+                            }
+                        }
+                    }
                     
                     // Hide/show widgets based on format
                     for (const widget of this.widgets) {
@@ -83,7 +93,9 @@ app.registerExtension({
                         const isFormatWidget = widget.name.startsWith("png_") ||
                                              widget.name.startsWith("jpeg_") ||
                                              widget.name.startsWith("webp_") ||
-                                             widget.name.startsWith("tiff_");
+                                             widget.name.startsWith("tiff_") ||
+                                             widget.name.startsWith("preview_") ||
+                                             widget.name === "max_bytes";
                         
                         if (isFormatWidget) {
                             const shouldShow = activeWidgets.includes(widget.name);
@@ -123,19 +135,21 @@ app.registerExtension({
                     }
                 };
                 
-                // Hook into format widget changes
-                const formatWidget = this.widgets.find(w => w.name === "format");
-                if (formatWidget) {
-                    const originalCallback = formatWidget.callback;
-                    const node = this;
-                    formatWidget.callback = function(value) {
-                        // Call original callback first
-                        if (originalCallback) {
-                            originalCallback.call(this, value);
-                        }
-                        // Update visibility immediately without delay
-                        node.updateWidgetVisibility();
-                    };
+                // Hook into format and write mode widget changes
+                for (const name of ["format", "write_mode"]) {
+                    const widget = this.widgets.find(w => w.name === name);
+                    if (widget) {
+                        const originalCallback = widget.callback;
+                        const node = this;
+                        widget.callback = function(value) {
+                            // Call original callback first
+                            if (originalCallback) {
+                                originalCallback.call(this, value);
+                            }
+                            // Update visibility immediately without delay
+                            node.updateWidgetVisibility();
+                        };
+                    }
                 }
                 
                 // Initial visibility update
@@ -41,8 +41,12 @@ app.registerExtension({
                 onExecuted?.apply(this, arguments);
                 
                 if (message.text) {
-                    this.imageParamsText = message.text; // Store as array [line1, line2, line3]
-                    // Removed height adjustment to prevent stretching
+                    this.imageParamsText = message.text; // Store as array [line1, line2, line3, stats...]
+                    // Only grow when the statistics lines would overflow, never shrink or stretch
+                    const neededHeight = 65 + this.imageParamsText.length * 18;
+                    if (this.size[1] < neededHeight) {
+                        this.size[1] = neededHeight;
+                    }
                 }
             };
             
@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+# The nodes import ComfyUI's folder_paths and comfy.cli_args; the benchmarks' stand-ins cover both
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from comfy_stubs import install_stubs, load_module  # noqa: E402
+
+
+@pytest.fixture
+def comfy_dirs(tmp_path):
+    """Fresh input/output/temp/user directories for one test"""
+    return install_stubs(root=str(tmp_path))
+
+
+@pytest.fixture
+def load(comfy_dirs):
+    """Import one of the repo's modules against the stubbed ComfyUI"""
+    return load_module
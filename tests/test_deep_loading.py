@@ -0,0 +1,95 @@
+import struct
+import zlib
+
+import numpy as np
+import pytest
+from PIL import Image
+
+
+def _save(path, array, orientation=1, **kwargs):
+    img = Image.fromarray(array)
+    exif = img.getexif()
+    exif[0x0112] = orientation
+    img.save(path, exif=exif, **kwargs)
+
+
+def _write_png16(path, rgb):
+    """16-bit RGB PNG (Pillow cannot write one)"""
+    height, width, _ = rgb.shape
+    rows = b"".join(b"\0" + row.astype(">u2").tobytes() for row in rgb)
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 16, 2, 0, 0, 0))
+                + chunk(b"IDAT", zlib.compress(rows)) + chunk(b"IEND", b""))
+
+
+def _write_tiff16(path, rgb, deflate=False):
+    """Single-strip 16-bit RGB TIFF, uncompressed or deflate (Pillow cannot write one)"""
+    height, width, samples = rgb.shape
+    data = rgb.astype("<u2").tobytes()
+    if deflate:
+        data = zlib.compress(data)
+    bits_offset = 8 + 2 + 12 * 9 + 4
+    data_offset = bits_offset + 2 * samples
+    entries = [(256, 4, width), (257, 4, height), (258, 3, bits_offset), (259, 3, 8 if deflate else 1),
+               (262, 3, 2), (273, 4, data_offset), (277, 3, samples), (278, 4, height), (279, 4, len(data))]
+    out = b"II*\0" + struct.pack("<IH", 8, len(entries))
+    for tag, kind, value in entries:
+        count = samples if tag == 258 else 1
+        value = struct.pack("<I", value) if kind == 4 or tag == 258 else struct.pack("<HH", value, 0)
+        out += struct.pack("<HHI", tag, kind, count) + value
+    out += struct.pack("<I", 0) + struct.pack(f"<{samples}H", *[16] * samples) + data
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+@pytest.mark.parametrize("compression", [None, "tiff_deflate", "tiff_lzw"])
+@pytest.mark.parametrize("orientation", [1, 3, 6, 8])
+@pytest.mark.parametrize("dtype, scale", [(np.uint16, 65535), (np.float32, 1), (np.int32, 2 ** 31 - 1)])
+def test_deep_tiff_matches_8bit_orientation(load, comfy_dirs, compression, orientation, dtype, scale):
+    node = load("Load_Image_and_view_Properties_SG").LoadImageandviewPropertiesSG()
+    gray = np.random.default_rng(0).integers(0, 256, (60, 40), dtype=np.uint8)
+    deep = (gray.astype(np.float64) / 255 * scale).astype(dtype)
+    _save(f"{comfy_dirs['input']}/deep.tif", deep, orientation, compression=compression)
+    _save(f"{comfy_dirs['input']}/rgb8.tif", np.repeat(gray[..., None], 3, axis=2), orientation,
+          compression=compression)
+
+    for loader in ("mmap", "decode"):
+        deep_image = node.load_and_analyze("deep.tif", loader)["result"][0]
+        rgb8_image = node.load_and_analyze("rgb8.tif", "decode")["result"][0]
+        assert deep_image.shape == rgb8_image.shape
+        assert np.abs(deep_image.numpy() - rgb8_image.numpy()).max() < 1e-4
+
+
+@pytest.mark.parametrize("extension", ["gif", "png", "jpg"])
+def test_8bit_sources_keep_the_pil_decode(load, comfy_dirs, extension):
+    depth = load("Image_Depth_SG")
+    path = f"{comfy_dirs['input']}/rgb8.{extension}"
+    Image.fromarray(np.random.default_rng(0).integers(0, 256, (60, 40, 3), dtype=np.uint8)).save(path)
+
+    with Image.open(path) as img:
+        assert depth.bit_depth(img) == "8-bit"
+        assert depth.read_deep_pixels(path, img) is None
+
+
+@pytest.mark.parametrize("extension, label", [("tif", "16-bit"), ("deflate.tif", "16-bit"),
+                                              ("png", "16-bit (loaded as 8-bit)")])
+def test_depth_label_matches_loaded_tensor(load, comfy_dirs, extension, label):
+    node = load("Load_Image_and_view_Properties_SG").LoadImageandviewPropertiesSG()
+    rgb = np.random.default_rng(0).integers(0, 65536, (6, 5, 3)).astype(np.uint16)
+    path = f"{comfy_dirs['input']}/rgb16.{extension}"
+    if extension == "png":
+        _write_png16(path, rgb)
+    else:
+        _write_tiff16(path, rgb, deflate=extension.startswith("deflate"))
+
+    assert load("Image_Probe_SG").probe_image(path).bit_depth == label
+    result = node.load_and_analyze(f"rgb16.{extension}", "decode")
+    assert f"Depth: {label}" in result["ui"]["text"][2]
+    # Within half a 16-bit step when loaded at full depth, otherwise only within an 8-bit step
+    error = np.abs(result["result"][0][0].numpy() - rgb / 65535).max()
+    assert error < (0.5 / 65535 + 1e-6 if label == "16-bit" else 1 / 255)
+    assert label == "16-bit" or error > 1 / 65535
@@ -0,0 +1,56 @@
+import threading
+import time
+
+import pytest
+import torch
+
+
+@pytest.mark.parametrize("format", ["PNG (lossless, larger files)", "WEBP (modern, good compression)"])
+def test_in_flight_frames_do_not_grow_with_workers(load, comfy_dirs, monkeypatch, format):
+    save = load("Save_Image_Format_Quality_Properties_SG")
+    node = save.SaveImageFormatQualityPropertiesSG()
+    lock = threading.Lock()
+    live = peak = 0
+    real_iter = save.iter_uint8_frames
+
+    def counted_frames(images, *args, **kwargs):
+        nonlocal live, peak
+        for frame in real_iter(images, *args, **kwargs):
+            with lock:
+                live += 1
+                peak = max(peak, live)
+            yield frame
+
+    def slow_done():
+        nonlocal live
+        time.sleep(0.002)
+        with lock:
+            live -= 1
+
+    real_save_frame = node.save_frame
+    real_prepare = save.AnimatedWebpWriter.prepare
+
+    def save_frame(*args, **kwargs):
+        real_save_frame(*args, **kwargs)
+        slow_done()
+
+    def prepare(self, *args, **kwargs):
+        prepared = real_prepare(self, *args, **kwargs)
+        slow_done()
+        return prepared
+
+    monkeypatch.setattr(save, "iter_uint8_frames", counted_frames)
+    monkeypatch.setattr(node, "save_frame", save_frame)
+    monkeypatch.setattr(save.AnimatedWebpWriter, "prepare", prepare)
+    batch_output = save.BATCH_OUTPUTS[1 if format.startswith("WEBP") else 0]
+    node.save_and_analyze(torch.rand(48, 16, 16, 3), "flight", format=format, encode_workers=64,
+                          batch_output=batch_output)
+
+    assert 1 < peak <= save.MAX_IN_FLIGHT_FRAMES + 1
+
+
+def test_in_flight_limit_follows_frame_bytes(load):
+    save = load("Save_Image_Format_Quality_Properties_SG")
+    assert save.max_in_flight(64, torch.empty(16, 16, 3)) == save.MAX_IN_FLIGHT_FRAMES
+    assert save.max_in_flight(2, torch.empty(16, 16, 3)) == 4
+    assert save.max_in_flight(64, torch.empty(8192, 8192, 3)) == 1
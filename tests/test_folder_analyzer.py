@@ -0,0 +1,34 @@
+import json
+
+import numpy as np
+from PIL import Image
+from PIL.PngImagePlugin import PngInfo
+
+
+def test_records_in_listing_order_with_workers(load, tmp_path):
+    analyzer = load("Batch_Folder_Analyzer_SG")
+    for index in range(70):
+        size = (16 + index, 8 + index)
+        Image.fromarray(np.zeros((size[1], size[0], 3), dtype=np.uint8)).save(tmp_path / f"img_{index:03d}.png")
+    (tmp_path / "broken.png").write_bytes(b"not a png")
+
+    serial = list(analyzer.iter_folder_properties(str(tmp_path), workers=1))
+    threaded = list(analyzer.iter_folder_properties(str(tmp_path), workers=4))
+    assert threaded == serial
+    assert [r["width"] for r in threaded if not r.get("error")] == [16 + i for i in range(70)]
+    assert sum(1 for r in threaded if r.get("error")) == 1
+
+
+def test_linked_loader_input_does_not_abort_the_report(load, tmp_path):
+    analyzer = load("Batch_Folder_Analyzer_SG")
+    prompt = {"4": {"class_type": "CheckpointLoaderSimple", "inputs": {"ckpt_name": ["5", 0]}}}
+    info = PngInfo()
+    info.add_text("prompt", json.dumps(prompt))
+    Image.new("RGB", (16, 16)).save(tmp_path / "linked.png", pnginfo=info)
+    Image.new("RGB", (16, 16)).save(tmp_path / "plain.png")
+
+    summary = analyzer.analyze_folder(str(tmp_path), workers=1, csv_path=str(tmp_path / "report.csv"),
+                                      jsonl_path=str(tmp_path / "report.jsonl"))
+    assert (summary.count, summary.errors) == (2, 0)
+    assert dict(summary.models) == {"['5', 0]": 1, "N/A": 1}
+    assert len((tmp_path / "report.jsonl").read_text().splitlines()) == 2
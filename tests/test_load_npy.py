@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize("loader", ["mmap", "decode"])
+@pytest.mark.parametrize("shape, dtype", [((20, 30, 3), np.uint8), ((1, 20, 30, 4), np.uint16),
+                                          ((20, 30), np.float32)])
+def test_npy_loads_with_either_loader(load, comfy_dirs, loader, shape, dtype):
+    node = load("Load_Image_and_view_Properties_SG").LoadImageandviewPropertiesSG()
+    array = np.random.default_rng(0).integers(0, 200, shape).astype(dtype)
+    np.save(f"{comfy_dirs['input']}/array.npy", array)
+
+    image, mask, width, height = node.load_and_analyze("array.npy", loader)["result"][:4]
+    assert image.shape == (1, 20, 30, 3) and mask.shape == (20, 30)
+    assert (width, height) == (30, 20)
+
+
+def test_unsupported_npy_raises(load, comfy_dirs):
+    node = load("Load_Image_and_view_Properties_SG").LoadImageandviewPropertiesSG()
+    np.save(f"{comfy_dirs['input']}/array.npy", np.zeros((20, 30, 2), dtype=np.uint8))
+    with pytest.raises(ValueError, match="Unsupported .npy"):
+        node.load_and_analyze("array.npy", "decode")
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from PIL import Image, ImageOps
+
+
+def _save_oriented(path, orientation, width=40, height=60, **kwargs):
+    img = Image.fromarray(np.random.default_rng(0).integers(0, 256, (height, width, 3), dtype=np.uint8))
+    exif = img.getexif()
+    exif[0x0112] = orientation
+    img.save(path, exif=exif, **kwargs)
+
+
+@pytest.mark.parametrize("extension", ["png", "jpg", "webp", "tif"])
+@pytest.mark.parametrize("orientation", [1, 3, 6, 8])
+def test_probe_size_matches_decoded_image(load, tmp_path, extension, orientation):
+    probe_image = load("Image_Probe_SG").probe_image
+    path = str(tmp_path / f"oriented.{extension}")
+    _save_oriented(path, orientation)
+
+    probe = probe_image(path)
+    with Image.open(path) as img:
+        decoded = ImageOps.exif_transpose(img)
+    assert (probe.width, probe.height) == decoded.size
+    assert (probe.width, probe.height) == ((60, 40) if orientation in (6, 8) else (40, 60))
+
+
+def test_load_outputs_match_tensor_for_oriented_tiff(load, comfy_dirs):
+    node = load("Load_Image_and_view_Properties_SG").LoadImageandviewPropertiesSG()
+    _save_oriented(f"{comfy_dirs['input']}/oriented.tif", 6, compression="tiff_deflate")
+
+    result = node.load_and_analyze("oriented.tif", "decode")
+    image, _, width, height = result["result"][:4]
+    assert image.shape[1:3] == (height, width) == (40, 60)
+    assert result["ui"]["text"][0].startswith("60x40 ")
+
+
+def test_probe_and_load_gif(load, comfy_dirs):
+    probe_image = load("Image_Probe_SG").probe_image
+    node = load("Load_Image_and_view_Properties_SG").LoadImageandviewPropertiesSG()
+    path = f"{comfy_dirs['input']}/palette.gif"
+    Image.fromarray(np.random.default_rng(0).integers(0, 256, (60, 40, 3), dtype=np.uint8)).save(path)
+
+    probe = probe_image(path)
+    assert (probe.width, probe.height, probe.bit_depth) == (40, 60, "8-bit")
+    image, _, width, height = node.load_and_analyze("palette.gif", "decode")["result"][:4]
+    assert image.shape[1:3] == (height, width) == (60, 40)
@@ -0,0 +1,55 @@
+import json
+import os
+
+import torch
+from PIL import Image
+from PIL.PngImagePlugin import PngInfo
+
+PROMPT = {
+    "3": {"class_type": "KSampler", "inputs": {"seed": 42, "steps": 20, "cfg": 7.0, "sampler_name": "euler",
+                                              "scheduler": "normal"}},
+    "4": {"class_type": "CheckpointLoaderSimple", "inputs": {"ckpt_name": "model.safetensors"}},
+}
+
+
+def test_prompt_serialized_once_per_save(load, comfy_dirs, monkeypatch):
+    save = load("Save_Image_Format_Quality_Properties_SG")
+    extractor = load("Metadata_Extractor_SG")
+    dumped = []
+    real_dumps = json.dumps
+
+    def counting_dumps(value, *args, **kwargs):
+        if value is PROMPT:
+            dumped.append(value)
+        return real_dumps(value, *args, **kwargs)
+
+    monkeypatch.setattr(save.json, "dumps", counting_dumps)
+    monkeypatch.setattr(extractor.json, "dumps", counting_dumps)
+    node = save.SaveImageFormatQualityPropertiesSG()
+    result = node.save_and_analyze(torch.rand(2, 16, 16, 3), "meta", prompt=PROMPT)
+    monkeypatch.undo()
+
+    assert len(dumped) == 1
+    assert "Model: model.safetensors" in result["ui"]["text"]
+    for name in sorted(os.listdir(comfy_dirs["output"])):
+        with Image.open(os.path.join(comfy_dirs["output"], name)) as img:
+            assert img.text["prompt"] == json.dumps(PROMPT)
+
+
+def test_linked_loader_input_is_indexed_as_text(load, comfy_dirs, monkeypatch):
+    loader = load("Load_Image_and_view_Properties_SG")
+    index = load("Metadata_Index_SG").MetadataIndex(os.path.join(comfy_dirs["user"], "index.sqlite3"))
+    monkeypatch.setattr(loader, "get_metadata_index", lambda: index)
+    # ckpt_name fed by a primitive node: ComfyUI stores the link as [node_id, output_slot]
+    prompt = dict(PROMPT, **{"4": {"class_type": "CheckpointLoaderSimple", "inputs": {"ckpt_name": ["5", 0]}}})
+    info = PngInfo()
+    info.add_text("prompt", json.dumps(prompt))
+    Image.new("RGB", (16, 16)).save(os.path.join(comfy_dirs["input"], "linked.png"), pnginfo=info)
+
+    node = loader.LoadImageandviewPropertiesSG()
+    for _ in range(2):  # probe and store, then read back from the index
+        props = node.analyze_properties(os.path.join(comfy_dirs["input"], "linked.png"))
+        assert props["model_name"] == "['5', 0]"
+        assert "Model: ['5', 0]" in props["text"]
+    assert node.load_and_analyze("linked.png", "decode")["ui"]["text"] == props["text"]
+    index.close()
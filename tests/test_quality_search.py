@@ -0,0 +1,41 @@
+import io
+import json
+import os
+
+import numpy as np
+import torch
+from PIL import Image
+
+
+def _photo(height=1024, width=1024, seed=0):
+    """Gradients plus noise: compresses like a photo, so JPEG size tracks quality closely"""
+    y, x = np.mgrid[0:height, 0:width]
+    base = np.stack([x * 255 / width, y * 255 / height, (x + y) * 127 / (width + height)], axis=-1)
+    noise = np.random.default_rng(seed).normal(0, 12, base.shape)
+    return np.clip(base + noise, 0, 255).astype(np.uint8)
+
+
+def test_budget_file_matches_reported_quality(load, comfy_dirs):
+    save = load("Save_Image_Format_Quality_Properties_SG")
+    node = save.SaveImageFormatQualityPropertiesSG()
+    frame = _photo()
+    full_size = len(_encode(frame, 95))
+    max_bytes = full_size // 3
+
+    result = node.save_and_analyze(torch.from_numpy(frame.astype(np.float32) / 255.0)[None], "budget",
+                                   format="JPEG (lossy, smaller files)", jpeg_quality=95,
+                                   jpeg_subsampling="4:4:4 (No subsampling, best quality)", max_bytes=max_bytes)
+    report = json.loads(result["result"][0])
+    record, = report["frames"]
+    written = os.path.getsize(os.path.join(comfy_dirs["output"], record["filename"]))
+
+    assert record["fits"] and written <= max_bytes
+    assert written == record["bytes"]
+    assert written == len(_encode(frame, record["quality"]))
+    assert len(_encode(frame, record["quality"] + 1)) > max_bytes
+
+
+def _encode(frame, quality):
+    buffer = io.BytesIO()
+    Image.fromarray(frame).save(buffer, format="JPEG", quality=quality, optimize=True, subsampling=0)
+    return buffer.getvalue()
@@ -0,0 +1,45 @@
+import os
+import threading
+
+import numpy as np
+import pytest
+import torch
+from PIL import Image
+
+
+@pytest.fixture
+def held_queue(load):
+    """The shared write-behind queue with every worker parked until release() is called"""
+    write_behind = load("Write_Behind_SG")
+    write_queue = write_behind.get_write_behind_queue()
+    gate = threading.Event()
+    for _ in range(write_behind.WRITE_BEHIND_WORKERS):
+        write_queue.submit("hold", gate.wait)
+    yield gate.set
+    gate.set()
+    write_queue.flush()
+
+
+@pytest.mark.parametrize("streaming_save", ["Off", "On"])
+def test_write_behind_snapshots_frames_and_previews_exist(load, comfy_dirs, held_queue, streaming_save):
+    save = load("Save_Image_Format_Quality_Properties_SG")
+    node = save.SaveImageFormatQualityPropertiesSG()
+    images = torch.rand(2, 48, 64, 3)
+    expected = np.clip(np.rint(images.numpy() * 255), 0, 255).astype(np.uint8)
+
+    result = node.save_and_analyze(images, "behind", format="PNG (lossless, larger files)",
+                                   write_mode="Write-behind (background)", streaming_save=streaming_save)
+    # Nothing has been written yet, but every UI entry must already be servable
+    for entry in result["ui"]["images"]:
+        assert entry["type"] == "temp"
+        assert os.path.isfile(os.path.join(comfy_dirs["temp"], entry["subfolder"], entry["filename"]))
+
+    images.zero_()
+    held_queue()
+    load("Write_Behind_SG").get_write_behind_queue().flush()
+
+    saved = sorted(f for f in os.listdir(comfy_dirs["output"]) if f.startswith("behind_"))
+    assert len(saved) == 2
+    for frame, name in zip(expected, saved):
+        with Image.open(os.path.join(comfy_dirs["output"], name)) as img:
+            assert np.array_equal(np.asarray(img), frame)